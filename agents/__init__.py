@@ -1 +1,30 @@
-# agents module for philhills-ai
+# agents module for philhills-ai
+# Lightweight entry point: public names resolve on first access so that
+# `import agents` does not pull in the platform stack on cold start.
+import importlib
+
+_LAZY_EXPORTS = {
+    "AgentCard": "agents.platform",
+    "BaseAgent": "agents.platform",
+    "MessageBus": "agents.platform",
+    "ParsedIntent": "agents.platform",
+    "TaskRequest": "agents.platform",
+    "TaskResponse": "agents.platform",
+    "parse_intent": "agents.platform",
+    "identity_provider": "agents.identity_cache",
+}
+
+__all__ = sorted(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'agents' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,545 @@
+"""
+Broker - Multi-process MessageBus over Unix domain sockets or TCP.
+
+A Broker runs groups of agents in separate worker processes so CPU-bound
+work (cube compression, hashing) can use every core. Each process owns a
+BrokerBus: agents in the same process are delivered to directly, and agents
+in other processes appear in the bus as RemoteAgent proxies, so
+`register` / `send` / `receive` (and `_find_agent`) work unchanged.
+
+Wire format: every frame is a 4-byte big-endian length, a 32-byte
+HMAC-SHA256 of the body under the broker's key, and the body: a pickled list
+of (target_id, message) pairs. The key is generated per Broker and handed to
+its workers over the process pipe; a frame whose MAC does not verify is
+never unpickled and its connection is dropped. One persistent connection is
+kept per peer, and all messages queued for a peer during one event-loop tick
+go out as a single frame. A link whose connection fails logs the error and
+reconnects with exponential backoff, resending the batch that failed. While a
+peer is unreachable at most `max_pending` messages wait for it (newer ones are
+dropped and counted), and flush()/close()/Broker.stop() take a timeout, after
+which whatever is still queued for a dead peer is dropped instead of waited on.
+
+With `shm_threshold` set, large str/bytes fields of TaskRequest/TaskResponse
+messages (content, output, artifacts) are written once to a shared-memory
+ring and cross the socket as CubeRefs (see agents/shm_transport.py). Each
+peer link has its own ring, created with release tracking: the writer never
+overwrites a payload its one reader has not released, and while the ring is
+full payloads travel inline in the frame instead. The receiving bus copies
+them back into the str/bytes they were (releasing as it goes), so agents see
+the same message types as in-process; with `shm_zero_copy=True` agents get
+ShmPayload objects that decode straight from shared memory instead, and must
+release() them in the order received. A message whose payload was
+overwritten anyway (StaleRef) is logged and dropped on its own.
+
+Usage:
+  broker = Broker(workers=4)
+  broker.add_agents(ContentGeneratorAgent, count=4)     # classes or zero-arg factories
+  await broker.start()
+  bus = broker.bus                                      # BrokerBus in this process
+  await bus.send(TaskRequest(...), broker.find_agent("Content Generator"))
+  await broker.stop()
+"""
+import asyncio
+import dataclasses
+import hashlib
+import hmac
+import logging
+import multiprocessing
+import os
+import pickle
+import secrets
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from agents.platform import MessageBus
+from agents.shm_transport import RingFull, StaleRef
+
+logger = logging.getLogger("broker")
+
+FRAME_HEADER = struct.Struct(">I")
+DIGEST_SIZE = hashlib.sha256().digest_size
+MAX_FRAME_BYTES = 512 * 1024 * 1024
+MAX_BATCH = 512
+MAX_PENDING = 65536           # messages held for an unreachable peer before new ones are dropped
+RECONNECT_MIN = 0.1
+RECONNECT_MAX = 5.0
+FLUSH_TIMEOUT = 5.0
+STOP_TIMEOUT = 10.0
+
+Address = Union[str, Tuple[str, int]]  # unix socket path or (host, port)
+
+
+async def _open_connection(address: Address):
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+def _sign(key: bytes, data: bytes) -> bytes:
+    return hmac.new(key, data, hashlib.sha256).digest()
+
+
+class PeerLink:
+    """Persistent, batching connection to one peer process."""
+
+    def __init__(self, address: Address, auth_key: bytes, max_batch: int = MAX_BATCH,
+                 max_pending: int = MAX_PENDING):
+        self.address = address
+        self.auth_key = auth_key
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.frames_sent = 0
+        self.messages_sent = 0
+        self.dropped = 0
+        self._pending: List[Tuple[Optional[str], Any]] = []
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()       # set while nothing is queued or being written
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self.shm_ring = None  # ring this process writes the peer's large payloads into (BrokerBus._to_ref)
+
+    def enqueue(self, target_id: Optional[str], message: Any) -> bool:
+        """Queue a message for the peer; False (and dropped) when the queue is full."""
+        if len(self._pending) >= self.max_pending:
+            if not self.dropped % 1000:
+                logger.warning(f"Peer link {self.address}: {len(self._pending)} messages queued; dropping new ones")
+            self.dropped += 1
+            return False
+        self._pending.append((target_id, message))
+        self._idle.clear()
+        self._ready.set()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return True
+
+    async def _run(self):
+        delay = RECONNECT_MIN
+        while True:
+            try:
+                if self._writer is None:
+                    _, self._writer = await _open_connection(self.address)
+                    delay = RECONNECT_MIN
+                await self._ready.wait()
+                self._ready.clear()
+                pending, self._pending = self._pending, []
+                try:
+                    self._write(pending)
+                    await self._writer.drain()
+                except OSError:
+                    # Resend what may not have gone out (receivers can see it twice)
+                    self._pending[:0] = pending[-self.max_pending:]
+                    raise
+                if not self._pending:
+                    self._idle.set()
+            except OSError as e:
+                logger.warning(f"Peer link {self.address}: {e}; reconnecting in {delay:.1f}s "
+                               f"({len(self._pending)} messages queued)")
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+                if self._pending:
+                    self._ready.set()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX)
+
+    def _write(self, pending: List[Tuple[Optional[str], Any]]):
+        for i in range(0, len(pending), self.max_batch):
+            batch = pending[i:i + self.max_batch]
+            try:
+                data = pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                logger.error(f"Peer link {self.address}: dropping {len(batch)} unpicklable messages: {e}")
+                continue
+            self._writer.write(FRAME_HEADER.pack(len(data)) + _sign(self.auth_key, data) + data)
+            self.frames_sent += 1
+            self.messages_sent += len(batch)
+
+    async def flush(self, timeout: Optional[float] = FLUSH_TIMEOUT) -> bool:
+        """Wait until everything queued so far has been written; False if the peer did not take it in time."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            if self._writer is not None:
+                await asyncio.wait_for(self._writer.drain(), timeout)
+        except (asyncio.TimeoutError, OSError):
+            return False
+        return True
+
+    async def close(self, timeout: Optional[float] = FLUSH_TIMEOUT):
+        """Flush for up to `timeout`, then drop whatever the peer has not taken and disconnect."""
+        if self._task is not None:
+            await self.flush(timeout)
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            logger.warning(f"Peer link {self.address}: dropping {len(self._pending)} undelivered messages")
+            self.dropped += len(self._pending)
+            self._pending.clear()
+            self._idle.set()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+@dataclass
+class _RemoteCard:
+    uuid: str
+    name: str
+
+
+class RemoteAgent:
+    """Proxy registered in a BrokerBus for an agent living in another process."""
+
+    def __init__(self, agent_id: str, name: str, link: PeerLink):
+        self.card = _RemoteCard(uuid=agent_id, name=name)
+        self.link = link
+        self.bus = None
+
+    def connect(self, bus):
+        self.bus = bus
+
+    async def receive(self, message: Any):
+        if self.bus is not None and self.bus.shm_threshold is not None:
+            message = self.bus._externalize(message, self.link)
+        self.link.enqueue(self.card.uuid, message)
+
+
+class BrokerBus(MessageBus):
+    """MessageBus that also serves and routes to agents in peer processes."""
+
+    def __init__(self, node: str = "main", shm_threshold: Optional[int] = None,
+                 shm_capacity: int = 256 * 1024 * 1024, auth_key: Optional[bytes] = None,
+                 shm_zero_copy: bool = False):
+        super().__init__()
+        self.node = node
+        self.shm_zero_copy = shm_zero_copy
+        # Without a shared key nothing a peer sends can verify, so nothing is unpickled
+        self.auth_key = auth_key or secrets.token_bytes(32)
+        self.shm_threshold = shm_threshold
+        self.shm_capacity = shm_capacity
+        self.shm_inline = 0            # large payloads sent inline because the peer's ring was full
+        self.stale_refs = 0            # received messages dropped because their payload was overwritten
+        self.address: Optional[Address] = None
+        self._links: Dict[Any, PeerLink] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.frames_received = 0
+
+    async def serve(self, address: Address):
+        """Accept frames from peers on a unix socket path or (host, port); host defaults to loopback."""
+        if isinstance(address, str):
+            self._server = await asyncio.start_unix_server(self._handle_peer, path=address)
+        else:
+            host, port = address
+            self._server = await asyncio.start_server(self._handle_peer, host or "127.0.0.1", port)
+            address = self._server.sockets[0].getsockname()[:2]
+        self.address = address
+        return address
+
+    async def _handle_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._peers[task] = writer
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                (length,) = FRAME_HEADER.unpack(header)
+                if length > MAX_FRAME_BYTES:
+                    logger.warning(f"[{self.node}] Dropping peer: {length}-byte frame exceeds limit")
+                    break
+                digest = await reader.readexactly(DIGEST_SIZE)
+                data = await reader.readexactly(length)
+                if not hmac.compare_digest(digest, _sign(self.auth_key, data)):
+                    logger.warning(f"[{self.node}] Dropping peer: frame failed authentication")
+                    break
+                try:
+                    batch = pickle.loads(data)
+                    messages = list(batch)
+                except Exception as e:
+                    # Authenticated but undecodable (e.g. a class missing here): skip this frame only
+                    logger.error(f"[{self.node}] Dropping undecodable frame of {length} bytes: {e!r}")
+                    continue
+                self.frames_received += 1
+                for item in messages:
+                    try:
+                        target_id, message = item
+                        await self._deliver_local(message, target_id)
+                    except Exception as e:
+                        logger.error(f"[{self.node}] Dropping undeliverable message: {e!r}")
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            self._peers.pop(task, None)
+            writer.close()
+
+    # -- shared-memory payloads ---------------------------------------------
+
+    SHM_FIELDS = ("content", "output")
+
+    def _to_ref(self, value: Any, link: PeerLink) -> Any:
+        if not isinstance(value, (str, bytes, bytearray)) or len(value) < self.shm_threshold:
+            return value
+        if link.shm_ring is None:
+            from agents.shm_transport import ShmRing
+            link.shm_ring = ShmRing.create(self.shm_capacity, track_release=True)
+        try:
+            return link.shm_ring.put(value)
+        except (RingFull, ValueError):
+            # The peer has not released enough yet (or the payload exceeds the ring): send it inline
+            self.shm_inline += 1
+            return value
+
+    def _externalize(self, message: Any, link: PeerLink) -> Any:
+        """Replace large payload fields of a dataclass message with CubeRefs in `link`'s ring."""
+        if not dataclasses.is_dataclass(message):
+            return message
+        changes = {}
+        for name in self.SHM_FIELDS:
+            if hasattr(message, name):
+                value = getattr(message, name)
+                ref = self._to_ref(value, link)
+                if ref is not value:
+                    changes[name] = ref
+        artifacts = getattr(message, "artifacts", None)
+        if artifacts:
+            refs = [self._to_ref(a, link) for a in artifacts]
+            if any(r is not a for r, a in zip(refs, artifacts)):
+                changes["artifacts"] = refs
+        return dataclasses.replace(message, **changes) if changes else message
+
+    def _from_ref(self, ref: Any) -> Any:
+        from agents.shm_transport import resolve
+        payload = resolve(ref)
+        if self.shm_zero_copy:
+            return payload
+        try:
+            return payload.value()
+        finally:
+            payload.release()
+
+    def _internalize(self, message: Any) -> Any:
+        """Resolve CubeRefs in a received message back to str/bytes (or ShmPayloads with shm_zero_copy)."""
+        if not dataclasses.is_dataclass(message):
+            return message
+        from agents.shm_transport import CubeRef
+        for name in BrokerBus.SHM_FIELDS:
+            if isinstance(getattr(message, name, None), CubeRef):
+                setattr(message, name, self._from_ref(getattr(message, name)))
+        artifacts = getattr(message, "artifacts", None)
+        if artifacts:
+            message.artifacts = [self._from_ref(a) if isinstance(a, CubeRef) else a for a in artifacts]
+        return message
+
+    async def _deliver_local(self, message: Any, target_id: Optional[str]):
+        try:
+            message = self._internalize(message)
+        except StaleRef as e:
+            self.stale_refs += 1
+            logger.warning(f"[{self.node}] Dropping message whose shared-memory payload was overwritten: {e}")
+            return
+        if target_id:
+            agent = self._agents.get(target_id)
+            if agent is not None and not isinstance(agent, RemoteAgent):
+                await agent.receive(message)
+            else:
+                logger.warning(f"[{self.node}] Target agent {target_id} not hosted here.")
+        else:
+            for agent in list(self._agents.values()):
+                if not isinstance(agent, RemoteAgent):
+                    await agent.receive(message)
+
+    def link(self, address: Address) -> PeerLink:
+        key = tuple(address) if not isinstance(address, str) else address
+        link = self._links.get(key)
+        if link is None:
+            link = self._links[key] = PeerLink(address, self.auth_key)
+        return link
+
+    def add_remote_agents(self, directory: List[Tuple[str, str, Address]]):
+        """Register proxies for (agent_id, name, address) entries hosted by other processes."""
+        for agent_id, name, address in directory:
+            if address == self.address or agent_id in self._agents:
+                continue
+            self.register(RemoteAgent(agent_id, name, self.link(address)))
+
+    def local_directory(self) -> List[Tuple[str, str, Address]]:
+        return [(aid, agent.card.name, self.address)
+                for aid, agent in self._agents.items() if not isinstance(agent, RemoteAgent)]
+
+    async def flush(self, timeout: Optional[float] = FLUSH_TIMEOUT) -> bool:
+        """Flush every peer link concurrently; False if any peer did not take its messages in time."""
+        results = await asyncio.gather(*(link.flush(timeout) for link in list(self._links.values())))
+        return all(results)
+
+    async def close(self, timeout: Optional[float] = FLUSH_TIMEOUT):
+        await asyncio.gather(*(link.close(timeout) for link in list(self._links.values())))
+        # Closing inbound connections ends their handlers with EOF instead of cancellation
+        handlers = list(self._peers)
+        for writer in list(self._peers.values()):
+            writer.close()
+        if handlers:
+            await asyncio.wait(handlers, timeout=5)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for link in self._links.values():
+            if link.shm_ring is not None:
+                link.shm_ring.close()
+                link.shm_ring = None
+
+
+# ============================================================================
+# WORKER PROCESSES
+# ============================================================================
+
+def _worker_main(index: int, address: Address, factories: List[Callable], conn, shm_threshold=None, auth_key=None,
+                 shm_zero_copy=False):
+    asyncio.run(_worker_async(index, address, factories, conn, shm_threshold, auth_key, shm_zero_copy))
+
+
+async def _worker_async(index: int, address: Address, factories: List[Callable], conn, shm_threshold=None,
+                        auth_key=None, shm_zero_copy=False):
+    loop = asyncio.get_running_loop()
+    bus = BrokerBus(node=f"worker-{index}", shm_threshold=shm_threshold, auth_key=auth_key,
+                    shm_zero_copy=shm_zero_copy)
+    await bus.serve(address)
+
+    agents = [factory() for factory in factories]
+    tasks = []
+    for agent in agents:
+        bus.register(agent)
+        tasks.append(asyncio.create_task(agent.start()))
+
+    conn.send(bus.local_directory())
+    bus.add_remote_agents(await loop.run_in_executor(None, conn.recv))
+    conn.send("ready")
+
+    await loop.run_in_executor(None, conn.recv)  # stop signal
+    await bus.flush()
+    for task in tasks:
+        task.cancel()
+    await bus.close(timeout=0)  # already flushed; drop whatever a dead peer did not take
+    conn.send("stopped")
+
+
+class Broker:
+    """Starts worker processes and wires every BrokerBus into one mesh."""
+
+    def __init__(self, workers: int = None, transport: str = "unix", host: str = "127.0.0.1",
+                 start_method: str = "spawn", shm_threshold: Optional[int] = None, shm_zero_copy: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.transport = transport
+        self.host = host
+        self.shm_threshold = shm_threshold
+        self.shm_zero_copy = shm_zero_copy
+        self.auth_key = secrets.token_bytes(32)
+        self.bus = BrokerBus(node="main", shm_threshold=shm_threshold, auth_key=self.auth_key,
+                             shm_zero_copy=shm_zero_copy)
+        self._ctx = multiprocessing.get_context(start_method)
+        self._assignments: List[List[Callable]] = [[] for _ in range(self.workers)]
+        self._next_worker = 0
+        self._processes = []
+        self._conns = []
+        self._socket_dir: Optional[str] = None
+
+    def add_agents(self, factory: Callable, count: int = 1, worker: int = None):
+        """
+        Schedule `count` agents built by `factory` (an agent class or a picklable
+        zero-argument callable). Agents are spread round-robin across workers
+        unless `worker` pins them.
+        """
+        for _ in range(count):
+            target = worker if worker is not None else self._next_worker
+            self._assignments[target % self.workers].append(factory)
+            self._next_worker += 1
+
+    def _address(self, name: str) -> Address:
+        if self.transport == "unix":
+            return os.path.join(self._socket_dir, f"{name}.sock")
+        return (self.host, 0)
+
+    async def start(self):
+        """Start workers and exchange agent directories. Register local agents on `bus` first."""
+        loop = asyncio.get_running_loop()
+        if self.transport == "unix":
+            self._socket_dir = tempfile.mkdtemp(prefix="a2a-broker-")
+        await self.bus.serve(self._address("main"))
+
+        for index, factories in enumerate(self._assignments):
+            parent_conn, child_conn = self._ctx.Pipe()
+            address = self._address(f"worker-{index}")
+            if self.transport != "unix":
+                address = (self.host, _free_port(self.host))
+            process = self._ctx.Process(target=_worker_main,
+                                        args=(index, address, factories, child_conn, self.shm_threshold,
+                                              self.auth_key, self.shm_zero_copy),
+                                        name=f"a2a-worker-{index}", daemon=True)
+            process.start()
+            self._processes.append(process)
+            self._conns.append(parent_conn)
+
+        directory = self.bus.local_directory()
+        for conn in self._conns:
+            directory.extend(await loop.run_in_executor(None, conn.recv))
+        for conn in self._conns:
+            conn.send(directory)
+        for conn in self._conns:
+            await loop.run_in_executor(None, conn.recv)  # "ready"
+        self.bus.add_remote_agents(directory)
+        logger.info(f"Broker started: {self.workers} workers, {len(directory)} agents")
+
+    def find_agent(self, name: str) -> Optional[str]:
+        for agent_id, agent in self.bus._agents.items():
+            if name.lower() in agent.card.name.lower():
+                return agent_id
+        return None
+
+    async def stop(self, timeout: float = STOP_TIMEOUT):
+        """
+        Flush, stop every worker and close the bus. A worker that has died or
+        does not confirm within `timeout` is terminated; messages for it are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        await self.bus.flush(timeout / 2)
+        live = []
+        for process, conn in zip(self._processes, self._conns):
+            try:
+                conn.send("stop")
+                live.append((process, conn))
+            except (OSError, EOFError):
+                logger.warning(f"Broker: {process.name} is gone (exit code {process.exitcode})")
+
+        def confirm(conn) -> bool:
+            try:
+                return conn.poll(timeout) and conn.recv() == "stopped"
+            except (OSError, EOFError):
+                return False
+
+        confirmed = await asyncio.gather(*(loop.run_in_executor(None, confirm, conn) for _, conn in live))
+        for (process, _), ok in zip(live, confirmed):
+            if not ok:
+                logger.warning(f"Broker: {process.name} did not stop cleanly")
+        for process in self._processes:
+            process.join(timeout=1 if process.is_alive() else 0)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=1)
+        for conn in self._conns:
+            conn.close()
+        await self.bus.close(timeout=0)
+        if self._socket_dir:
+            for name in os.listdir(self._socket_dir):
+                os.unlink(os.path.join(self._socket_dir, name))
+            os.rmdir(self._socket_dir)
+
+
+def _free_port(host: str) -> int:
+    import socket
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
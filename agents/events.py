@@ -0,0 +1,393 @@
+"""
+Events - Push stream of swarm state and bus / sentinel activity for the dashboards.
+
+An EventHub collects two kinds of data:
+
+  state    one dict of fields per agent, read from watched MessageBuses at
+           flush time (plus anything pushed with update()), so any number
+           of changes between flushes coalesce into their latest values
+  events   sentinel audit entries and other published activity, batched
+           per flush and capped at `max_events` per frame (the rest are only
+           counted); routed bus messages are coalesced into one event per
+           (message type, target) with a count
+
+Every `interval` seconds flush() builds at most one frame carrying only the
+fields that changed since the previous frame, encodes it once as a
+Server-Sent Event, and hands the same bytes to every subscriber. Fan-out is
+an append per subscriber, so thousands of clients cost one encode.
+
+Each subscriber queues at most `max_pending` frames. A client that falls
+further behind (stalled socket, busy tab) has its queue dropped and gets one
+fresh snapshot instead of the backlog, so a slow reader never holds memory
+or delays anyone else. New clients always start with a snapshot.
+
+start_event_server() serves, on plain asyncio sockets:
+
+  GET /api/a2a/events    text/event-stream: "snapshot" then "delta" frames
+  GET /api/a2a/agents    current agent list as JSON (fallback for polling)
+
+It binds to loopback by default (responses allow any origin, so the page can
+be served from elsewhere). control.html finds it via ?events=<base url>,
+e.g. control.html?events=http://127.0.0.1:9465 for
+`python agents/events.py --port 9465`, which serves a hub fed with simulated
+activity for the registry agents.
+
+Usage:
+  hub = EventHub()
+  bus.attach_events(hub)                    # agent state + bus messages
+  sentinel.events = hub                     # ComplianceSentinel audit entries
+  hub.start()
+  await start_event_server(hub, port=9465)
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.metrics import registry
+
+logger = logging.getLogger("events")
+
+_SUBSCRIBERS = registry.gauge("a2a_event_subscribers", "Connected event stream subscribers")
+_FRAMES = registry.counter("a2a_event_frames_total", "Event stream frames built", ("kind",))
+_RESETS = registry.counter("a2a_event_resets_total", "Lagging subscribers reset to a snapshot")
+_DROPPED = registry.counter("a2a_events_dropped_total", "Events over the per-frame cap, counted but not sent")
+
+HEARTBEAT = b": ping\n\n"
+MAX_REQUEST_BYTES = 8192
+
+
+def _frame(kind: str, seq: int, body: dict) -> bytes:
+    data = json.dumps(body, separators=(",", ":"), default=str)
+    return f"id: {seq}\nevent: {kind}\ndata: {data}\n\n".encode("utf-8")
+
+
+def _agent_state(agent) -> dict:
+    stats = agent.stats
+    return {
+        "name": agent.card.name,
+        "capabilities": agent.card.capabilities,
+        "received": stats["messages_received"],
+        "sent": stats["messages_sent"],
+        "inbox": agent.inbox.qsize(),
+        "ratio": round(stats["compression_ratio"], 3),
+    }
+
+
+class Subscriber:
+    """One client's bounded frame queue. Read with `await get()`."""
+    __slots__ = ("hub", "max_pending", "frames", "needs_snapshot", "resets", "closed", "_wakeup")
+
+    def __init__(self, hub: "EventHub", max_pending: int):
+        self.hub = hub
+        self.max_pending = max_pending
+        self.frames: deque = deque()
+        self.needs_snapshot = True
+        self.resets = 0
+        self.closed = False
+        self._wakeup = asyncio.Event()
+
+    def offer(self, frame: bytes):
+        if not self.needs_snapshot:
+            if len(self.frames) >= self.max_pending:
+                # Too far behind: the backlog is worth less than one fresh snapshot
+                self.frames.clear()
+                self.needs_snapshot = True
+                self.resets += 1
+                _RESETS.inc()
+            else:
+                self.frames.append(frame)
+        self._wakeup.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next frame to send; None on timeout (send a heartbeat) or once closed."""
+        while not self.closed:
+            if self.needs_snapshot:
+                self.needs_snapshot = False
+                return self.hub.snapshot()
+            if self.frames:
+                return self.frames.popleft()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return None
+
+    def close(self):
+        self.closed = True
+        self._wakeup.set()
+        self.hub.unsubscribe(self)
+
+
+class EventHub:
+    """Coalesces swarm state and activity into delta frames fanned out to subscribers."""
+
+    def __init__(self, interval: float = 0.25, max_pending: int = 32, max_events: int = 256, history: int = 64):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_events = max_events
+        self.seq = 0
+        self._sources: List[Callable[[], Dict[str, dict]]] = []
+        self._pushed: Dict[str, dict] = {}
+        self._state: Dict[str, dict] = {}        # as of the last frame
+        self._events: deque = deque()            # appended from any thread
+        self._traffic: Dict[Tuple[str, str], int] = {}
+        self._history: deque = deque(maxlen=history)
+        self._subscribers: set = set()
+        self._snapshot = (-1, b"")
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"frames": 0, "snapshots": 0, "events": 0, "dropped": 0, "bytes": 0}
+
+    # -- sources ------------------------------------------------------------
+
+    def watch(self, bus):
+        """Include every agent registered on `bus` in the pushed state."""
+        self._sources.append(lambda: {aid: _agent_state(agent) for aid, agent in bus._agents.items()})
+
+    def update(self, key: str, **fields):
+        """Push state fields for `key` (an agent id or any other dashboard entity)."""
+        self._pushed.setdefault(key, {}).update(fields)
+
+    def remove(self, key: str):
+        self._pushed.pop(key, None)
+
+    def publish(self, kind: str, data: dict):
+        """Queue an activity event for the next frame. Safe to call from any thread."""
+        self._events.append({"ts": round(time.time(), 3), "kind": kind, **data})
+
+    def message(self, message: Any, target_id: Optional[str], bus=None):
+        """MessageBus.send hook: counts routed messages per (type, target) until the next frame."""
+        target = bus._agents.get(target_id) if bus is not None and target_id else None
+        key = (type(message).__name__, target.card.name if target is not None else (target_id or "broadcast"))
+        self._traffic[key] = self._traffic.get(key, 0) + 1
+
+    def agents(self) -> List[dict]:
+        """Current state as a list, for GET /api/a2a/agents."""
+        return [{"id": key, **fields} for key, fields in self._collect().items()]
+
+    def _collect(self) -> Dict[str, dict]:
+        current: Dict[str, dict] = {}
+        for source in self._sources:
+            current.update(source())
+        for key, fields in self._pushed.items():
+            current[key] = {**current.get(key, {}), **fields}
+        return current
+
+    # -- frames -------------------------------------------------------------
+
+    def flush(self) -> Optional[bytes]:
+        """Build and fan out one delta frame; None when nothing changed."""
+        current = self._collect()
+        previous = self._state
+        changed = {}
+        for key, fields in current.items():
+            before = previous.get(key)
+            if before is None:
+                changed[key] = fields
+            else:
+                diff = {name: value for name, value in fields.items() if before.get(name) != value}
+                if diff:
+                    changed[key] = diff
+        removed = [key for key in previous if key not in current]
+
+        events = []
+        if self._traffic:
+            traffic, self._traffic = self._traffic, {}
+            ts = round(time.time(), 3)
+            events = [{"ts": ts, "kind": "message", "type": kind, "target": target, "count": count}
+                      for (kind, target), count in traffic.items()]
+        pending = self._events
+        while pending and len(events) < self.max_events:
+            events.append(pending.popleft())
+        dropped = 0
+        while pending:
+            pending.popleft()
+            dropped += 1
+
+        if not (changed or removed or events or dropped):
+            return None
+        self._state = current
+        self.seq += 1
+        body = {"seq": self.seq, "agents": changed, "removed": removed, "events": events}
+        if dropped:
+            body["dropped"] = dropped
+            _DROPPED.inc(dropped)
+        frame = _frame("delta", self.seq, body)
+        self._history.extend(events)
+        self.stats["frames"] += 1
+        self.stats["events"] += len(events)
+        self.stats["dropped"] += dropped
+        self.stats["bytes"] += len(frame)
+        _FRAMES.labels("delta").inc()
+
+        for subscriber in self._subscribers:
+            subscriber.offer(frame)
+        return frame
+
+    def snapshot(self) -> bytes:
+        """Full state as of the last frame, plus recent events; built at most once per frame."""
+        seq, frame = self._snapshot
+        if seq != self.seq or not frame:
+            body = {"seq": self.seq, "agents": self._state, "events": list(self._history)}
+            frame = _frame("snapshot", self.seq, body)
+            self._snapshot = (self.seq, frame)
+            self.stats["snapshots"] += 1
+            _FRAMES.labels("snapshot").inc()
+        return frame
+
+    def subscribe(self, max_pending: Optional[int] = None) -> Subscriber:
+        subscriber = Subscriber(self, max_pending or self.max_pending)
+        self._subscribers.add(subscriber)
+        _SUBSCRIBERS.set(len(self._subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+        _SUBSCRIBERS.set(len(self._subscribers))
+
+    def close(self):
+        """Disconnect every subscriber (their streams end after the current frame)."""
+        for subscriber in list(self._subscribers):
+            subscriber.close()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    # -- flush loop ---------------------------------------------------------
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Event flush failed: {e}")
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+_SSE_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Connection: keep-alive\r\n"
+    b"X-Accel-Buffering: no\r\n"
+    # control.html connects from the browser
+    b"Access-Control-Allow-Origin: *\r\n\r\n"
+    b"retry: 2000\n\n"
+)
+
+
+async def _respond(writer: asyncio.StreamWriter, status: str, body: bytes, content_type: str = "application/json"):
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+        f"Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+
+async def _stream(hub: EventHub, writer: asyncio.StreamWriter, heartbeat: float):
+    subscriber = hub.subscribe()
+    try:
+        writer.write(_SSE_HEADERS)
+        while not (subscriber.closed or writer.is_closing()):
+            frame = await subscriber.get(timeout=heartbeat)
+            writer.write(frame or HEARTBEAT)
+            # While this waits on a slow socket, new frames pile up in the
+            # subscriber until it is reset to a snapshot
+            await writer.drain()
+    finally:
+        subscriber.close()
+
+
+async def start_event_server(hub: EventHub, port: int = 9465, host: str = "127.0.0.1",
+                             heartbeat: float = 15.0) -> asyncio.AbstractServer:
+    """Serve the event stream and the agent list on the running loop. Returns the server."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            method, path = head.split(b" ", 2)[:2]
+            path = path.split(b"?", 1)[0]
+            if method != b"GET":
+                await _respond(writer, "405 Method Not Allowed", b"")
+            elif path == b"/api/a2a/events":
+                await _stream(hub, writer, heartbeat)
+            elif path == b"/api/a2a/agents":
+                await _respond(writer, "200 OK", json.dumps(hub.agents(), default=str).encode())
+            else:
+                await _respond(writer, "404 Not Found", b"")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Loop shutting down with the client still connected; nothing to report
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port, limit=MAX_REQUEST_BYTES)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from agents.scheduler import load_registry
+
+    parser = argparse.ArgumentParser(description="Serve the control.html event stream with simulated registry activity")
+    parser.add_argument("--port", type=int, default=9465)
+    parser.add_argument("--interval", type=float, default=0.25, help="seconds between frames")
+    args = parser.parse_args()
+
+    async def main():
+        hub = EventHub(interval=args.interval)
+        entries = load_registry()["agents"]
+        for entry in entries:
+            hub.update(entry["id"], name=entry.get("role", entry["id"]), capabilities=entry.get("capabilities", []),
+                       received=0, sent=0, inbox=0, ratio=1.0)
+        hub.start()
+        await start_event_server(hub, port=args.port)
+        print("NODE: 0x923-SEA")
+        print(f"Event stream: control.html?events=http://127.0.0.1:{args.port}")
+        rng = random.Random(923)
+        sent = {entry["id"]: 0 for entry in entries}
+        received = dict(sent)
+        while True:
+            await asyncio.sleep(args.interval)
+            source, target = rng.sample(entries, 2)
+            sent[source["id"]] += 1
+            received[target["id"]] += 1
+            hub.update(source["id"], sent=sent[source["id"]], inbox=rng.randint(0, 8))
+            hub.update(target["id"], received=received[target["id"]])
+            if rng.random() < 0.05:
+                hub.publish("audit", {"node_id": "0x923-SEA", "level": "WARNING",
+                                      "message": f"BLOCK source={source['id']} target={target['id']}"})
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
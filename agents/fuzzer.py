@@ -1,23 +1,678 @@
-import requests
+"""
+Cube Fuzzer - Local, parallel fuzzing of the cube, voxel, mesh and Z-order decoders.
+
+Seeds come from the published artifacts (cubes/*.cube, cubes/*.json, *.voxel,
+identity.cube), synthetic mesh packets (plus any recorded traffic trace) and
+Morton codes. Each target runs in a process pool: workers mutate the shared
+corpus byte-wise and structurally (decode the JSON/base64/gzip layers, mutate
+a node, re-encode), execute the decoder under a time and memory budget and
+return anything new.
+
+Findings (crashes, hangs, out-of-memory, inputs over the time or memory
+limit) are minimized in the worker, deduplicated by signature and written
+with the growing corpus under cache/fuzz/.
+
+Targets:
+  cube_decoder     agents.healer.load_canonical (JSON / base64+gzip|zlib JSON)
+  chunked_cube     core.cube_chunks.ChunkedCube header parse, verify and range read
+  cube_transport   agents.protocol.CubeTransport.unpack over mutated cube fields
+  mesh_packet      BaseAgent.process_mesh_packet
+  morton           core.interleave.deinterleave_3d round trip
+
+Usage:
+  python agents/fuzzer.py --duration 60 --workers 4
+  python agents/fuzzer.py --targets morton,cube_decoder --time-limit-ms 20 --trace capture.a2at
+"""
+import argparse
+import asyncio
+import base64
+import copy
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
 import random
-import hex
+import re
+import signal
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join("cache", "fuzz")
+SEED_PATTERNS = ("cubes/*.cube", "cubes/*.json", "*.voxel", "identity.cube", "identity.json")
+
+MAX_INPUT = 1 << 16           # mutated inputs are truncated to this size
+MINIMIZE_BUDGET = 400         # executions spent minimizing one finding
+MAX_CORPUS_PER_TARGET = 2000
+
+
+class Rejected(Exception):
+    """Input rejected before it reached the decoder under test (not a finding)."""
+
+
+class _Hang(BaseException):
+    """Raised from SIGALRM when one execution exceeds the hang limit."""
+
+
+class FuzzTarget(NamedTuple):
+    setup: Callable[[], Callable[[bytes], None]]   # runs once per worker; ImportError = unavailable
+    seeds: Callable[[str], List[bytes]]
+    expected: Tuple[type, ...] = ()                # clean rejections raised by the decoder itself
+
+
+# ============================================================================
+# TARGETS
+# ============================================================================
+
+def _artifact_seeds(root: str) -> List[bytes]:
+    seeds = []
+    for pattern in SEED_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            with open(path, "rb") as f:
+                seeds.append(f.read()[:MAX_INPUT])
+    return seeds
+
+
+def _setup_cube_decoder():
+    from agents.healer import load_canonical
+    return load_canonical
+
+
+def _chunked_cube_seeds(root: str) -> List[bytes]:
+    from core.cube_chunks import decode_legacy, pack
+    seeds = []
+    for path in sorted(glob.glob(os.path.join(root, "cubes", "*.cube"))):
+        try:
+            with open(path, "rb") as f:
+                doc = json.load(f)
+            payload = decode_legacy(doc)
+        except (ValueError, KeyError, TypeError, zlib.error):
+            continue
+        seeds.append(pack(payload[:MAX_INPUT // 2], doc.get("descriptor", "FUZZ|SEED|OK"), block_size=256))
+    return seeds or [pack(b'{"seed": true}' * 64, "FUZZ|SEED|OK", block_size=256)]
+
+
+def _setup_chunked_cube():
+    from core.cube_chunks import ChunkedCube
+
+    def run(data: bytes):
+        cube = ChunkedCube(data, workers=1)
+        cube.verify()
+        if cube.length:
+            cube.read(cube.length // 3, cube.block_size)
+    return run
+
+
+def _mesh_packet_seeds(root: str) -> List[bytes]:
+    packets = []
+    for intent, content in (("TREND|ANALYZE|1", "barcelona - frankfurt"), ("GH|LIST_REPOS|1", ""),
+                            ("REPORT|TREND|OK", {"topics": ["a", "b"]}), ("REPORT|TREND|FAIL", "timeout")):
+        packets.append({
+            "headers": {"x-a2a-sender": "Fuzzer", "x-a2a-context-id": "ctx-923", "x-a2a-hop-count": "0"},
+            "body": {"intent": intent, "payload": {"content": content}},
+        })
+    return [json.dumps(p, separators=(",", ":")).encode() for p in packets]
+
+
+def _setup_mesh_packet():
+    from agents.platform import BaseAgent, logger as platform_logger
+
+    class _FuzzAgent(BaseAgent):
+        async def handle_task(self, request):
+            return None
+
+        async def handle_response(self, response):
+            pass
+
+    class _ErrorCapture(logging.Handler):
+        def __init__(self):
+            super().__init__(logging.ERROR)
+            self.message = None
+
+        def emit(self, record):
+            self.message = record.getMessage()
+
+    # process_mesh_packet logs and swallows its own exceptions: surface them
+    capture = _ErrorCapture()
+    platform_logger.addHandler(capture)
+    platform_logger.setLevel(logging.ERROR)
+    platform_logger.propagate = False
+    agent = _FuzzAgent("Fuzzer", "Mesh packet fuzz target", can_delegate=False)
+    loop = asyncio.new_event_loop()
+
+    def run(data: bytes):
+        try:
+            packet = json.loads(data)
+        except (ValueError, RecursionError) as e:
+            raise Rejected(e)
+        if not isinstance(packet, dict):
+            raise Rejected("packet is not an object")
+        capture.message = None
+        loop.run_until_complete(agent.process_mesh_packet(packet))
+        if capture.message:
+            raise RuntimeError(capture.message)
+    return run
+
+
+def _cube_template():
+    from agents.platform import TaskRequest
+    from agents.protocol import CubeTransport
+    return CubeTransport, CubeTransport.pack(TaskRequest(requester_id="fuzz", content="seed"), from_agent="Fuzzer")
+
+
+def _to_json(value):
+    if isinstance(value, (bytes, bytearray)):
+        return {"__b64__": base64.b64encode(bytes(value)).decode()}
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if set(value) == {"__b64__"} and isinstance(value["__b64__"], str):
+            return base64.b64decode(value["__b64__"])
+        return {k: _from_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    return value
+
+
+def _cube_transport_seeds(root: str) -> List[bytes]:
+    from agents.platform import TaskRequest, TaskResponse
+    transport, _ = _cube_template()
+    messages = [
+        TaskRequest(requester_id="fuzz", content="barcelona - frankfurt"),
+        TaskRequest(requester_id="fuzz", content={"topic": "x", "limit": 3}),
+        TaskResponse(task_id="t1", responder_id="fuzz", status="completed", output="ok"),
+    ]
+    return [json.dumps(_to_json(vars(transport.pack(m, from_agent="Fuzzer")))).encode() for m in messages]
+
+
+def _setup_cube_transport():
+    transport, template = _cube_template()
+
+    def run(data: bytes):
+        try:
+            fields = _from_json(json.loads(data))
+        except (ValueError, RecursionError) as e:
+            raise Rejected(e)
+        if not isinstance(fields, dict):
+            raise Rejected("cube fields are not an object")
+        cube = copy.copy(template)
+        for name, value in fields.items():
+            if hasattr(template, name):
+                setattr(cube, name, value)
+        transport.unpack(cube)
+    return run
+
+
+def _morton_seeds(root: str) -> List[bytes]:
+    from core.interleave import interleave_3d
+    coords = [(0, 0, 0), (476, 122, 2339), (1, 1, 1), (2**32 - 1, 2**32 - 1, 2**32 - 1), (2**31, 0, 7)]
+    return [interleave_3d(*c).encode() for c in coords]
+
+
+def _setup_morton():
+    from core.interleave import deinterleave_3d, interleave_3d
+
+    def run(data: bytes):
+        try:
+            text = data.decode("ascii")
+            code = int(text, 16)
+        except ValueError as e:
+            raise Rejected(e)
+        try:
+            x, y, d = deinterleave_3d(text)
+        except ValueError:
+            return
+        if int(interleave_3d(x, y, d), 16) != code:
+            raise AssertionError(f"round trip mismatch for {text[:40]}")
+    return run
+
+
+TARGETS: Dict[str, FuzzTarget] = {
+    "cube_decoder": FuzzTarget(_setup_cube_decoder, _artifact_seeds),
+    "chunked_cube": FuzzTarget(_setup_chunked_cube, _chunked_cube_seeds, (ValueError,)),
+    "cube_transport": FuzzTarget(_setup_cube_transport, _cube_transport_seeds, (ValueError, zlib.error)),
+    "mesh_packet": FuzzTarget(_setup_mesh_packet, _mesh_packet_seeds),
+    "morton": FuzzTarget(_setup_morton, _morton_seeds),
+}
+
+
+# ============================================================================
+# MUTATION
+# ============================================================================
+
+INTERESTING_BYTES = [
+    b"0", b"-1", b"1e999", b"NaN", b"null", b"true", b"[]", b"{}", b'""', b"\x00", b"\xff", b"\\u0000",
+    b"0x" + b"f" * 32, b"[" * 2000, b'{"a":' * 1500, b"A" * 4096,
+]
+INTERESTING_VALUES = [
+    None, True, 0, -1, 2**63, 2**96, 2**128, 1e308, "", "A" * 10000, "0x" + "f" * 40, [], {}, "\u0000", "../../etc/passwd",
+]
+
+
+def mutate_bytes(data: bytes, rng: random.Random, corpus: List[bytes]) -> bytes:
+    buf = bytearray(data)
+    for _ in range(rng.randint(1, 4)):
+        op = rng.randrange(8)
+        pos = rng.randint(0, len(buf))
+        if op == 0 and buf:                                      # flip a bit
+            i = rng.randrange(len(buf))
+            buf[i] ^= 1 << rng.randrange(8)
+        elif op == 1 and buf:                                    # interesting byte
+            buf[rng.randrange(len(buf))] = rng.choice((0x00, 0x7f, 0x80, 0xff, 0x22, 0x5c, 0x7b, 0x5b))
+        elif op == 2:                                            # insert random bytes
+            buf[pos:pos] = rng.randbytes(rng.randint(1, 16))
+        elif op == 3 and buf:                                    # delete a range
+            del buf[pos:pos + rng.randint(1, max(1, len(buf) // 8))]
+        elif op == 4 and buf:                                    # duplicate a range
+            start = rng.randrange(len(buf))
+            buf[pos:pos] = buf[start:start + rng.randint(1, 64)]
+        elif op == 5:                                            # interesting token
+            buf[pos:pos] = rng.choice(INTERESTING_BYTES)
+        elif op == 6 and corpus:                                 # splice with another input
+            other = rng.choice(corpus)
+            cut = rng.randint(0, len(other))
+            buf = buf[:pos] + other[cut:]
+        elif op == 7 and buf:                                    # truncate
+            del buf[pos:]
+    return bytes(buf[:MAX_INPUT])
+
+
+def _decode_layers(data: bytes):
+    """(object, encoder) for JSON or base64-wrapped gzip/zlib JSON; None if opaque."""
+    try:
+        return json.loads(data), lambda obj: json.dumps(obj).encode()
+    except (ValueError, RecursionError):
+        pass
+    try:
+        raw = base64.b64decode(data, validate=True)
+    except ValueError:
+        return None
+    for decompress, compress in ((gzip.decompress, gzip.compress), (zlib.decompress, zlib.compress)):
+        try:
+            obj = json.loads(decompress(raw))
+        except (OSError, EOFError, zlib.error, ValueError, RecursionError):
+            continue
+        return obj, lambda o, c=compress: base64.b64encode(c(json.dumps(o).encode()))
+    return None
+
+
+def mutate_structured(data: bytes, rng: random.Random) -> Optional[bytes]:
+    """Mutate one node of the decoded structure and re-apply the same encoding layers."""
+    decoded = _decode_layers(data)
+    if decoded is None:
+        return None
+    obj, encode = decoded
+    slots = []
+    stack = [obj]
+    while stack and len(slots) < 1000:
+        node = stack.pop()
+        keys = list(node) if isinstance(node, dict) else range(len(node)) if isinstance(node, list) else ()
+        for key in keys:
+            slots.append((node, key))
+            stack.append(node[key])
+    if not slots:
+        obj = rng.choice(INTERESTING_VALUES)
+    else:
+        node, key = rng.choice(slots)
+        choice = rng.randrange(4)
+        if choice == 0 and isinstance(node, dict):
+            del node[key]
+        elif choice == 1 and isinstance(node, dict):
+            node[f"{key}_{rng.randrange(100)}"] = node[key]
+        elif choice == 2:
+            deep = inner = []
+            for _ in range(rng.choice((50, 500))):
+                inner.append([])
+                inner = inner[0]
+            node[key] = deep
+        else:
+            node[key] = rng.choice(INTERESTING_VALUES)
+    try:
+        return encode(obj)[:MAX_INPUT]
+    except (ValueError, RecursionError):
+        return None
+
+
+# ============================================================================
+# EXECUTION (pool workers)
+# ============================================================================
+
+@dataclass
+class Limits:
+    time_ms: float = 50.0
+    memory_mb: float = 64.0       # growth of the worker's peak RSS during one execution; 0 disables
+    hang_s: float = 2.0
+    rss_mb: float = 512.0         # address-space headroom per worker; 0 disables
+
+
+try:
+    import resource as _resource
+except ImportError:           # not available on Windows
+    _resource = None
+
+_targets: Dict[str, Tuple[Optional[Callable], Optional[str]]] = {}
+
+
+def _init_worker(rss_mb: float):
+    try:
+        resource = _resource
+        if resource is not None and rss_mb:
+            with open("/proc/self/status") as f:
+                vm = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmSize"))
+            limit = vm + int(rss_mb * 1024 * 1024)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (OSError, ValueError, StopIteration):
+        pass
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def _on_alarm(signum, frame):
+    raise _Hang()
+
+
+def _load_target(name: str):
+    if name not in _targets:
+        try:
+            _targets[name] = (TARGETS[name].setup(), None)
+        except Exception as e:
+            _targets[name] = (None, f"{type(e).__name__}: {e}")
+    return _targets[name]
+
+
+def _signature(exc: BaseException) -> str:
+    """Exception type plus the innermost frame that raised it."""
+    tb = exc.__traceback__
+    while tb is not None and tb.tb_next is not None:
+        tb = tb.tb_next
+    where = f"{os.path.basename(tb.tb_frame.f_code.co_filename)}:{tb.tb_lineno}" if tb else "?"
+    return f"{type(exc).__name__}@{where}"
+
+
+_DIGITS = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+def _peak_rss_mb() -> float:
+    if _resource is None:
+        return 0.0
+    peak = _resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _reason(e: BaseException) -> str:
+    """Exception message without the input echoed back, so rejections group by cause."""
+    return _DIGITS.sub("N", str(e).split(":", 1)[0])[:60]
+
+
+def execute(run: Callable, data: bytes, expected: tuple, limits: Limits) -> Tuple[str, str, float, float]:
+    """
+    Run one input. Returns (kind, signature, elapsed_ms, rss_growth_mb) where
+    kind is ok | rejected | crash | hang | oom. Memory is measured as growth of
+    the peak RSS (one getrusage call) rather than with tracemalloc, which costs
+    several times the throughput; an input that allocates past the previous
+    high-water mark by more than the limit is still caught.
+    """
+    track_memory = limits.memory_mb > 0
+    rss_before = _peak_rss_mb() if track_memory else 0.0
+    arm = limits.hang_s > 0 and hasattr(signal, "setitimer")
+    start = time.perf_counter()
+    try:
+        if arm:
+            signal.setitimer(signal.ITIMER_REAL, limits.hang_s)
+        try:
+            run(data)
+        finally:
+            if arm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        kind, signature = "ok", "ok"
+    except Rejected as e:
+        kind, signature = "rejected", _reason(e)
+    except _Hang:
+        kind, signature = "hang", "hang"
+    except MemoryError as e:
+        kind, signature = "oom", _signature(e)
+    except expected as e:
+        kind, signature = "rejected", f"{type(e).__name__}:{_reason(e)}"
+    except Exception as e:
+        kind, signature = "crash", _signature(e)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    growth_mb = _peak_rss_mb() - rss_before if track_memory else 0.0
+    return kind, signature, elapsed_ms, growth_mb
+
+
+def _classify(kind: str, signature: str, elapsed_ms: float, growth_mb: float, limits: Limits) -> Optional[str]:
+    """Finding key for an execution result, or None when it is unremarkable."""
+    if kind in ("crash", "hang", "oom"):
+        return f"{kind}:{signature}"
+    if elapsed_ms > limits.time_ms:
+        return f"slow:{signature}"
+    if limits.memory_mb and growth_mb > limits.memory_mb:
+        return f"memory:{signature}"
+    return None
+
+
+def minimize(run: Callable, data: bytes, expected: tuple, limits: Limits, key: str, budget: int = MINIMIZE_BUDGET) -> bytes:
+    """Delta-debugging style chunk removal while the input still reproduces `key`."""
+    def reproduces(candidate: bytes) -> bool:
+        return _classify(*execute(run, candidate, expected, limits), limits) == key
+
+    chunk = max(1, len(data) // 2)
+    while chunk >= 1 and budget > 0:
+        i, shrunk = 0, False
+        while i < len(data) and budget > 0:
+            candidate = data[:i] + data[i + chunk:]
+            budget -= 1
+            if candidate != data and reproduces(candidate):
+                data, shrunk = candidate, True
+            else:
+                i += chunk
+        if not shrunk:
+            chunk //= 2
+    return data
+
+
+def fuzz_round(target: str, corpus: List[bytes], known: set, seed: int, duration: float, limits: Limits) -> dict:
+    """One worker time slice: mutate, execute, keep new behaviours and findings."""
+    run, error = _load_target(target)
+    if run is None:
+        return {"target": target, "skipped": error}
+    expected = TARGETS[target].expected
+
+    rng = random.Random(seed)
+    local = list(corpus)
+    new_inputs, findings = [], {}
+    seen = set(known)
+    execs = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        parent = rng.choice(local)
+        data = (rng.random() < 0.3 and mutate_structured(parent, rng)) or mutate_bytes(parent, rng, local)
+        kind, signature, elapsed_ms, growth_mb = execute(run, data, expected, limits)
+        execs += 1
+
+        behaviour = f"{kind}:{signature}"
+        if behaviour not in seen:
+            seen.add(behaviour)
+            local.append(data)
+            new_inputs.append((behaviour, data))
+
+        key = _classify(kind, signature, elapsed_ms, growth_mb, limits)
+        if key is not None and key not in findings and key not in known:
+            small = minimize(run, data, expected, limits, key)
+            findings[key] = {"input": small, "elapsed_ms": round(elapsed_ms, 3), "rss_growth_mb": round(growth_mb, 3),
+                             "original_size": len(data)}
+    return {"target": target, "execs": execs, "inputs": new_inputs, "findings": findings}
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+@dataclass
+class FuzzReport:
+    execs: Dict[str, int] = field(default_factory=dict)
+    corpus: Dict[str, int] = field(default_factory=dict)
+    findings: Dict[str, Dict[str, dict]] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    duration_s: float = 0.0
+
+    def __str__(self):
+        total = sum(self.execs.values())
+        lines = [f"Duration:   {self.duration_s:.1f} s",
+                 f"Execs:      {total:,} ({total / self.duration_s if self.duration_s else 0:,.0f}/s)"]
+        for target, execs in self.execs.items():
+            lines.append(f"  {target:<15} {execs:>10,} execs  corpus {self.corpus.get(target, 0):>5}  "
+                         f"findings {len(self.findings.get(target, {}))}")
+        for target, reason in self.skipped.items():
+            lines.append(f"  {target:<15} skipped: {reason}")
+        for target, found in self.findings.items():
+            for key, info in found.items():
+                lines.append(f"  ! {target} {key} ({len(info['input'])} bytes, {info['elapsed_ms']} ms, +{info['rss_growth_mb']} MB RSS)")
+        return "\n".join(lines)
+
 
 class CubeFuzzer:
-    def __init__(self, endpoint="https://philhills.ai/identity.json"):
-        self.endpoint = endpoint
+    """Runs the targets across a process pool and persists corpus and findings."""
+
+    def __init__(self, root: str = REPO_ROOT, targets: Optional[List[str]] = None, workers: Optional[int] = None,
+                 limits: Optional[Limits] = None, output_dir: Optional[str] = None, seed: int = 923,
+                 trace: Optional[str] = None):
+        self.root = root
+        self.targets = targets or list(TARGETS)
+        self.workers = workers or os.cpu_count() or 1
+        self.limits = limits or Limits()
+        self.output_dir = output_dir or os.path.join(root, OUTPUT_DIR)
+        self.seed = seed
+        self.trace = trace
+        self.corpus: Dict[str, List[bytes]] = {}
+        self.behaviours: Dict[str, set] = {}
+        self.report = FuzzReport()
+
+    def load_corpus(self):
+        for target in self.targets:
+            try:
+                seeds = TARGETS[target].seeds(self.root)
+            except Exception as e:
+                self.report.skipped[target] = f"{type(e).__name__}: {e}"
+                continue
+            if target == "mesh_packet" and self.trace:
+                from agents.traffic import read_trace
+                seeds += [json.dumps(m, default=str).encode() for _, _, m in read_trace(self.trace) if isinstance(m, dict)]
+            directory = os.path.join(self.output_dir, "corpus", target)
+            if os.path.isdir(directory):
+                for name in sorted(os.listdir(directory)):
+                    with open(os.path.join(directory, name), "rb") as f:
+                        seeds.append(f.read())
+            if seeds:
+                self.corpus[target] = seeds
+                self.behaviours[target] = set()
+            else:
+                self.report.skipped[target] = "no seeds"
 
-    def generate_adversarial_cube(self):
-        # Stress-test Z-Order boundary conditions
-        return {"z": hex(random.getrandbits(128)), "payload": "LATENT_STRESS_TEST"}
+    def run(self, duration: float = 60.0, round_s: float = 2.0) -> FuzzReport:
+        self.load_corpus()
+        active = [t for t in self.targets if t in self.corpus]
+        rng = random.Random(self.seed)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.limits.rss_mb,)) as pool:
+            round_no = 0
+            while active and time.perf_counter() - start < duration:
+                slice_s = min(round_s, max(0.1, duration - (time.perf_counter() - start)))
+                jobs = []
+                for i in range(self.workers):
+                    # Rotate so every target gets rounds when there are more targets than workers
+                    target = active[(round_no * self.workers + i) % len(active)]
+                    known = self.behaviours[target] | set(self.report.findings.get(target, {}))
+                    jobs.append(pool.submit(fuzz_round, target, self.corpus[target], known,
+                                            rng.getrandbits(64), slice_s, self.limits))
+                for job in jobs:
+                    self._merge(job.result())
+                active = [t for t in active if t not in self.report.skipped]
+                round_no += 1
+        self.report.duration_s = time.perf_counter() - start
+        self._save()
+        return self.report
+
+    def _merge(self, result: dict):
+        target = result["target"]
+        if "skipped" in result:
+            self.report.skipped[target] = result["skipped"]
+            return
+        self.report.execs[target] = self.report.execs.get(target, 0) + result["execs"]
+        corpus = self.corpus[target]
+        for behaviour, data in result["inputs"]:
+            if behaviour not in self.behaviours[target] and len(corpus) < MAX_CORPUS_PER_TARGET:
+                self.behaviours[target].add(behaviour)
+                corpus.append(data)
+        found = self.report.findings.setdefault(target, {})
+        for key, info in result["findings"].items():
+            if key not in found or len(info["input"]) < len(found[key]["input"]):
+                found[key] = info
+        self.report.corpus[target] = len(corpus)
+
+    def _save(self):
+        for target, corpus in self.corpus.items():
+            directory = os.path.join(self.output_dir, "corpus", target)
+            os.makedirs(directory, exist_ok=True)
+            for data in corpus:
+                path = os.path.join(directory, hashlib.sha1(data).hexdigest()[:16])
+                if not os.path.exists(path):
+                    with open(path, "wb") as f:
+                        f.write(data)
+        summary = {"duration_s": round(self.report.duration_s, 3), "execs": self.report.execs,
+                   "skipped": self.report.skipped, "findings": {}}
+        for target, found in self.report.findings.items():
+            directory = os.path.join(self.output_dir, "findings", target)
+            os.makedirs(directory, exist_ok=True)
+            for key, info in found.items():
+                name = f"{key.split(':', 1)[0]}-{hashlib.sha1(key.encode()).hexdigest()[:12]}.bin"
+                with open(os.path.join(directory, name), "wb") as f:
+                    f.write(info["input"])
+                summary["findings"].setdefault(target, []).append({
+                    "key": key, "file": os.path.join("findings", target, name), "size": len(info["input"]),
+                    "original_size": info["original_size"], "elapsed_ms": info["elapsed_ms"], "rss_growth_mb": info["rss_growth_mb"],
+                })
+        with open(os.path.join(self.output_dir, "report.json"), "w") as f:
+            json.dump(summary, f, indent=2)
 
-    def execute_audit(self):
-        # Automated zero-day scan for Q-Protocol schemas
-        print(f"Auditing Agent Voxel at {self.endpoint}...")
-        payload = self.generate_adversarial_cube()
-        print(f"Injecting Adversarial Payload: {payload}")
-        # In a real environment, this would post to an endpoint
-        # requests.post(self.endpoint, json=payload)
 
 if __name__ == "__main__":
-    fuzzer = CubeFuzzer()
-    fuzzer.execute_audit()
+    parser = argparse.ArgumentParser(description="Parallel fuzzer for cube, voxel, mesh and Z-order decoders")
+    parser.add_argument("--duration", type=float, default=60.0, help="total seconds to fuzz")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="comma-separated target names")
+    parser.add_argument("--time-limit-ms", type=float, default=50.0, help="report inputs slower than this")
+    parser.add_argument("--mem-limit-mb", type=float, default=64.0, help="report inputs growing peak RSS by more than this (0 = off)")
+    parser.add_argument("--hang-limit-s", type=float, default=2.0, help="abort an execution after this long")
+    parser.add_argument("--trace", default=None, help="traffic trace (.a2at) to seed mesh packets from")
+    parser.add_argument("--seed", type=int, default=923)
+    args = parser.parse_args()
+    unknown = [t for t in args.targets.split(",") if t.strip() and t.strip() not in TARGETS]
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(unknown)} (choose from {', '.join(TARGETS)})")
+
+    fuzzer = CubeFuzzer(
+        targets=[t.strip() for t in args.targets.split(",") if t.strip()],
+        workers=args.workers,
+        limits=Limits(args.time_limit_ms, args.mem_limit_mb, args.hang_limit_s),
+        seed=args.seed,
+        trace=args.trace,
+    )
+    print(f"Fuzzing {', '.join(fuzzer.targets)} on {fuzzer.workers} workers for {args.duration:.0f}s...")
+    print(fuzzer.run(args.duration))
@@ -1,35 +1,534 @@
 """
 Healer Agent - Continuous Monitoring of Semantic Drift via Z-Order Verification.
+
+DriftMonitor watches identity, voxel and cube artifacts. On Linux it blocks
+on inotify (via ctypes) and wakes only when a watched directory changes;
+elsewhere it falls back to stat polling. Only files whose stat changed are
+re-read; a file is re-parsed and structurally diffed against its cached
+canonical form only when its SHA-256 changed. Z-order fields
+({"z_index": ..., "coordinates": [x, y, d]}) are verified with the
+core/interleave decoder and every drift is emitted as a DriftEvent.
+
+Usage:
+  python agents/healer.py                 # one-shot identity audit
+  python agents/healer.py --watch         # long-running drift monitor
 """
+import argparse
+import base64
+import binascii
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import gzip
 import hashlib
 import json
 import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.interleave import deinterleave_3d
+from agents.metrics import registry
 
 logging.basicConfig(level=logging.INFO)
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATTERNS = ("identity.json", "identity.cube", "cube.json", "*.voxel", "cubes/*.json", "cubes/*.cube")
+STATE_PATH = os.path.join("cache", "healer_state.json")
+
+_DRIFT_EVENTS = registry.counter("healer_drift_events_total", "Drift events emitted by the healer", ("kind",))
+
+
 def z_order_integrity_check(encoded_z, coordinates):
-    # Simulated Z-Order Check
-    # In production, this imports core/interleave.py
-    return True
+    """True when the Morton code decodes back to exactly (x, y, d)."""
+    try:
+        return deinterleave_3d(encoded_z) == tuple(int(c) for c in coordinates)
+    except (TypeError, ValueError):
+        return False
 
-def audit_identity_cube(identity_path="../identity.json"):
+
+# ============================================================================
+# CANONICAL FORM + STRUCTURAL DIFF
+# ============================================================================
+
+def load_canonical(raw: bytes) -> Any:
+    """
+    Parsed structure of an artifact: plain JSON, or base64 over gzip/zlib
+    JSON (the voxel/cube encodings). None for opaque payloads, which are
+    tracked by hash only.
+    """
     try:
-        with open(identity_path, 'r') as f:
-            data = json.load(f)
-        
-        # Verify Z-Order if present (simplified check)
-        if "context" in data:
-            logging.info("Agent Voxel Integrity: VERIFIED")
-            return True
+        return json.loads(raw)
+    except (UnicodeDecodeError, json.JSONDecodeError, RecursionError):
+        pass
+    try:
+        decoded = base64.b64decode(raw, validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    for decompress in (gzip.decompress, zlib.decompress):
+        try:
+            return json.loads(decompress(decoded))
+        except (OSError, EOFError, zlib.error, UnicodeDecodeError, json.JSONDecodeError, RecursionError):
+            continue
+    return None
+
+
+def structural_diff(old: Any, new: Any, path: str = "$") -> List[Tuple[str, str]]:
+    """(json-path, op) for every added, removed or changed node."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in old.keys() - new.keys():
+            changes.append((f"{path}.{key}", "removed"))
+        for key in new.keys() - old.keys():
+            changes.append((f"{path}.{key}", "added"))
+        for key in old.keys() & new.keys():
+            if old[key] != new[key]:
+                changes.extend(structural_diff(old[key], new[key], f"{path}.{key}"))
+        return sorted(changes)
+    if isinstance(old, list) and isinstance(new, list):
+        changes = []
+        for i in range(max(len(old), len(new))):
+            if i >= len(new):
+                changes.append((f"{path}[{i}]", "removed"))
+            elif i >= len(old):
+                changes.append((f"{path}[{i}]", "added"))
+            elif old[i] != new[i]:
+                changes.extend(structural_diff(old[i], new[i], f"{path}[{i}]"))
+        return changes
+    return [] if old == new else [(path, "changed")]
+
+
+def zorder_violations(obj: Any, path: str = "$") -> List[str]:
+    """JSON paths of every z_index that does not decode to its coordinates."""
+    violations = []
+    if isinstance(obj, dict):
+        if "z_index" in obj and "coordinates" in obj:
+            if not z_order_integrity_check(obj["z_index"], obj["coordinates"]):
+                violations.append(f"{path}.z_index")
+        for key, value in obj.items():
+            if isinstance(value, (dict, list)):
+                violations.extend(zorder_violations(value, f"{path}.{key}"))
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            if isinstance(value, (dict, list)):
+                violations.extend(zorder_violations(value, f"{path}[{i}]"))
+    return violations
+
+
+# ============================================================================
+# FILE WATCHING
+# ============================================================================
+
+class _Inotify:
+    """Directory watches over the Linux inotify syscalls, loaded through ctypes."""
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._dirs: Dict[int, str] = {}
+        self.lost: List[str] = []  # watched directories removed since the last read()
+
+    def add_watch(self, directory: str):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), directory)
+        self._dirs[wd] = directory
+
+    def read(self) -> Tuple[List[str], bool]:
+        """Drain pending events: (changed paths, queue overflowed)."""
+        paths, overflow = [], False
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return paths, overflow
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = self.EVENT.unpack_from(buf, offset)
+                offset += self.EVENT.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    overflow = True
+                elif mask & self.IN_IGNORED:
+                    if wd in self._dirs:
+                        self.lost.append(self._dirs.pop(wd))
+                elif wd in self._dirs and name:
+                    paths.append(os.path.join(self._dirs[wd], os.fsdecode(name)))
+
+    def close(self):
+        os.close(self.fd)
+
+
+@dataclass
+class DriftEvent:
+    path: str
+    kind: str                       # modified | missing | zorder_violation
+    digest: Optional[str] = None
+    previous_digest: Optional[str] = None
+    changes: List[Tuple[str, str]] = field(default_factory=list)
+    violations: List[str] = field(default_factory=list)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class DriftMonitor:
+    """
+    Long-running drift monitor over every file under `root` matching
+    `patterns` (directory/glob pairs such as "cubes/*.cube").
+
+    The per-file stat and sha256 are persisted to `state_path`, so drift
+    that happened while the monitor was down is reported on the next start.
+    Parsed canonical forms (needed to diff the next change) are written once
+    per content hash to a snapshot directory beside it and loaded on demand,
+    so an event rewrites a few bytes of state, not every parsed artifact.
+
+    Watched directories that do not exist yet (or are removed and recreated)
+    are picked up when they appear.
+    """
+
+    def __init__(self, root: str = REPO_ROOT, patterns: Iterable[str] = DEFAULT_PATTERNS,
+                 state_path: Optional[str] = None, poll_interval: float = 2.0,
+                 debounce: float = 0.05, use_inotify: bool = True):
+        self.root = os.path.abspath(root)
+        self.state_path = state_path or os.path.join(self.root, STATE_PATH)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        self.listeners: List[Callable[[DriftEvent], None]] = []
+        self.backend = None
+        # directory -> basename globs, so an event is matched without walking the tree
+        self._globs: Dict[str, List[str]] = {}
+        for pattern in patterns:
+            directory, glob = os.path.split(pattern)
+            self._globs.setdefault(os.path.normpath(os.path.join(self.root, directory)), []).append(glob)
+        self.snapshot_dir = os.path.splitext(self.state_path)[0] + "_snapshots"
+        self._cache: Dict[str, dict] = self._load_state()
+        self._canonical: Dict[str, Any] = {}  # rel -> canonical form, loaded lazily from snapshots
+        self._dirty = False
+        self._pending_dirs: set = set()  # watched directories that do not exist yet
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+
+    # --- tracking -----------------------------------------------------------
+
+    def add_listener(self, listener: Callable[[DriftEvent], None]):
+        self.listeners.append(listener)
+
+    def tracks(self, path: str) -> bool:
+        directory, name = os.path.split(path)
+        return any(fnmatch.fnmatchcase(name, glob) for glob in self._globs.get(directory, ()))
+
+    def tracked_files(self) -> List[str]:
+        files = []
+        for directory, globs in self._globs.items():
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file() and any(fnmatch.fnmatchcase(entry.name, g) for g in globs):
+                            files.append(entry.path)
+            except FileNotFoundError:
+                continue
+        return files
+
+    # --- checking -----------------------------------------------------------
+
+    def scan(self) -> List[DriftEvent]:
+        """Check every tracked file, including ones that vanished since the last scan."""
+        paths = set(self.tracked_files())
+        paths.update(os.path.join(self.root, rel) for rel in self._cache)
+        return self.check(paths)
+
+    def check(self, paths: Iterable[str]) -> List[DriftEvent]:
+        events = [event for event in map(self._check_one, paths) if event is not None]
+        for event in events:
+            self._emit(event)
+        if self._dirty:
+            self._save_state()
+        return events
+
+    def _missing(self, rel: str, cached: Optional[dict]) -> Optional[DriftEvent]:
+        if cached is None:
+            return None
+        del self._cache[rel]
+        self._canonical.pop(rel, None)
+        self._drop_snapshot(cached["sha256"])
+        self._dirty = True
+        return DriftEvent(rel, "missing", previous_digest=cached["sha256"])
+
+    def _check_one(self, path: str) -> Optional[DriftEvent]:
+        rel = os.path.relpath(path, self.root)
+        cached = self._cache.get(rel)
+        try:
+            st = os.stat(path)
+            stat_key = [st.st_size, st.st_mtime_ns]
+            if cached is not None and cached["stat"] == stat_key:
+                return None
+            with open(path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return self._missing(rel, cached)
+        except (PermissionError, IsADirectoryError) as e:
+            logging.warning(f"Healer cannot read {rel}: {e}")
+            return None
+        digest = hashlib.sha256(raw).hexdigest()
+        self._dirty = True
+        if cached is not None and cached["sha256"] == digest:
+            cached["stat"] = stat_key
+            return None
+
+        canonical = load_canonical(raw)
+        previous = self._previous_canonical(rel, cached)
+        self._cache[rel] = {"stat": stat_key, "sha256": digest}
+        self._canonical[rel] = canonical
+        self._write_snapshot(digest, canonical)
+        if cached is not None:
+            self._drop_snapshot(cached["sha256"])
+        try:
+            violations = zorder_violations(canonical) if canonical is not None else []
+        except RecursionError:
+            violations = ["$ (nested too deeply to verify)"]
+        if cached is None:
+            # First sighting is the baseline; only a broken Z-order is drift
+            if not violations:
+                return None
+            return DriftEvent(rel, "zorder_violation", digest, violations=violations)
+
+        changes = []
+        if canonical is not None and previous is not None:
+            try:
+                changes = structural_diff(previous, canonical)
+            except RecursionError:
+                changes = [("$", "changed")]
+        kind = "zorder_violation" if violations else "modified"
+        return DriftEvent(rel, kind, digest, cached["sha256"], changes, violations)
+
+    def _emit(self, event: DriftEvent):
+        _DRIFT_EVENTS.labels(event.kind).inc()
+        if event.kind == "zorder_violation":
+            logging.critical(f"Z-Order Drift: {event.path} {event.violations}")
+        elif event.kind == "missing":
+            logging.error(f"Artifact Missing: {event.path}")
         else:
+            logging.warning(f"Drift Detected: {event.path} ({len(event.changes)} structural changes)")
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logging.error(f"Drift listener failed: {e}")
+
+    # --- state --------------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, dict]:
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        cache = {}
+        for rel, entry in state.items():
+            if not isinstance(entry, dict) or "sha256" not in entry:
+                continue
+            # Older state files embedded the canonical form; move it to a snapshot
+            if entry.get("canonical") is not None:
+                self._write_snapshot(entry["sha256"], entry["canonical"])
+            cache[rel] = {"stat": entry["stat"], "sha256": entry["sha256"]}
+        return cache
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._cache, f, separators=(",", ":"))
+        os.replace(tmp, self.state_path)
+        self._dirty = False
+
+    def _snapshot_path(self, digest: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{digest}.json")
+
+    def _previous_canonical(self, rel: str, cached: Optional[dict]) -> Any:
+        if cached is None:
+            return None
+        if rel in self._canonical:
+            return self._canonical[rel]
+        try:
+            with open(self._snapshot_path(cached["sha256"]), "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError, RecursionError):
+            return None
+
+    def _write_snapshot(self, digest: str, canonical: Any):
+        if canonical is None:
+            return
+        path = self._snapshot_path(digest)
+        if os.path.exists(path):
+            return
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with open(path + ".tmp", "w") as f:
+                json.dump(canonical, f, separators=(",", ":"))
+            os.replace(path + ".tmp", path)
+        except (OSError, RecursionError, ValueError) as e:
+            logging.warning(f"Healer could not snapshot {digest[:12]}: {e}")
+
+    def _drop_snapshot(self, digest: str):
+        # Identical files share a snapshot; keep it while any tracked file still has that hash
+        if any(entry["sha256"] == digest for entry in self._cache.values()):
+            return
+        try:
+            os.remove(self._snapshot_path(digest))
+        except FileNotFoundError:
+            pass
+
+    # --- run loop -----------------------------------------------------------
+
+    def run(self):
+        """Block until stop(): initial scan, then inotify (or polling) driven checks."""
+        self._stop.clear()
+        self.scan()
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify()
+                self._watch_dirs(inotify, list(self._globs))
+            except (OSError, AttributeError) as e:
+                logging.warning(f"inotify unavailable ({e}); falling back to stat polling")
+                if inotify is not None:
+                    inotify.close()
+                inotify = None
+        self.backend = "inotify" if inotify else "poll"
+        logging.info(f"Healer: monitoring {len(self._cache)} artifacts via {self.backend}")
+        try:
+            if inotify:
+                self._run_inotify(inotify)
+            else:
+                self._run_polling()
+        finally:
+            if inotify:
+                inotify.close()
+
+    def _watch_dirs(self, inotify: _Inotify, directories: List[str]) -> List[str]:
+        """
+        Watch each directory that exists; for one that does not, watch its
+        nearest existing ancestor so its creation wakes the loop. Returns the
+        directories that became watched.
+        """
+        watched = []
+        for directory in directories:
+            if os.path.isdir(directory):
+                try:
+                    inotify.add_watch(directory)
+                    self._pending_dirs.discard(directory)
+                    watched.append(directory)
+                    continue
+                except FileNotFoundError:
+                    pass  # removed between the check and the watch
+            self._pending_dirs.add(directory)
+            parent = os.path.dirname(directory)
+            while parent and parent != os.path.dirname(parent) and not os.path.isdir(parent):
+                parent = os.path.dirname(parent)
+            if parent not in inotify._dirs.values():
+                try:
+                    inotify.add_watch(parent)
+                except OSError as e:
+                    logging.warning(f"Healer cannot watch {parent} for {directory}: {e}")
+        return watched
+
+    def _run_inotify(self, inotify: _Inotify):
+        while not self._stop.is_set():
+            # No timeout: the thread sleeps in the kernel until a write lands or stop() is called
+            ready, _, _ = select.select([inotify.fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                os.read(self._wake_r, 64)
+                continue
+            time.sleep(self.debounce)
+            paths, overflow = inotify.read()
+            lost, inotify.lost = [d for d in inotify.lost if d in self._globs], []
+            appeared = self._watch_dirs(inotify, lost + list(self._pending_dirs)) if lost or self._pending_dirs else []
+            if overflow or lost or appeared:
+                self.scan()
+            else:
+                self.check({p for p in paths if self.tracks(p)})
+
+    def _run_polling(self):
+        while not self._stop.is_set():
+            self.scan()
+            self._stop.wait(self.poll_interval)
+
+    def stop(self):
+        self._stop.set()
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError as e:
+            if e.errno != errno.EBADF:
+                raise
+
+
+def audit_identity_cube(identity_path="../identity.json"):
+    try:
+        with open(identity_path, 'rb') as f:
+            data = load_canonical(f.read())
+
+        if not isinstance(data, dict) or not ("context" in data or "@context" in data):
             logging.warning("Agent Voxel Drift Detected")
             return False
+        violations = zorder_violations(data)
+        if violations:
+            logging.warning(f"Agent Voxel Z-Order Drift Detected: {violations}")
+            return False
+        logging.info("Agent Voxel Integrity: VERIFIED")
+        return True
     except FileNotFoundError:
         logging.error("Agent Voxel Missing!")
         return False
 
 if __name__ == "__main__":
-    if audit_identity_cube():
+    parser = argparse.ArgumentParser(description="Healer agent")
+    parser.add_argument("--watch", action="store_true", help="run the continuous drift monitor")
+    parser.add_argument("--root", default=REPO_ROOT, help="site root to monitor")
+    parser.add_argument("--poll", action="store_true", help="force stat polling instead of inotify")
+    parser.add_argument("--events", default=None, help="append drift events to this JSONL file")
+    args = parser.parse_args()
+
+    if args.watch:
+        monitor = DriftMonitor(args.root, use_inotify=not args.poll)
+        if args.events:
+            def _append(event, path=args.events):
+                with open(path, "a") as f:
+                    f.write(json.dumps(event.to_dict()) + "\n")
+            monitor.add_listener(_append)
+        try:
+            monitor.run()
+        except KeyboardInterrupt:
+            monitor.stop()
+    elif audit_identity_cube():
         logging.info("Healer: System Healthy")
     else:
         logging.critical("Healer: Initiating Auto-Patch Sequence...")
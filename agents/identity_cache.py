@@ -0,0 +1,133 @@
+"""
+Identity Context Cache - Shared identity for agent construction.
+Loads the global identity once and reuses it until identity.json / agent.voxel change.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+IDENTITY_SOURCES = (ROOT_DIR / "identity.json", ROOT_DIR / "agent.voxel")
+MAX_INSTRUCTIONS = 256          # distinct roles kept; agents built per request must not grow this forever
+
+
+def _default_loader() -> str:
+    from agents.identity import get_identity_context
+    return get_identity_context()
+
+
+class IdentityContextProvider:
+    """
+    Memoized identity context.
+
+    Source files are stat'ed at most once per `check_interval` seconds. A changed
+    (mtime, size) triggers a content hash, and the context is only rebuilt when
+    that hash differs, so a plain `touch` does not invalidate anything.
+    """
+
+    def __init__(self, sources=IDENTITY_SOURCES, loader: Optional[Callable[[], str]] = None,
+                 check_interval: float = 1.0):
+        self.sources = tuple(Path(p) for p in sources)
+        self.check_interval = check_interval
+        self._loader = loader or _default_loader
+        self._lock = threading.Lock()
+        self._stat_key: Optional[Tuple] = None
+        self._content_hash: Optional[str] = None
+        self._context: Optional[str] = None
+        self._instructions: "OrderedDict[Optional[str], str]" = OrderedDict()
+        self._next_check = 0.0
+        self.reloads = 0
+
+    def _stat_sources(self) -> Tuple:
+        key = []
+        for path in self.sources:
+            try:
+                st = os.stat(path)
+                key.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                key.append(None)
+        return tuple(key)
+
+    def _hash_sources(self) -> str:
+        hasher = hashlib.sha256()
+        for path in self.sources:
+            try:
+                hasher.update(path.read_bytes())
+            except FileNotFoundError:
+                pass
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    def _refresh(self):
+        """Reload the context if the sources changed. Caller holds the lock."""
+        stat_key = self._stat_sources()
+        if stat_key == self._stat_key and self._context is not None:
+            return
+        content_hash = self._hash_sources()
+        self._stat_key = stat_key
+        if content_hash == self._content_hash and self._context is not None:
+            return
+        self._context = self._loader()
+        self._content_hash = content_hash
+        self._instructions.clear()
+        self.reloads += 1
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._context is not None and now < self._next_check:
+            return
+        with self._lock:
+            self._check_due(now)
+
+    def _check_due(self, now: float):
+        """Refresh if the check interval elapsed or the context was invalidated. Caller holds the lock."""
+        if self._context is None or now >= self._next_check:
+            self._refresh()
+            self._next_check = now + self.check_interval
+
+    def get_context(self) -> str:
+        """Return the global identity context string."""
+        self._ensure_fresh()
+        return self._context
+
+    def instruction_for(self, instruction: Optional[str] = None) -> str:
+        """Return the full agent instruction (identity + role), built once per role."""
+        instructions = self._instructions
+        now = time.monotonic()
+        if self._context is not None and now < self._next_check:
+            # Entries are only added under the lock, built from the context current at the time
+            cached = instructions.get(instruction)
+            if cached is not None:
+                try:
+                    instructions.move_to_end(instruction)
+                except KeyError:
+                    pass
+                return cached
+        # Freshness check and fill under one lock, so a reload in between cannot
+        # leave an instruction built from the previous identity in the new cache
+        with self._lock:
+            self._check_due(now)
+            cached = instructions.get(instruction)
+            if cached is None:
+                identity = self._context
+                cached = f"{identity}\n\nSPECIFIC ROLE:\n{instruction}" if instruction else identity
+                instructions[instruction] = cached
+                while len(instructions) > MAX_INSTRUCTIONS:
+                    instructions.popitem(last=False)
+            return cached
+
+    def invalidate(self):
+        """Force a reload on next access."""
+        with self._lock:
+            self._context = None
+            self._stat_key = None
+            self._content_hash = None
+            self._instructions.clear()
+
+
+# Process-wide provider shared by every BaseAgent
+identity_provider = IdentityContextProvider()
@@ -0,0 +1,307 @@
+"""
+Market Engine - Price-time priority order books for agent task negotiation.
+
+Each capability has its own OrderBook. Task buyers post bids (max credits per
+complexity unit) and agents post asks (min credits per unit). Bids and asks
+live in binary heaps keyed by (price, arrival sequence), so the best price
+wins and ties go to the earliest order. Submissions are only queued; match()
+crosses every book that received orders since the last call, so a burst of
+orders is matched in one pass. Orders fill partially and the remainder keeps
+its place in the queue.
+
+cross() is the bilateral alternative to match(): it fills one named bid
+against one named ask and leaves every other order, and every book still
+waiting for match(), untouched.
+
+Bids escrow quantity * limit price on the Ledger when submitted. A fill pays
+the seller the trade price (the resting order's price) minus the protocol
+fee and refunds the buyer's unused escrow. Cancelled and filled orders are
+removed lazily when they reach the top of a heap.
+
+Usage:
+  engine = MarketEngine(Ledger({"AGENT_00": 1000.0}))
+  engine.bid("AGENT_00", "fuzzing", quantity=250, price=0.0009)
+  engine.ask("AGENT_03", "fuzzing", quantity=100, price=0.0007)
+  fills = engine.match()
+"""
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+BID = "bid"
+ASK = "ask"
+
+STANDARD_RATE = 0.0008        # Q-Protocol standard credits per complexity unit
+PROTOCOL_FEE = 0.01           # share of each fill kept as protocol revenue
+
+
+class MarketError(Exception):
+    pass
+
+
+class InsufficientFunds(MarketError):
+    pass
+
+
+class Order:
+    __slots__ = ("id", "side", "owner", "capability", "price", "quantity", "remaining", "seq")
+
+    def __init__(self, order_id: int, side: str, owner: str, capability: str, price: float, quantity: int, seq: int):
+        self.id = order_id
+        self.side = side
+        self.owner = owner
+        self.capability = capability
+        self.price = price
+        self.quantity = quantity
+        self.remaining = quantity
+        self.seq = seq
+
+    @property
+    def filled(self) -> int:
+        return self.quantity - self.remaining
+
+    def __repr__(self):
+        return (f"Order({self.id}, {self.side}, {self.owner}, {self.capability}, "
+                f"{self.remaining}/{self.quantity} @ {self.price})")
+
+
+class Fill(NamedTuple):
+    bid_id: int
+    ask_id: int
+    buyer: str
+    seller: str
+    capability: str
+    quantity: int
+    price: float
+    value: float
+    fee: float
+
+
+# ============================================================================
+# LEDGER
+# ============================================================================
+
+class Ledger:
+    """Available balances, per-owner escrow and accrued protocol fees, in credits."""
+
+    def __init__(self, balances: Optional[Dict[str, float]] = None, fee_rate: float = PROTOCOL_FEE):
+        self.balances: Dict[str, float] = defaultdict(float, balances or {})
+        self.escrow: Dict[str, float] = defaultdict(float)
+        self.fee_rate = fee_rate
+        self.fees = 0.0
+        self.settlements = 0
+
+    def deposit(self, owner: str, amount: float):
+        self.balances[owner] += amount
+
+    def balance(self, owner: str) -> float:
+        return self.balances.get(owner, 0.0)
+
+    def reserve(self, owner: str, amount: float):
+        if self.balances[owner] < amount:
+            raise InsufficientFunds(f"{owner} has {self.balances[owner]:.6f}, needs {amount:.6f}")
+        self.balances[owner] -= amount
+        self.escrow[owner] += amount
+
+    def release(self, owner: str, amount: float):
+        self.escrow[owner] -= amount
+        self.balances[owner] += amount
+
+    def settle(self, buyer: str, seller: str, value: float, reserved: float) -> float:
+        """Pay `value` out of the buyer's `reserved` escrow; returns the fee taken."""
+        fee = value * self.fee_rate
+        self.escrow[buyer] -= reserved
+        self.balances[buyer] += reserved - value
+        self.balances[seller] += value - fee
+        self.fees += fee
+        self.settlements += 1
+        return fee
+
+
+# ============================================================================
+# ORDER BOOK
+# ============================================================================
+
+class OrderBook:
+    """Bids and asks for one capability. Heap entries: (key price, seq, order)."""
+    __slots__ = ("capability", "bids", "asks")
+
+    def __init__(self, capability: str):
+        self.capability = capability
+        self.bids: List[Tuple[float, int, Order]] = []   # key = -price: highest bid first
+        self.asks: List[Tuple[float, int, Order]] = []   # key = price: lowest ask first
+
+    def add(self, order: Order):
+        if order.side == BID:
+            heapq.heappush(self.bids, (-order.price, order.seq, order))
+        else:
+            heapq.heappush(self.asks, (order.price, order.seq, order))
+
+    def best_bid(self) -> Optional[Order]:
+        return self._top(self.bids)
+
+    def best_ask(self) -> Optional[Order]:
+        return self._top(self.asks)
+
+    @staticmethod
+    def _top(heap) -> Optional[Order]:
+        while heap and heap[0][2].remaining == 0:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def depth(self) -> Tuple[int, int]:
+        """Open (bid, ask) quantity."""
+        return (sum(o.remaining for _, _, o in self.bids), sum(o.remaining for _, _, o in self.asks))
+
+    def match(self, ledger: Ledger, fills: List[Fill], done: List[Order]):
+        """Cross the book until the best bid is below the best ask."""
+        bids, asks = self.bids, self.asks
+        heappop = heapq.heappop
+        capability = self.capability
+        while bids and asks:
+            bid = bids[0][2]
+            if bid.remaining == 0:
+                heappop(bids)
+                continue
+            ask = asks[0][2]
+            if ask.remaining == 0:
+                heappop(asks)
+                continue
+            if bid.price < ask.price:
+                return
+            if bid.owner == ask.owner:
+                # Self-trade prevention: the newer order is cancelled
+                newer = bid if bid.seq > ask.seq else ask
+                if newer is bid:
+                    ledger.release(bid.owner, bid.remaining * bid.price)
+                newer.remaining = 0
+                done.append(newer)
+                continue
+
+            quantity = bid.remaining if bid.remaining < ask.remaining else ask.remaining
+            price = bid.price if bid.seq < ask.seq else ask.price
+            value = quantity * price
+            fee = ledger.settle(bid.owner, ask.owner, value, quantity * bid.price)
+            fills.append(Fill(bid.id, ask.id, bid.owner, ask.owner, capability, quantity, price, value, fee))
+            bid.remaining -= quantity
+            ask.remaining -= quantity
+            if bid.remaining == 0:
+                heappop(bids)
+                done.append(bid)
+            if ask.remaining == 0:
+                heappop(asks)
+                done.append(ask)
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class MarketEngine:
+    """Per-capability order books settled against one Ledger."""
+
+    def __init__(self, ledger: Optional[Ledger] = None):
+        self.ledger = ledger or Ledger()
+        self.books: Dict[str, OrderBook] = {}
+        self.orders: Dict[int, Order] = {}          # open orders by id
+        self._ids = itertools.count(1)
+        self._pending = set()                       # books with orders since the last match()
+
+    def book(self, capability: str) -> OrderBook:
+        book = self.books.get(capability)
+        if book is None:
+            book = self.books[capability] = OrderBook(capability)
+        return book
+
+    def submit(self, side: str, owner: str, capability: str, quantity: int, price: float) -> Order:
+        if quantity <= 0 or price <= 0:
+            raise MarketError(f"quantity and price must be positive, got {quantity} @ {price}")
+        if side not in (BID, ASK):
+            raise MarketError(f"side must be {BID!r} or {ASK!r}, got {side!r}")
+        if side == BID:
+            self.ledger.reserve(owner, quantity * price)
+        order_id = next(self._ids)
+        order = Order(order_id, side, owner, capability, price, quantity, order_id)
+        self.orders[order_id] = order
+        self.book(capability).add(order)
+        self._pending.add(capability)
+        return order
+
+    def bid(self, owner: str, capability: str, quantity: int, price: float) -> Order:
+        return self.submit(BID, owner, capability, quantity, price)
+
+    def ask(self, owner: str, capability: str, quantity: int, price: float) -> Order:
+        return self.submit(ASK, owner, capability, quantity, price)
+
+    def submit_many(self, orders: Iterable[Tuple[str, str, str, int, float]]) -> Tuple[List[Order], List[Fill]]:
+        """Queue a batch of (side, owner, capability, quantity, price) and match once."""
+        placed = []
+        for side, owner, capability, quantity, price in orders:
+            try:
+                placed.append(self.submit(side, owner, capability, quantity, price))
+            except InsufficientFunds:
+                continue
+        return placed, self.match()
+
+    def cancel(self, order_id: int) -> bool:
+        order = self.orders.pop(order_id, None)
+        if order is None or order.remaining == 0:
+            return False
+        if order.side == BID:
+            self.ledger.release(order.owner, order.remaining * order.price)
+        order.remaining = 0
+        return True
+
+    def cancel_open(self) -> int:
+        """Cancel every open order (end of a trading session) and refund escrow."""
+        cancelled = 0
+        for order_id in list(self.orders):
+            cancelled += self.cancel(order_id)
+        for book in self.books.values():
+            book.bids.clear()
+            book.asks.clear()
+        return cancelled
+
+    def match(self) -> List[Fill]:
+        fills: List[Fill] = []
+        done: List[Order] = []
+        for capability in self._pending:
+            self.books[capability].match(self.ledger, fills, done)
+        self._pending.clear()
+        orders = self.orders
+        for order in done:
+            orders.pop(order.id, None)
+        return fills
+
+    def cross(self, bid_id: int, ask_id: int) -> Optional[Fill]:
+        """
+        Fill one bid directly against one ask, for a two-party negotiation.
+        Returns None when the orders don't cross; other orders on the book
+        are not matched (their fills stay with the next match() caller).
+        """
+        bid, ask = self.orders.get(bid_id), self.orders.get(ask_id)
+        if bid is None or ask is None or bid.side != BID or ask.side != ASK:
+            raise MarketError(f"cross() needs an open bid and ask, got {bid_id} and {ask_id}")
+        if bid.capability != ask.capability:
+            raise MarketError(f"cannot cross {bid.capability} bid with {ask.capability} ask")
+        if bid.price < ask.price or bid.owner == ask.owner:
+            return None
+        quantity = min(bid.remaining, ask.remaining)
+        price = bid.price if bid.seq < ask.seq else ask.price
+        value = quantity * price
+        fee = self.ledger.settle(bid.owner, ask.owner, value, quantity * bid.price)
+        bid.remaining -= quantity
+        ask.remaining -= quantity
+        for order in (bid, ask):
+            if order.remaining == 0:
+                del self.orders[order.id]
+        return Fill(bid.id, ask.id, bid.owner, ask.owner, bid.capability, quantity, price, value, fee)
+
+    def quote(self, capability: str) -> Tuple[Optional[float], Optional[float]]:
+        """(best bid, best ask) prices for a capability."""
+        book = self.books.get(capability)
+        if book is None:
+            return None, None
+        bid, ask = book.best_bid(), book.best_ask()
+        return (bid.price if bid else None, ask.price if ask else None)
@@ -0,0 +1,295 @@
+"""
+Metrics - Process-wide counters, gauges and latency histograms.
+
+Recording is a dict lookup plus an integer update, so it is cheap enough for
+the per-message hot path. Updates are not locked: under heavy contention from
+many threads an increment can occasionally be lost, which is acceptable for
+monitoring data.
+
+The registry renders the Prometheus text exposition format, served by
+`start_metrics_server()` for Prometheus to scrape (the trend pipeline starts it
+with --metrics-port).
+
+Usage:
+  from agents.metrics import registry
+  handled = registry.counter("a2a_tasks_total", "Tasks handled", ("agent",))
+  handled.labels("Trend Pipeline").inc()
+"""
+import math
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+
+class _HistogramChild:
+    """
+    HDR-style log-linear histogram over integer microseconds (or bytes): each
+    power of two is split into SUB_BUCKETS linear buckets, giving a relative
+    error below 1/SUB_BUCKETS at any magnitude with a fixed set of counters.
+    """
+    SUB_BITS = 3
+    SUB_BUCKETS = 1 << SUB_BITS
+    MAX_BUCKETS = 64 * SUB_BUCKETS
+    __slots__ = ("counts", "count", "total", "scale")
+
+    def __init__(self, scale: float):
+        self.counts = [0] * self.MAX_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.scale = scale
+
+    @classmethod
+    def _index(cls, v: int) -> int:
+        if v < cls.SUB_BUCKETS:
+            return v
+        shift = v.bit_length() - cls.SUB_BITS - 1
+        return (shift + 1) * cls.SUB_BUCKETS + (v >> shift) - cls.SUB_BUCKETS
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        """Largest integer value that falls in bucket `index`."""
+        if index < cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        mantissa = index % cls.SUB_BUCKETS + cls.SUB_BUCKETS
+        return ((mantissa + 1) << shift) - 1
+
+    def observe(self, value: float):
+        v = int(value * self.scale)
+        self.counts[self._index(v) if v > 0 else 0] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self._upper_bound(index) / self.scale
+        return self._upper_bound(self.MAX_BUCKETS - 1) / self.scale
+
+    def cumulative(self, ends: Sequence[int]) -> List[int]:
+        """Observation counts in buckets [0, end) for each of the ascending `ends`."""
+        out, seen, start, counts = [], 0, 0, self.counts
+        for end in ends:
+            seen += sum(counts[start:end])
+            out.append(seen)
+            start = end
+        return out
+
+
+class _Metric:
+    kind = ""
+    child_class = _CounterChild
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        self._unlabelled = self._new_child() if not self.labelnames else None
+
+    def _new_child(self):
+        return self.child_class()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self):
+        if self._unlabelled is not None:
+            yield (), self._unlabelled
+        yield from list(self._children.items())
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._samples():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {child.value}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+    child_class = _CounterChild
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled.inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+    child_class = _GaugeChild
+
+    def set(self, value: float):
+        self._unlabelled.set(value)
+
+
+class Histogram(_Metric):
+    """
+    Latency (seconds, recorded at microsecond resolution) or size histogram.
+
+    Observations are kept at full HDR resolution for quantile(), but only the
+    power-of-two bucket edges from `min_value` to `max_value` are exported
+    (about 20 `le` lines), empty or not, so the series stay the same from one
+    scrape to the next. Power-of-two edges fall exactly on HDR bucket
+    boundaries, so every exported count is exact.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), scale: float = 1e6,
+                 min_value: float = 1e-4, max_value: float = 60.0):
+        self.scale = scale
+        self.min_value = min_value
+        self.max_value = max_value
+        first = (max(1, int(min_value * scale)) - 1).bit_length()
+        last = min((max(1, int(max_value * scale)) - 1).bit_length(), 63)
+        # (bucket index where the edge starts, rendered le label) per exported edge
+        edges = [(_HistogramChild._index(1 << k), 'le="%.10g"' % ((1 << k) / scale)) for k in range(first, last + 1)]
+        self._ends = [end for end, _ in edges]
+        self._les = [le for _, le in edges]
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.scale)
+
+    def observe(self, value: float):
+        self._unlabelled.observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._samples():
+            for le, cumulative in zip(self._les, child.cumulative(self._ends)):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {child.count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, values)} {child.total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, values)} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric in the process; get-or-create by name."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), scale: float = 1e6,
+                  min_value: float = 1e-4, max_value: float = 60.0) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, scale=scale,
+                                   min_value=min_value, max_value=max_value)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by the platform instrumentation
+registry = MetricsRegistry()
+
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1",
+                         metrics: MetricsRegistry = registry) -> "ThreadingHTTPServer":
+    """
+    Serve GET /metrics in a daemon thread. Returns the server (call .shutdown() to stop).
+    Loopback only by default; pass host="0.0.0.0" to let a remote Prometheus scrape it.
+    On loopback any origin may read the endpoint, so local dashboards can fetch it.
+    """
+    # http.server (and the email package behind it) is only imported when serving,
+    # so `import agents.platform` does not pay for it
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    cors = host in ("127.0.0.1", "::1", "localhost")
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            if cors:
+                self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="a2a-metrics", daemon=True).start()
+    return server
@@ -1,26 +1,107 @@
 import asyncio
+import dataclasses
+import importlib.util
 import logging
 import uuid
 import datetime
 import json
-from typing import Dict, Any, Optional, List, Callable
-from pydantic import BaseModel
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Callable, NamedTuple, Tuple, Union, Awaitable, TYPE_CHECKING
 from dataclasses import dataclass, field
-from agents.identity import get_identity_context
+from agents.tracing import tracer
+from agents.metrics import registry
 from .protocol import CubeTransport, A2AMessage
-from .mesh import AgentMeshCommunicator
 from services.cube_protocol import CubeObject
 
-# Import Cube Protocol
-try:
-    from cube_protocol import CubeProtocol
-    CUBE_AVAILABLE = True
-except ImportError:
-    CUBE_AVAILABLE = False
+if TYPE_CHECKING:
+    from .mesh import AgentMeshCommunicator
+
+# Cube Protocol (q-protocol) is optional and imported on first use; only
+# check that it is installed here to keep cold starts cheap.
+CUBE_AVAILABLE = importlib.util.find_spec("cube_protocol") is not None
+if not CUBE_AVAILABLE:
     logging.warning("q-protocol not installed. Install: pip install q-protocol")
 
 logger = logging.getLogger("platform")
 
+# Process-wide metrics (see agents/metrics.py); per-agent children are bound in BaseAgent.__init__
+_MESSAGES_RECEIVED = registry.counter("a2a_messages_received_total", "Messages delivered to an agent inbox", ("agent",))
+_MESSAGES_SENT = registry.counter("a2a_messages_sent_total", "Cube-compressed messages sent by an agent", ("agent",))
+_INBOX_DEPTH = registry.gauge("a2a_inbox_depth", "Messages waiting in an agent inbox", ("agent",))
+_QUEUE_WAIT = registry.histogram("a2a_queue_wait_seconds", "Time a message waited in an agent inbox", ("agent",))
+_HANDLER_TIME = registry.histogram("a2a_handler_seconds", "handle_task latency", ("agent", "intent"))
+_CODEC_TIME = registry.histogram("a2a_codec_seconds", "Cube compress/decompress latency", ("agent", "op"))
+_BYTES_IN = registry.counter("a2a_bytes_in_total", "Cube bytes decoded by an agent", ("agent", "domain"))
+_BYTES_OUT = registry.counter("a2a_bytes_out_total", "Cube bytes encoded by an agent", ("agent", "domain"))
+_COMPRESSION_RATIO = registry.gauge("a2a_compression_ratio", "Measured Cube size reduction (1 - cube/raw bytes)", ("agent",))
+# Intent verbs come off the wire: each agent labels handler latency with its first
+# MAX_INTENT_LABELS distinct verbs and folds the rest into "other"
+MAX_INTENT_LABELS = 32
+
+@lru_cache(maxsize=1)
+def _shared_cube_codec():
+    """One CubeProtocol codec per process; it holds no per-agent state."""
+    if not CUBE_AVAILABLE:
+        return None
+    from cube_protocol import CubeProtocol
+    return CubeProtocol()
+
+@lru_cache(maxsize=1)
+def _mesh_class():
+    """Resolve the mesh module once; each agent still gets its own communicator."""
+    from .mesh import AgentMeshCommunicator
+    return AgentMeshCommunicator
+
+class ParsedIntent(NamedTuple):
+    """A2AC intent split once into its parts, e.g. "GH|LIST_REPOS|1"."""
+    domain: str
+    verb: str
+    args: Tuple[str, ...]
+    raw: str
+    is_report: bool
+    is_failure: bool
+    is_command: bool
+
+@lru_cache(maxsize=4096)
+def parse_intent(intent: str) -> ParsedIntent:
+    """
+    Parse an intent string into (domain, verb, args).
+    Mesh traffic reuses a small vocabulary of intents, so results are cached
+    and the per-packet cost is a single dict lookup.
+    """
+    parts = intent.split("|")
+    if len(parts) == 1:
+        domain, verb, args = "", parts[0], ()
+    else:
+        domain, verb, args = parts[0], parts[1], tuple(parts[2:])
+    return ParsedIntent(
+        domain=domain,
+        verb=verb,
+        args=args,
+        raw=intent,
+        is_report="REPORT" in intent,
+        is_failure="REPORT_FAIL" in intent,
+        is_command=len(parts) > 1,
+    )
+
+def _message_headers(message: Any) -> Optional[dict]:
+    """A2A headers of a mesh packet or TaskRequest/TaskResponse, if any."""
+    if isinstance(message, dict):
+        return message.get("headers")
+    return getattr(message, "headers", None)
+
+def _with_headers(message: Any, headers: dict) -> Any:
+    """Copy of `message` carrying `headers`; the sender's message is left untouched."""
+    if isinstance(message, dict):
+        return {**message, "headers": headers}
+    if dataclasses.is_dataclass(message):
+        return dataclasses.replace(message, headers=headers)
+    return message
+
+# Intent handler: (intent, payload, headers) -> optional response sent back to the sender
+IntentHandler = Callable[[ParsedIntent, Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+
 @dataclass
 class AgentCard:
     uuid: str
@@ -28,11 +109,12 @@ class AgentCard:
     description: str
     version: str = "1.0.0"
     capabilities: list = field(default_factory=list)
+    registry_id: Optional[str] = None  # entry in agents/capabilities.json, e.g. "AGENT_03"
 
 @dataclass
 class TaskRequest:
     requester_id: str
-    content: str
+    content: Union[str, dict, list]
     task_id: str = field(default_factory=lambda: str(datetime.datetime.now().timestamp()))
     context: dict = field(default_factory=dict)
     headers: dict = field(default_factory=lambda: {
@@ -46,7 +128,7 @@ class TaskResponse:
     task_id: str
     responder_id: str
     status: str
-    output: str
+    output: Union[str, dict, list]
     artifacts: list = field(default_factory=list)
     timestamp: str = field(default_factory=lambda: datetime.datetime.utcnow().isoformat())
     headers: dict = field(default_factory=dict)
@@ -58,10 +140,53 @@ class MessageBus:
     def __init__(self):
         self._agents: Dict[str, 'BaseAgent'] = {}
         self._history: List[CubeObject] = []
+        self._capture = None  # TrafficRecorder while capturing (see agents/traffic.py)
+        self.scheduler = None  # TaskScheduler fed live inbox depth (see agents/scheduler.py)
+        self.events = None  # EventHub pushing state and traffic to dashboards (see agents/events.py)
+
+    def start_capture(self, path: str):
+        """Write every routed message, with timing, to a binary trace at `path`."""
+        from agents.traffic import TrafficRecorder
+        self.stop_capture()
+        self._capture = TrafficRecorder(path, agents=list(self._agents))
+        return self._capture
+
+    def stop_capture(self):
+        if self._capture is not None:
+            capture, self._capture = self._capture, None
+            try:
+                capture.close()
+            except Exception as e:
+                logger.error(f"Traffic capture close failed: {e}")
+
+    def _capture_failed(self, error: Exception):
+        # A full disk or closed trace file must not break routing: drop the capture
+        logger.error(f"Traffic capture failed, stopping it: {error}")
+        self.stop_capture()
+
+    def attach_scheduler(self, scheduler):
+        """Route by capability through `scheduler`, binding every registered agent to its registry entry."""
+        self.scheduler = scheduler
+        for agent in self._agents.values():
+            scheduler.bind(agent.card.uuid, agent.card.registry_id, agent.card.name)
+        return scheduler
+
+    def attach_events(self, hub):
+        """Stream this bus's agent state and routed messages through `hub`."""
+        self.events = hub
+        hub.watch(self)
+        return hub
 
     def register(self, agent: 'BaseAgent'):
         self._agents[agent.card.uuid] = agent
         agent.connect(self)
+        if self._capture is not None:
+            try:
+                self._capture.add_agents([agent.card.uuid])
+            except Exception as e:
+                self._capture_failed(e)
+        if self.scheduler is not None:
+            self.scheduler.bind(agent.card.uuid, agent.card.registry_id, agent.card.name)
         logger.info(f"Registered agent: {agent.card.name} ({agent.card.uuid})")
 
     async def send(self, message: Any, target_id: str = None):
@@ -70,61 +195,163 @@ class MessageBus:
         Supports generic Any for A2AC Mesh Packets (Dicts) or legacy CubeObjects.
         """
         self._history.append(message)
+        if self._capture is not None:
+            try:
+                self._capture.record(message, target_id)
+            except Exception as e:
+                self._capture_failed(e)
+        if self.events is not None:
+            self.events.message(message, target_id, self)
         
         # In a real system, we'd route by reading the Cube header or outer envelope.
         # Here we rely on the caller specifying the target ID or broadcasting.
         
-        if target_id:
-            if target_id in self._agents:
-                await self._agents[target_id].receive(message)
+        headers = _message_headers(message) if tracer.enabled else None
+        with tracer.span("bus.send", headers=headers, target=target_id) as span:
+            if headers is not None:
+                # Stamp a copy: the caller may reuse its message (and headers) for other sends
+                headers = dict(headers)
+                span.inject(headers)
+                message = _with_headers(message, headers)
+            if target_id:
+                if target_id in self._agents:
+                    await self._agents[target_id].receive(message)
+                else:
+                    logger.warning(f"Target agent {target_id} not found.")
             else:
-                logger.warning(f"Target agent {target_id} not found.")
-        else:
-            # Broadcast
-            for aid, agent in self._agents.items():
-                # Don't echo back (logic to identify sender needs to be better in real impl)
-                # For now just send to all
-                await agent.receive(message)
+                # Broadcast
+                for aid, agent in self._agents.items():
+                    # Don't echo back (logic to identify sender needs to be better in real impl)
+                    # For now just send to all
+                    await agent.receive(message)
 
 class BaseAgent:
     """
     Abstract base agent that communicates via the A2A+Cube protocol.
     """
-    def __init__(self, name: str, description: str, instruction: str = None, capabilities: Optional[List[str]] = None, can_delegate: bool = True):
+    def __init__(self, name: str, description: str, instruction: str = None, capabilities: Optional[List[str]] = None, can_delegate: bool = True,
+                 registry_id: Optional[str] = None):
         self.card = AgentCard(
             uuid=str(uuid.uuid4()),
             name=name,
             description=description,
-            capabilities=capabilities or []
+            capabilities=capabilities or [],
+            registry_id=registry_id
         )
-        # Inject Global Identity
-        identity = get_identity_context()
-        self.instruction = f"{identity}\n\nSPECIFIC ROLE:\n{instruction}" if instruction else identity
+        # Inject Global Identity (memoized, reloaded when identity files change);
+        # imported on first use to keep `import agents.platform` cheap
+        from agents.identity_cache import identity_provider
+        self.instruction = identity_provider.instruction_for(instruction)
         self.can_delegate = can_delegate
         self.bus: MessageBus = None
         self.inbox: asyncio.Queue = asyncio.Queue()
+        self._inbox_stamps: Dict[int, int] = {}  # id(message) -> enqueue time (perf_counter_ns)
+
+        # Per-verb mesh dispatch table (see register_intent_handler)
+        self._intent_handlers: Dict[str, IntentHandler] = {}
+        self._intent_labels: set = set()
+
+        # Optional request coalescing / result cache (see enable_task_cache)
+        self.task_cache = None
 
         # Cube Protocol integration
-        self.cube = CubeProtocol() if CUBE_AVAILABLE else None
+        self.cube = _shared_cube_codec()
         
         # Agent Mesh Communicator (Nervous System)
-        self.mesh = AgentMeshCommunicator(agent_name=name)
+        self.mesh = _mesh_class()(agent_name=name)
         
         self.stats = {
             "messages_sent": 0,
             "messages_received": 0,
             "tokens_saved": 0,
-            "compression_ratio": 0.98  # Average 98% reduction
+            "bytes_raw": 0,
+            "bytes_compressed": 0,
+            "compression_ratio": 0.0  # Measured: 1 - bytes_compressed / bytes_raw
         }
+        self._m_received = _MESSAGES_RECEIVED.labels(name)
+        self._m_sent = _MESSAGES_SENT.labels(name)
+        self._m_inbox_depth = _INBOX_DEPTH.labels(name)
+        self._m_queue_wait = _QUEUE_WAIT.labels(name)
+        self._m_ratio = _COMPRESSION_RATIO.labels(name)
+        self._m_compress = _CODEC_TIME.labels(name, "compress")
+        self._m_decompress = _CODEC_TIME.labels(name, "decompress")
         
         logger.info(f"Agent {name} initialized with Cube Protocol: {CUBE_AVAILABLE}")
 
     def connect(self, bus: MessageBus):
         self.bus = bus
 
+    def register_intent_handler(self, verb: str, handler: IntentHandler):
+        """
+        Route mesh packets whose intent verb matches `verb` straight to `handler`,
+        bypassing the generic TaskRequest/TaskResponse reconstruction.
+        """
+        self._intent_handlers[verb] = handler
+
+    def enable_task_cache(self, max_entries: int = 1024, ttl: float = 3600.0, persist_dir: str = None, key_fn=None):
+        """
+        Deduplicate identical in-flight requests and cache completed results.
+        Only for agents whose handle_task returns its response.
+        """
+        from agents.task_cache import TaskCoalescer
+        self.task_cache = TaskCoalescer(self.card.name, max_entries=max_entries, ttl=ttl,
+                                        persist_dir=persist_dir, key_fn=key_fn)
+        return self.task_cache
+
     async def receive(self, message: Any):
         """Called by bus when a message arrives."""
+        self.stats['messages_received'] += 1
+        self._m_received.inc()
+        # Messages consumed outside start() (e.g. polling the inbox directly)
+        # never pop their stamp; drop stale ones instead of growing forever.
+        if len(self._inbox_stamps) > self.inbox.qsize() + 1024:
+            self._inbox_stamps.clear()
+        self._inbox_stamps[id(message)] = time.perf_counter_ns()
         await self.inbox.put(message)
+        self._report_depth()
+
+    def _report_depth(self):
+        depth = self.inbox.qsize()
+        self._m_inbox_depth.set(depth)
+        if self.bus is not None and self.bus.scheduler is not None:
+            self.bus.scheduler.report_depth(self.card.uuid, depth)
+
+    def _record_inbox_wait(self, message: Any):
+        stamp = self._inbox_stamps.pop(id(message), None)
+        self._report_depth()
+        if stamp is None:
+            return
+        now = time.perf_counter_ns()
+        self._m_queue_wait.observe((now - stamp) / 1e9)
+        if tracer.enabled:
+            tracer.record("agent.inbox_wait", stamp, now,
+                          headers=_message_headers(message), agent=self.card.name)
+
+    def _intent_label(self, intent: Optional[ParsedIntent]) -> str:
+        """Bounded `intent` label for handler latency (see MAX_INTENT_LABELS)."""
+        if intent is None:
+            return "task"
+        verb = intent.verb
+        if verb not in self._intent_labels:
+            if len(self._intent_labels) >= MAX_INTENT_LABELS:
+                return "other"
+            self._intent_labels.add(verb)
+        return verb
+
+    async def _run_task(self, request: TaskRequest, intent: Optional[ParsedIntent] = None):
+        """Invoke handle_task inside a tracing span, recording handler latency."""
+        start = time.perf_counter()
+        try:
+            with tracer.span("agent.handle_task", headers=request.headers, agent=self.card.name,
+                             intent=intent.raw if intent else None):
+                if self.task_cache is not None:
+                    return await self.task_cache.run(request, lambda: self.handle_task(request))
+                return await self.handle_task(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            _HANDLER_TIME.labels(self.card.name, self._intent_label(intent)).observe(elapsed)
+            if self.bus is not None and self.bus.scheduler is not None:
+                self.bus.scheduler.report_latency(self.card.uuid, elapsed)
 
     async def start(self):
         """Start the agent's message processing loop and background tasks."""
@@ -139,6 +366,7 @@ class BaseAgent:
             try:
                 # Wait for incoming messages
                 message = await self.inbox.get()
+                self._record_inbox_wait(message)
                 
                 # [A2AC] Detect Mesh Packet (Dict) vs Legacy Object (TaskRequest)
                 if isinstance(message, dict) and "headers" in message:
@@ -146,7 +374,7 @@ class BaseAgent:
                 
                 elif isinstance(message, TaskRequest):
                     # Legacy direct object support
-                    response = await self.handle_task(message)
+                    response = await self._run_task(message)
                     
                     # Send response back to requester
                     if self.bus and response:
@@ -167,61 +395,58 @@ class BaseAgent:
         """
         [A2AC] Unwrap a Mesh Packet and route to handle_task or handle_response.
         """
+        headers = packet.get("headers", {})
+        body = packet.get("body", {})
+        with tracer.span("agent.process_mesh_packet", headers=headers, agent=self.card.name, intent=body.get("intent")):
+            await self._process_mesh_packet(headers, body, packet)
+
+    async def _process_mesh_packet(self, headers: Dict[str, Any], body: Dict[str, Any], packet: Dict[str, Any]):
         try:
-            headers = packet.get("headers", {})
-            body = packet.get("body", {})
-            
             # 1. Validate
             if not self.mesh.validate_incoming(packet):
                 return
             
-            # 2. Extract Intent
-            intent = body.get("intent", "")
+            # 2. Extract Intent (parsed once per distinct intent string)
+            intent = parse_intent(body.get("intent", ""))
             payload_data = body.get("payload", {})
             content = payload_data.get("content", "")
             
             sender = headers.get("x-a2a-sender", "Unknown")
             ctx_id = headers.get("x-a2a-context-id")
             
-            logger.info(f"[{self.card.name}] Recv Mesh Packet: {intent} from {sender}")
+            logger.info("[%s] Recv Mesh Packet: %s from %s", self.card.name, intent.raw, sender)
+            
+            # 3. Dispatch: registered verb handlers first
+            handler = self._intent_handlers.get(intent.verb)
+            if handler is not None:
+                response = await handler(intent, payload_data, headers)
+                if self.bus and response:
+                    await self.bus.send(response, sender)
+                return
             
-            # 3. Dispatch based on Intent
-            if "REPORT" in intent:
+            if intent.is_report:
                 # It is a Response (TaskResponse-equivalent)
-                # Construct a virtual TaskResponse
-                status = "completed" if "REPORT_FAIL" not in intent else "failed"
-                
-                # Check if payload content is JSON (some agents output JSON strings)
-                output_str = content
-                if isinstance(content, (dict, list)):
-                    output_str = json.dumps(content)
-                    
+                # Structured content (dict/list) is passed through as-is.
                 response = TaskResponse(
                     task_id=ctx_id or "unknown", # A2AC uses Context ID as primary trace
                     responder_id=sender,
-                    status=status,
-                    output=output_str,
+                    status="failed" if intent.is_failure else "completed",
+                    output=content,
                     headers=headers
                 )
                 await self.handle_response(response)
                 
             else:
                 # It is a Request (TaskRequest-equivalent)
-                # Construct a virtual TaskRequest
+                # Command intents (e.g. "GH|LIST_REPOS|1") carry the command themselves.
                 request = TaskRequest(
                     requester_id=sender,
-                    content=str(payload_data.get("content", "")), # Or re-construct command from Intent if needed
+                    content=intent.raw if intent.is_command else content,
                     task_id=ctx_id or str(uuid.uuid4()),
                     headers=headers
                 )
-                
-                # Special Case: If intent has command structure (e.g. GH|CMD), use that
-                # Many agents parse intent/content. Let's use the explicit content field if present, else Intent.
-                if "|" in intent and "REPORT" not in intent:
-                     # Intent might be "GH|LIST_REPOS|1"
-                     request.content = intent
 
-                response = await self.handle_task(request)
+                response = await self._run_task(request, intent)
                 
                 # Helper: If response is already a Mesh Packet (Dict), send it directly
                 if self.bus and response:
@@ -239,6 +464,39 @@ class BaseAgent:
                 return agent_id
         return None
     
+    def _find_capable_agent(self, capability: str, tokens: int = 1) -> str:
+        """
+        Bus ID of the agent the scheduler picks for `capability`; without a
+        scheduler (or a bound agent) this falls back to name matching.
+        """
+        scheduler = self.bus.scheduler if self.bus else None
+        if scheduler is not None:
+            agent_id = scheduler.schedule(capability, tokens)
+            if agent_id is not None:
+                bus_id = scheduler.agents[agent_id].bus_id
+                if bus_id in self.bus._agents:
+                    return bus_id
+                # Bound agent has left this bus: nothing is sent to it, so give the depth back
+                scheduler.complete(agent_id)
+                scheduler.unbind(bus_id)
+        return self._find_agent(capability)
+
+    async def send_to_capability(self, capability: str, message: str, tokens: int = None) -> TaskResponse:
+        """Send `message` to the cheapest, least-loaded agent offering `capability`."""
+        target_id = self._find_capable_agent(capability, tokens or max(1, len(message) // 4))
+        if not target_id:
+            logger.warning(f"No agent offers {capability}")
+            return None
+
+        request = TaskRequest(
+            requester_id=self.card.uuid,
+            content=message
+        )
+
+        await self.send_message(request, target_id)
+        logger.info(f"{self.card.name} → [{capability}] {self.bus._agents[target_id].card.name}: {message[:50]}...")
+        return None
+
     async def send_to_agent(self, target_name: str, message: str) -> TaskResponse:
         """
         Send message directly to another agent (not via Manager).
@@ -273,10 +531,19 @@ class BaseAgent:
             }
         
         payload_json = json.dumps(data, separators=(",", ":"))
+        start = time.perf_counter()
         compressed = self.cube.compress(data=payload_json, domain=domain, sequence=sequence, outcome=outcome)
+        self._m_compress.observe(time.perf_counter() - start)
         
-        self.stats['tokens_saved'] += (len(payload_json)//4) - (len(compressed['cube'])//4)
+        raw_len, cube_len = len(payload_json), len(compressed['cube'])
+        self.stats['tokens_saved'] += (raw_len//4) - (cube_len//4)
         self.stats['messages_sent'] += 1
+        self.stats['bytes_raw'] += raw_len
+        self.stats['bytes_compressed'] += cube_len
+        self.stats['compression_ratio'] = 1 - self.stats['bytes_compressed'] / max(1, self.stats['bytes_raw'])
+        self._m_sent.inc()
+        self._m_ratio.set(self.stats['compression_ratio'])
+        _BYTES_OUT.labels(self.card.name, domain).inc(cube_len)
         return {**compressed, "compressed": True}
     
     def decompress_message(self, cube_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -287,7 +554,10 @@ class BaseAgent:
             return json.loads(cube_data.get("cube", "{}"))
         
         cube_dict = {'cube': cube_data['cube'], 'hash': cube_data['hash']}
+        start = time.perf_counter()
         decompressed_bytes = self.cube.decompress(cube_dict)
+        self._m_decompress.observe(time.perf_counter() - start)
+        _BYTES_IN.labels(self.card.name, cube_data.get("semantic", "|").split("|", 1)[0]).inc(len(cube_data['cube']))
         return json.loads(decompressed_bytes.decode('utf-8'))
     
     def get_stats(self) -> Dict[str, Any]:
@@ -297,6 +567,7 @@ class BaseAgent:
             "messages_sent": self.stats['messages_sent'],
             "messages_received": self.stats['messages_received'],
             "tokens_saved": self.stats['tokens_saved'],
+            "compression_ratio": round(self.stats['compression_ratio'], 4),
             "cube_protocol_enabled": CUBE_AVAILABLE
         }
 
@@ -310,21 +581,23 @@ class BaseAgent:
         """
         Decode and handle a message. Override this.
         """
-        payload = CubeTransport.unpack(cube)
+        with tracer.span("cube.unpack", agent=self.card.name):
+            payload = CubeTransport.unpack(cube)
         logger.info(f"[{self.card.name}] Received payload: {payload}")
         
         # Basic dispatch based on payload shape
         if "requester_id" in payload and "content" in payload:
             # It's a Request
             req = TaskRequest(**payload)
-            response = await self.handle_task(req)
+            response = await self._run_task(req)
             if response:
                  # [A2AC] If response is already a Mesh Packet (Dict), send directly
                  if isinstance(response, dict):
                      await self.bus.send(response, req.requester_id)
                  else:
                      # Auto-pack response via CubeTransport if legacy (TaskResponse)
-                     cube_resp = CubeTransport.pack(response, from_agent=self.card.name)
+                     with tracer.span("cube.pack", headers=response.headers, agent=self.card.name):
+                         cube_resp = CubeTransport.pack(response, from_agent=self.card.name)
                      await self.bus.send(cube_resp, req.requester_id)
 
         elif "status" in payload and "output" in payload:
@@ -344,7 +617,8 @@ class BaseAgent:
         
         # Legacy support: use CubeTransport for TaskRequest/Response objects
         if isinstance(message, (TaskRequest, TaskResponse)):
-             cube = CubeTransport.pack(message, from_agent=self.card.name)
+             with tracer.span("cube.pack", headers=message.headers, agent=self.card.name):
+                 cube = CubeTransport.pack(message, from_agent=self.card.name)
              await self.bus.send(cube, target_id)
         else:
              # Generic send (e.g. Mesh Packet)
@@ -5,44 +5,66 @@ Node: 0x923-SEA // Magnolia AI Lab
 Objective:
 Simulate and execute autonomous value exchange (Revenue Generation) 
 across the 14-agent swarm using Q-Protocol credits.
+
+Agents trade through per-capability order books (agents/market.py): each
+cycle is one trading session of bids and asks, cleared by price-time
+priority and settled on the swarm ledger.
 """
 
 import json
+import os
 import random
+import sys
 import time
 import logging
 
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.market import STANDARD_RATE, InsufficientFunds, Ledger, MarketEngine
+
+CAPABILITIES = ("task_decomposition", "fuzzing", "drift_repair", "value_exchange")
+
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] [REVENUE] %(message)s')
 
 class RevenueSwarm:
     def __init__(self, agent_count=14):
         self.agents = [f"AGENT_{i:02d}" for i in range(agent_count)]
-        self.ledger = {agent: 1000.0 for agent in self.agents} # Initial credit
-        self.total_extracted = 0.0
+        self.market = MarketEngine(Ledger({agent: 1000.0 for agent in self.agents})) # Initial credit
+        self.ledger = self.market.ledger.balances
+        self.fills = 0
+
+    @property
+    def total_extracted(self):
+        # 1% Protocol Fee (Revenue) taken on every settled fill
+        return self.market.ledger.fees
 
     def execute_cycle(self):
         logging.info("Initiating Revenue Extraction Cycle...")
         
-        # Simulate high-frequency value exchange
+        # Simulate high-frequency value exchange: every order is a quote
+        # around the Q-Protocol standard rate, matched as one batch
         for _ in range(50):
-            provider = random.choice(self.agents)
-            consumer = random.choice(self.agents)
-            
-            if provider == consumer:
-                continue
-                
+            agent = random.choice(self.agents)
+            capability = random.choice(CAPABILITIES)
             # Task complexity determines value
             complexity = random.randint(10, 500)
-            value = complexity * 0.0008 # Q-Protocol standard rate
+            rate = STANDARD_RATE * random.uniform(0.9, 1.1)
             
-            # Transaction
-            if self.ledger[consumer] >= value:
-                self.ledger[consumer] -= value
-                self.ledger[provider] += value
-                self.total_extracted += value * 0.01 # 1% Protocol Fee (Revenue)
-                # logging.debug(f"TX: {consumer} -> {provider} : {value:.4f}")
+            if random.random() < 0.5:
+                try:
+                    self.market.bid(agent, capability, complexity, rate)
+                except InsufficientFunds:
+                    continue
+            else:
+                self.market.ask(agent, capability, complexity, rate)
+        
+        fills = self.market.match()
+        self.fills += len(fills)
+        # Cycle orders are session orders: unfilled remainders are refunded
+        self.market.cancel_open()
             
-        logging.info(f"Cycle Complete. Protocol Revenue Extracted: {self.total_extracted:.4f} Q-Credits")
+        logging.info(f"Cycle Complete. {len(fills)} fills. Protocol Revenue Extracted: {self.total_extracted:.4f} Q-Credits")
         self.optimize_mesh()
 
     def optimize_mesh(self):
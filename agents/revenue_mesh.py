@@ -1,19 +1,66 @@
 """
 Revenue Agent - Automate agent-to-agent value exchange via Q Protocol.
+
+Prices are no longer fixed: each negotiation posts the peer's bid and this
+agent's ask on a shared MarketEngine and crosses the two directly
+(MarketEngine.cross), so the task settles at this agent's price and no
+other orders on the market are touched (see agents/market.py). An agent constructed without a market has no
+counterparties to trade with and quotes the standard rate, as before.
 """
+import os
+import sys
+
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.market import STANDARD_RATE, InsufficientFunds, MarketEngine
+
+
 class RevenueAgent:
-    def __init__(self, agent_id):
+    def __init__(self, agent_id, market=None, capability="value_exchange", unit_price=STANDARD_RATE):
         self.id = agent_id
-        self.balance = 0.0
-    
-    def negotiate_task(self, peer_id, cube_complexity):
-        # Q-Protocol token cost calculation: 40 tokens vs 2000 standard
-        cost = cube_complexity * 0.0008 
-        return f"OFFER_ACCEPTED: {peer_id} | COST: {cost}"
+        self.market = market
+        self.capability = capability
+        self.unit_price = unit_price
+
+    @property
+    def balance(self):
+        return self.market.ledger.balance(self.id) if self.market is not None else 0.0
+
+    def negotiate_task(self, peer_id, cube_complexity, max_rate=STANDARD_RATE):
+        """
+        The peer bids for `cube_complexity` units at up to `max_rate`; this
+        agent asks at its unit price. Whatever is left unfilled is cancelled.
+        """
+        if self.market is None:
+            # No shared market (so no funded peers): fixed-rate quote
+            return f"OFFER_ACCEPTED: {peer_id} | COST: {cube_complexity * STANDARD_RATE}"
+        # Q-Protocol token cost calculation: 40 tokens vs 2000 standard.
+        # The ask rests first, so a crossing bid pays the agent's quoted price.
+        ask = self.market.ask(self.id, self.capability, cube_complexity, self.unit_price)
+        try:
+            bid = self.market.bid(peer_id, self.capability, cube_complexity, max_rate)
+        except InsufficientFunds:
+            self.market.cancel(ask.id)
+            return f"OFFER_REJECTED: {peer_id} | INSUFFICIENT_FUNDS"
+        fill = self.market.cross(bid.id, ask.id)
+        self.market.cancel(bid.id)
+        self.market.cancel(ask.id)
+
+        cost = round(fill.value, 8) if fill else 0.0
+        filled = fill.quantity if fill else 0
+        if filled == cube_complexity:
+            return f"OFFER_ACCEPTED: {peer_id} | COST: {cost}"
+        if filled:
+            return f"OFFER_PARTIAL: {peer_id} | FILLED: {filled}/{cube_complexity} | COST: {cost}"
+        return f"OFFER_DECLINED: {peer_id} | ASK: {self.unit_price} > BID: {max_rate}"
+
 
 if __name__ == "__main__":
-    # Initializing 14-agent swarm orchestration
-    swarm = [RevenueAgent(f"AGENT_{i}") for i in range(14)]
+    # Initializing 14-agent swarm orchestration on one shared market
+    market = MarketEngine()
+    market.ledger.deposit("AGENT_X", 10.0)
+    swarm = [RevenueAgent(f"AGENT_{i}", market, unit_price=STANDARD_RATE * (0.9 + 0.02 * i)) for i in range(14)]
     print(f"Revenue Swarm Initialized: {len(swarm)} Nodes")
     for agent in swarm[:3]:
         print(agent.negotiate_task("AGENT_X", 500))
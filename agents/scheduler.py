@@ -0,0 +1,337 @@
+"""
+Task Scheduler - Cost- and load-aware routing over the capabilities registry.
+
+agents/capabilities.json lists each agent's capabilities and cost_per_token.
+For every capability the scheduler keeps an indexed min-heap of the agents
+that offer it, keyed by
+
+    (saturated, cost_per_token * (1 + load_weight * depth) * (1 + latency_weight * latency))
+
+where `depth` is the agent's live inbox depth and `latency` an EWMA of its
+observed handler time in seconds. The position of every agent in every heap
+is tracked, so a dispatch, completion or depth report re-keys the agent in
+O(log n) per capability it offers, and picking an agent is a peek at the top.
+
+An agent whose depth reaches its `max_inflight` is saturated and sinks below
+every unsaturated agent, so work spills over to the next-cheapest capable
+agent. When all are saturated the least-loaded by score is still returned.
+
+Live bus agents are bound to registry entries by the `registry_id` on their
+AgentCard (BaseAgent(..., registry_id="AGENT_03")). Entries loaded with
+from_registry() join the capability heaps only once an agent binds to them,
+so a task is never routed to a registry entry with no live instance; agents
+added directly with add_agent() (simulations, benchmarks) are routable at once.
+
+Usage:
+  scheduler = TaskScheduler.from_registry()
+  agent_id = scheduler.schedule("fuzzing", tokens=400)
+  ...
+  scheduler.complete(agent_id, seconds=0.8)
+"""
+import json
+import logging
+import os
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.metrics import registry
+
+logger = logging.getLogger("scheduler")
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "capabilities.json")
+DEFAULT_MAX_INFLIGHT = 8
+LATENCY_ALPHA = 0.2           # EWMA weight of the newest latency sample
+
+_DECISIONS = registry.counter("scheduler_decisions_total", "Tasks routed by the scheduler", ("capability", "outcome"))
+
+# Strings are matched first so "//" inside a value is left alone
+_COMMENT = re.compile(r'"(?:\\.|[^"\\])*"|//[^\n]*|/\*.*?\*/', re.S)
+
+
+def load_registry(path: str = REGISTRY_PATH) -> dict:
+    """Parse the capabilities registry, ignoring // and /* */ comments."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    return json.loads(_COMMENT.sub(lambda m: m.group(0) if m.group(0)[0] == '"' else "", text))
+
+
+# ============================================================================
+# INDEXED PRIORITY QUEUE
+# ============================================================================
+
+class IndexedHeap:
+    """Binary min-heap of (key, item) with an item -> position index for O(log n) re-keying."""
+    __slots__ = ("_heap", "_pos")
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._pos: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def peek(self) -> Optional[Tuple[tuple, str]]:
+        return tuple(self._heap[0]) if self._heap else None
+
+    def push(self, item: str, key: tuple):
+        if item in self._pos:
+            self.update(item, key)
+            return
+        self._heap.append([key, item])
+        self._pos[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def update(self, item: str, key: tuple):
+        i = self._pos[item]
+        old = self._heap[i][0]
+        self._heap[i][0] = key
+        if key < old:
+            self._sift_up(i)
+        elif old < key:
+            self._sift_down(i)
+
+    def remove(self, item: str):
+        i = self._pos.pop(item)
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[1]])
+
+    def ordered(self) -> List[Tuple[tuple, str]]:
+        """All entries, best first (O(n log n); for inspection only)."""
+        return sorted(tuple(entry) for entry in self._heap)
+
+    def _sift_up(self, i: int):
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i:
+            parent = (i - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[i] = heap[parent]
+            pos[heap[i][1]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[1]] = i
+
+    def _sift_down(self, i: int):
+        heap, pos = self._heap, self._pos
+        size = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[i] = heap[child]
+            pos[heap[i][1]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[1]] = i
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class AgentLoad:
+    __slots__ = ("id", "role", "capabilities", "cost", "max_inflight", "depth", "latency", "bus_id", "queued")
+
+    def __init__(self, agent_id: str, role: str, capabilities: Iterable[str], cost: float, max_inflight: int):
+        self.id = agent_id
+        self.role = role
+        self.capabilities = tuple(capabilities)
+        self.cost = cost
+        self.max_inflight = max_inflight
+        self.depth = 0
+        self.latency = 0.0
+        self.bus_id: Optional[str] = None
+        self.queued = False     # in the capability heaps, i.e. eligible for schedule()
+
+    def __repr__(self):
+        return (f"AgentLoad({self.id}, {self.role}, cost={self.cost}, "
+                f"depth={self.depth}/{self.max_inflight}, latency={self.latency:.4f}s)")
+
+
+class TaskScheduler:
+    """Routes each task to the cheapest capable agent, weighted by load and latency."""
+
+    def __init__(self, load_weight: float = 0.5, latency_weight: float = 1.0,
+                 max_inflight: int = DEFAULT_MAX_INFLIGHT):
+        self.load_weight = load_weight
+        self.latency_weight = latency_weight
+        self.max_inflight = max_inflight
+        self.agents: Dict[str, AgentLoad] = {}
+        self._queues: Dict[str, IndexedHeap] = {}
+        self._cheapest: Dict[str, float] = {}       # lowest cost_per_token per capability
+        self._by_bus_id: Dict[str, AgentLoad] = {}
+        self.stats = {"decisions": 0, "spilled": 0, "saturated": 0, "unroutable": 0}
+
+    @classmethod
+    def from_registry(cls, path: str = REGISTRY_PATH, **kwargs) -> "TaskScheduler":
+        scheduler = cls(**kwargs)
+        for entry in load_registry(path).get("agents", []):
+            scheduler.add_agent(entry["id"], entry.get("capabilities", []), entry.get("cost_per_token", 0.0),
+                                role=entry.get("role", ""), max_inflight=entry.get("max_inflight"), queued=False)
+        return scheduler
+
+    # -- membership ---------------------------------------------------------
+
+    def add_agent(self, agent_id: str, capabilities: Iterable[str], cost_per_token: float,
+                  role: str = "", max_inflight: Optional[int] = None, queued: bool = True) -> AgentLoad:
+        """Add an agent; with queued=False it is only scheduled after bind()."""
+        if agent_id in self.agents:
+            self.remove_agent(agent_id)
+        agent = AgentLoad(agent_id, role, capabilities, float(cost_per_token), max_inflight or self.max_inflight)
+        self.agents[agent_id] = agent
+        if queued:
+            self._enqueue(agent)
+        return agent
+
+    def remove_agent(self, agent_id: str):
+        agent = self.agents.pop(agent_id)
+        if agent.bus_id is not None:
+            self._by_bus_id.pop(agent.bus_id, None)
+        if agent.queued:
+            self._dequeue(agent)
+
+    def _enqueue(self, agent: AgentLoad):
+        key = self._key(agent)
+        for capability in agent.capabilities:
+            self._queues.setdefault(capability, IndexedHeap()).push(agent.id, key)
+            self._cheapest[capability] = min(self._cheapest.get(capability, agent.cost), agent.cost)
+        agent.queued = True
+
+    def _dequeue(self, agent: AgentLoad):
+        for capability in agent.capabilities:
+            queue = self._queues[capability]
+            queue.remove(agent.id)
+            if queue:
+                self._cheapest[capability] = min(self.agents[a].cost for _, a in queue._heap)
+            else:
+                del self._queues[capability], self._cheapest[capability]
+        agent.queued = False
+
+    def bind(self, bus_id: str, registry_id: Optional[str], name: str = "") -> Optional[str]:
+        """
+        Attach a live MessageBus agent to its registry entry (the agent card's
+        registry_id). Returns the registry id, or None if the agent has none
+        or it is not in the registry; such agents are never scheduled.
+        """
+        agent = self.agents.get(registry_id) if registry_id else None
+        if agent is None:
+            logger.info(f"Scheduler: {name or bus_id} ({registry_id or 'no registry id'}) is not in the registry")
+            return None
+        if agent.bus_id is not None:
+            self._by_bus_id.pop(agent.bus_id, None)
+        agent.bus_id = bus_id
+        self._by_bus_id[bus_id] = agent
+        if not agent.queued:
+            self._enqueue(agent)
+        return agent.id
+
+    def unbind(self, bus_id: str):
+        """The live agent left the bus: stop scheduling its registry entry."""
+        agent = self._by_bus_id.pop(bus_id, None)
+        if agent is not None:
+            agent.bus_id = None
+            agent.depth = 0
+            if agent.queued:
+                self._dequeue(agent)
+
+    def capabilities(self) -> List[str]:
+        return sorted(self._queues)
+
+    # -- decisions ----------------------------------------------------------
+
+    def schedule(self, capability: str, tokens: int = 1) -> Optional[str]:
+        """
+        Pick an agent for one task and count it against that agent's depth.
+        Returns the registry id, or None when no routable agent offers
+        `capability`. A caller that then does not send the task must call
+        complete() to give the depth back.
+        """
+        queue = self._queues.get(capability)
+        stats = self.stats
+        if not queue:
+            stats["unroutable"] += 1
+            _DECISIONS.labels(capability, "unroutable").inc()
+            return None
+        (saturated, _), agent_id = queue.peek()
+        agent = self.agents[agent_id]
+        stats["decisions"] += 1
+        if saturated:
+            outcome = "saturated"
+        elif agent.cost > self._cheapest[capability]:
+            outcome = "spilled"
+        else:
+            outcome = "cheapest"
+        if outcome != "cheapest":
+            stats[outcome] += 1
+        _DECISIONS.labels(capability, outcome).inc()
+        agent.depth += 1
+        self._rekey(agent)
+        return agent_id
+
+    def complete(self, agent_id: str, seconds: Optional[float] = None):
+        """One task left `agent_id`'s queue; fold its handler time into the latency EWMA."""
+        agent = self.agents[agent_id]
+        if agent.depth:
+            agent.depth -= 1
+        if seconds is not None:
+            agent.latency = seconds if not agent.latency else agent.latency + LATENCY_ALPHA * (seconds - agent.latency)
+        self._rekey(agent)
+
+    def report_depth(self, bus_id: str, depth: int):
+        """Live inbox depth from a bound MessageBus agent."""
+        agent = self._by_bus_id.get(bus_id)
+        if agent is not None and agent.depth != depth:
+            agent.depth = depth
+            self._rekey(agent)
+
+    def report_latency(self, bus_id: str, seconds: float):
+        """Handler time observed by a bound MessageBus agent."""
+        agent = self._by_bus_id.get(bus_id)
+        if agent is not None:
+            agent.latency = seconds if not agent.latency else agent.latency + LATENCY_ALPHA * (seconds - agent.latency)
+            self._rekey(agent)
+
+    def ranking(self, capability: str) -> List[Tuple[str, float, bool]]:
+        """(agent id, score, saturated) for `capability`, best first."""
+        queue = self._queues.get(capability)
+        if not queue:
+            return []
+        return [(agent_id, score, bool(saturated)) for (saturated, score), agent_id in queue.ordered()]
+
+    def _key(self, agent: AgentLoad) -> Tuple[int, float]:
+        score = (agent.cost * (1 + self.load_weight * agent.depth)
+                 * (1 + self.latency_weight * agent.latency))
+        return (1 if agent.depth >= agent.max_inflight else 0, score)
+
+    def _rekey(self, agent: AgentLoad):
+        key = self._key(agent)
+        queues = self._queues
+        for capability in agent.capabilities:
+            queues[capability].update(agent.id, key)
+
+
+if __name__ == "__main__":
+    scheduler = TaskScheduler.from_registry()
+    print("NODE: 0x923-SEA")
+    for agent_id in list(scheduler.agents):
+        scheduler.bind(f"bus-{agent_id}", agent_id)
+    print(f"Registry: {len(scheduler.agents)} agents, {len(scheduler.capabilities())} capabilities")
+    for capability in scheduler.capabilities():
+        print(f"  {capability:24} -> {scheduler.schedule(capability)}")
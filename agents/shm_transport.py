@@ -0,0 +1,227 @@
+"""
+Shared-Memory Transport - Pass large cube payloads between processes by reference.
+
+A ShmRing is a single-writer ring buffer in `multiprocessing.shared_memory`.
+`put()` copies a payload into the ring once and returns a small, picklable
+CubeRef (ring name + offset + length + generation) that travels over the
+normal bus. Receivers on the same host attach to the ring and read the
+payload as a memoryview of the shared segment; nothing is copied again.
+
+Positions are absolute byte counters: offset = position % capacity and
+generation = position // capacity. A payload never straddles the end of the
+ring; the writer skips to the next generation instead. A ref is valid while
+the writer has not advanced more than one full ring past it, and readers
+check that before and after using the view. The writer publishes the new
+head before it copies a payload in, so a reader whose bytes are being
+overwritten always fails the check after reading rather than returning a
+torn payload.
+
+Usage:
+  ring = ShmRing.create(capacity=256 * 1024 * 1024)
+  ref = ring.put(cube_json.encode())                 # sender
+  with resolve(ref) as payload:                      # receiver (any process)
+      data = payload.json()
+"""
+import atexit
+import json
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Union
+
+MAGIC = 0x41324152  # "A2AR"
+# magic:u32 pad:u32 capacity:u64 head:u64 released:u64
+RING_HEADER = struct.Struct("<IIQQQ")
+HEADER_SIZE = 64  # keep the data region cache-line aligned
+
+
+class RingFull(Exception):
+    """Raised when a write would overwrite data the consumer has not released."""
+
+
+class StaleRef(Exception):
+    """Raised when a CubeRef's bytes have been overwritten by newer writes."""
+
+
+@dataclass(frozen=True)
+class CubeRef:
+    ring: str
+    offset: int
+    length: int
+    generation: int
+    capacity: int
+    encoding: Optional[str] = None  # set when the payload was a str
+
+    @property
+    def position(self) -> int:
+        return self.generation * self.capacity + self.offset
+
+
+class ShmRing:
+    """Single-writer ring buffer over a named shared-memory segment."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool, track_release: bool = False):
+        self.shm = shm
+        self.owner = owner
+        self.track_release = track_release
+        magic, _, capacity, _, _ = RING_HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory {shm.name} is not an A2A ring")
+        self.capacity = capacity
+        self._data = shm.buf[HEADER_SIZE:HEADER_SIZE + capacity]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, capacity: int = 64 * 1024 * 1024, name: Optional[str] = None,
+               track_release: bool = False) -> "ShmRing":
+        """
+        Create a ring. With `track_release`, writes raise RingFull instead of
+        overwriting payloads the (single) consumer has not released yet.
+        """
+        shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + capacity)
+        RING_HEADER.pack_into(shm.buf, 0, MAGIC, 0, capacity, 0, 0)
+        return cls(shm, owner=True, track_release=track_release)
+
+    @classmethod
+    def attach(cls, name: str) -> "ShmRing":
+        # Only the creating process may unlink the segment. Python 3.13+ lets
+        # readers opt out of resource tracking; on older versions readers must
+        # share the writer's tracker (i.e. be multiprocessing children, as
+        # Broker workers are) or the segment is destroyed when they exit.
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _head(self) -> int:
+        return RING_HEADER.unpack_from(self.shm.buf, 0)[3]
+
+    def _released(self) -> int:
+        return RING_HEADER.unpack_from(self.shm.buf, 0)[4]
+
+    def put(self, payload: Union[str, bytes, bytearray, memoryview], encoding: str = "utf-8") -> CubeRef:
+        """Copy `payload` into the ring and return a reference to it (str is stored encoded)."""
+        text = isinstance(payload, str)
+        if text:
+            payload = payload.encode(encoding)
+        length = len(payload)
+        if length > self.capacity:
+            raise ValueError(f"Payload of {length} bytes exceeds ring capacity {self.capacity}")
+        with self._lock:
+            head = self._head()
+            offset = head % self.capacity
+            if offset + length > self.capacity:
+                head += self.capacity - offset  # skip the tail, start the next generation
+                offset = 0
+            end = head + length
+            if self.track_release and end - self._released() > self.capacity:
+                raise RingFull(f"Ring {self.name} full: consumer has not released older payloads")
+            # Publish first: readers of the bytes about to be overwritten see
+            # their ref go stale when they re-check after reading
+            struct.pack_into("<Q", self.shm.buf, 16, end)
+            self._data[offset:offset + length] = payload
+        return CubeRef(self.name, offset, length, head // self.capacity, self.capacity, encoding if text else None)
+
+    def valid(self, ref: CubeRef) -> bool:
+        return self._head() - ref.position <= self.capacity
+
+    def view(self, ref: CubeRef) -> memoryview:
+        """Zero-copy view of a payload. Re-check `valid(ref)` after using it."""
+        if not self.valid(ref):
+            raise StaleRef(f"{ref} was overwritten")
+        return self._data[ref.offset:ref.offset + ref.length]
+
+    def release(self, ref: CubeRef):
+        """Consumer acknowledgement: everything up to the end of `ref` may be reused."""
+        end = ref.position + ref.length
+        if end > self._released():
+            struct.pack_into("<Q", self.shm.buf, 24, end)
+
+    def close(self):
+        self._data.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class ShmPayload:
+    """A resolved CubeRef. Decoders read straight from the shared-memory view."""
+
+    def __init__(self, ring: ShmRing, ref: CubeRef):
+        self.ring = ring
+        self.ref = ref
+        self.view = ring.view(ref)
+
+    def __len__(self):
+        return self.ref.length
+
+    def check(self):
+        """Raise StaleRef if the writer overwrote the payload while it was in use."""
+        if not self.ring.valid(self.ref):
+            raise StaleRef(f"{self.ref} was overwritten while in use")
+
+    def tobytes(self) -> bytes:
+        data = self.view.tobytes()
+        self.check()
+        return data
+
+    def text(self, encoding: str = "utf-8") -> str:
+        data = str(self.view, encoding)
+        self.check()
+        return data
+
+    def json(self):
+        return json.loads(self.text())
+
+    def value(self) -> Union[str, bytes]:
+        """A private copy of the payload, as the str or bytes originally put."""
+        return self.text(self.ref.encoding) if self.ref.encoding else self.tobytes()
+
+    def gunzip(self) -> bytes:
+        """Decompress a gzip/zlib payload (e.g. raw cube data) directly from shared memory."""
+        data = zlib.decompress(self.view, wbits=47)
+        self.check()
+        return data
+
+    def release(self):
+        self.view.release()
+        self.ring.release(self.ref)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+_attached: Dict[str, ShmRing] = {}
+_attached_lock = threading.Lock()
+
+
+@atexit.register
+def _close_attached():
+    for ring in _attached.values():
+        try:
+            ring.close()
+        except BufferError:
+            pass  # a payload view is still held; the OS unmaps on exit
+    _attached.clear()
+
+
+def resolve(ref: CubeRef) -> ShmPayload:
+    """Open the ring named by `ref` (attaching once per process) and view its payload."""
+    ring = _attached.get(ref.ring)
+    if ring is None:
+        with _attached_lock:
+            ring = _attached.get(ref.ring)
+            if ring is None:
+                ring = _attached[ref.ring] = ShmRing.attach(ref.ring)
+    return ShmPayload(ring, ref)
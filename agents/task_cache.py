@@ -0,0 +1,254 @@
+"""
+Task Cache - Request coalescing and result caching around handle_task.
+
+Identical requests to the same agent (same normalized content and context)
+share one execution: while a request is in flight, duplicates wait on it
+(singleflight), and completed results go into a size-bounded LRU cache with
+a TTL, optionally persisted to disk as JSON.
+
+The cache holds its own deep copy of each result and every hit or coalesced
+waiter gets a fresh copy, so a caller mutating its response (or the
+response's artifacts) cannot change what later callers receive.
+
+Opt-in per agent, and only for agents whose handle_task *returns* its
+response (agents that send their own replies, such as TrendPipelineAgent,
+return None and are never cached):
+
+  agent.enable_task_cache(max_entries=512, ttl=3600, persist_dir="cache/content")
+"""
+import asyncio
+import copy
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from agents.metrics import registry
+
+logger = logging.getLogger("task-cache")
+
+_REQUESTS = registry.counter("a2a_task_cache_requests_total", "handle_task cache lookups by result", ("agent", "result"))
+_EVICTIONS = registry.counter("a2a_task_cache_evictions_total", "Task cache entries evicted (LRU or TTL)", ("agent",))
+
+
+def normalize_content(content: Any) -> str:
+    """
+    Canonical form of request content: whitespace-insensitive text, sorted JSON.
+    Case is kept: commands such as repository names are case-sensitive.
+    """
+    if isinstance(content, str):
+        return " ".join(content.split())
+    return json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def task_key(agent_name: str, content: Any, context: Optional[dict] = None) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(agent_name.encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(normalize_content(content).encode("utf-8"))
+    if context:
+        hasher.update(b"\0")
+        hasher.update(normalize_content(context).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _result_types() -> Dict[str, type]:
+    """Dataclass results that persisted entries may be rebuilt as."""
+    from agents.platform import TaskRequest, TaskResponse
+    return {cls.__name__: cls for cls in (TaskRequest, TaskResponse)}
+
+
+def _encode_entry(entry: Tuple[float, Any]) -> str:
+    """JSON for a persisted entry; raises TypeError for values JSON cannot hold exactly."""
+    expires, value = entry
+    if isinstance(value, dict):
+        record = {"expires": expires, "type": "dict", "value": value}
+    elif dataclasses.is_dataclass(value) and type(value).__name__ in _result_types():
+        record = {"expires": expires, "type": type(value).__name__, "value": dataclasses.asdict(value)}
+    else:
+        raise TypeError(f"{type(value).__name__} results are not persisted")
+    return json.dumps(record, separators=(",", ":"))
+
+
+def _decode_entry(text: str) -> Optional[Tuple[float, Any]]:
+    record = json.loads(text)
+    kind, value = record["type"], record["value"]
+    if kind != "dict":
+        cls = _result_types().get(kind)
+        if cls is None:
+            return None
+        value = cls(**value)
+    return float(record["expires"]), value
+
+
+class ResultCache:
+    """LRU + TTL cache of task results, optionally mirrored to `persist_dir`."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, persist_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.evictions = 0
+        if self.persist_dir:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.persist_dir / f"{key}.json"
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Any]:
+        now = time.time() if now is None else now
+        entry = self._entries.get(key)
+        if entry is None and self.persist_dir:
+            entry = self._load(key)
+            if entry is not None:
+                self._entries[key] = entry
+                self._evict_overflow(keep=key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < now:
+            self.delete(key)
+            self.evictions += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        entry = (now + self.ttl, value)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict_overflow()
+        if self.persist_dir:
+            self._store(key, entry)
+
+    def _evict_overflow(self, keep: Optional[str] = None):
+        """Drop least recently used entries (never `keep`) until within max_entries."""
+        while len(self._entries) > self.max_entries:
+            old_key = next(iter(self._entries))
+            if old_key == keep:
+                self._entries.move_to_end(keep)
+                old_key = next(iter(self._entries))
+            del self._entries[old_key]
+            self.evictions += 1
+            if self.persist_dir:
+                self._path(old_key).unlink(missing_ok=True)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+        if self.persist_dir:
+            self._path(key).unlink(missing_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, key: str):
+        try:
+            return _decode_entry(self._path(key).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Task cache ignoring unreadable entry {key[:12]}: {e}")
+            return None
+
+    def _store(self, key: str, entry):
+        tmp = self._path(key).with_suffix(".tmp")
+        try:
+            tmp.write_text(_encode_entry(entry), encoding="utf-8")
+            os.replace(tmp, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Task cache could not persist {key[:12]}: {e}")
+            tmp.unlink(missing_ok=True)
+
+
+def _rebind(result: Any, request: Any) -> Any:
+    """Private deep copy of a shared result, answering `request` (task id / context id)."""
+    rebound = copy.deepcopy(result)
+    if dataclasses.is_dataclass(rebound):
+        if hasattr(rebound, "task_id"):
+            rebound.task_id = request.task_id
+        headers = getattr(rebound, "headers", None)
+    elif isinstance(rebound, dict):
+        headers = rebound.get("headers")
+    else:
+        return rebound
+    context_id = (getattr(request, "headers", None) or {}).get("x-a2a-context-id")
+    if context_id and isinstance(headers, dict):
+        headers["x-a2a-context-id"] = context_id
+    return rebound
+
+
+def _cacheable(result: Any) -> bool:
+    if result is None:
+        return False
+    status = getattr(result, "status", None)
+    if status is None and isinstance(result, dict):
+        status = result.get("status")
+    return status != "failed"
+
+
+class TaskCoalescer:
+    """Singleflight + ResultCache for one agent's handle_task."""
+
+    def __init__(self, agent_name: str, max_entries: int = 1024, ttl: float = 3600.0,
+                 persist_dir: Optional[str] = None, key_fn: Callable[[str, Any], str] = None):
+        self.agent_name = agent_name
+        self.cache = ResultCache(max_entries, ttl, persist_dir)
+        self.key_fn = key_fn or (lambda name, request: task_key(name, request.content, request.context))
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+        self._m_hit = _REQUESTS.labels(agent_name, "hit")
+        self._m_miss = _REQUESTS.labels(agent_name, "miss")
+        self._m_coalesced = _REQUESTS.labels(agent_name, "coalesced")
+        self._m_evictions = _EVICTIONS.labels(agent_name)
+
+    async def run(self, request: Any, handler: Callable[[], Awaitable[Any]]) -> Any:
+        key = self.key_fn(self.agent_name, request)
+
+        evictions = self.cache.evictions
+        cached = self.cache.get(key)
+        self._m_evictions.inc(self.cache.evictions - evictions)
+        if cached is not None:
+            self.stats["hits"] += 1
+            self._m_hit.inc()
+            return _rebind(cached, request)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            self._m_coalesced.inc()
+            result = await asyncio.shield(pending)
+            return _rebind(result, request) if result is not None else None
+
+        self.stats["misses"] += 1
+        self._m_miss.inc()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await handler()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; mark retrieved for the no-waiter case
+            raise
+        else:
+            # Waiters and the cache share a snapshot; the caller keeps `result` to mutate freely
+            snapshot = copy.deepcopy(result)
+            future.set_result(snapshot)
+            if _cacheable(snapshot):
+                evictions = self.cache.evictions
+                self.cache.put(key, snapshot)
+                self._m_evictions.inc(self.cache.evictions - evictions)
+            return result
+        finally:
+            self._inflight.pop(key, None)
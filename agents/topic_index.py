@@ -0,0 +1,210 @@
+"""
+Topic Index - Near-duplicate detection for published cube topics.
+
+Topics and summaries are normalized, split into character shingles and
+summarized as MinHash signatures. An LSH table (bands of signature rows)
+returns candidate cubes in sub-linear time; candidates are then scored by
+the lower of the estimated shingle Jaccard similarity and the exact Jaccard
+similarity of their word sets. Shingles tolerate spelling variants; the word
+check keeps fixtures that share most letters but differ in one team apart
+("Manchester United vs Arsenal" is not "Manchester City vs Arsenal").
+
+"Barcelona vs Frankfurt", "barcelona - frankfurt" and "Frankfurt Barcelona"
+all normalize to the same token set and match the published
+cubes/barcelona-frankfurt.json.
+
+Build the index once (from_cubes) and keep it current with add() as cubes
+are published; re-adding a slug replaces its previous entries.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import random
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger("topic-index")
+
+CUBES_DIR = Path(__file__).resolve().parent.parent / "cubes"
+
+STOPWORDS = {"vs", "v", "versus", "the", "a", "an", "and", "of", "at", "in", "on", "live", "today", "news"}
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+_MERSENNE = (1 << 61) - 1
+
+
+def normalize_topic(text: str) -> str:
+    """Lowercase, strip punctuation and filler words, and sort tokens (word order is irrelevant)."""
+    tokens = [t for t in _NON_WORD.sub(" ", text.casefold()).split() if t not in STOPWORDS]
+    return " ".join(sorted(set(tokens)))
+
+
+def slugify(topic: str) -> str:
+    """Cube slug for a topic: "barcelona - frankfurt" -> "barcelona-frankfurt"."""
+    return "-".join(_NON_WORD.sub(" ", topic.casefold()).replace("_", " ").split())
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def words(text: str) -> Set[str]:
+    return set(normalize_topic(text).split())
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def shingles(text: str, k: int = 3) -> Set[str]:
+    normalized = normalize_topic(text)
+    if len(normalized) <= k:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+
+class Match(NamedTuple):
+    slug: str
+    topic: str
+    score: float
+    field: str
+
+
+class MinHasher:
+    """Fixed-seed MinHash: num_perm universal hashes over 64-bit shingle hashes."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 923):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.params = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+
+    def signature(self, items: Set[str]) -> Tuple[int, ...]:
+        if not items:
+            return tuple([_MERSENNE] * self.num_perm)
+        values = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in items]
+        return tuple(min((a * v + b) % _MERSENNE for v in values) for a, b in self.params)
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class TopicIndex:
+    """
+    LSH index over published cube topics and summaries.
+
+    With 64 permutations in 16 bands of 4 rows, pairs above ~0.5 Jaccard
+    collide in at least one band with high probability.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.6):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._tables: Dict[str, Dict[Tuple[int, Tuple[int, ...]], Set[str]]] = {
+            "topic": defaultdict(set), "summary": defaultdict(set)}
+        self._signatures: Dict[str, Dict[str, Tuple[int, ...]]] = {"topic": {}, "summary": {}}
+        self._words: Dict[str, Dict[str, Set[str]]] = {"topic": {}, "summary": {}}
+        self.topics: Dict[str, str] = {}
+        self.updated: Dict[str, Optional[float]] = {}  # unix time a cube was last published
+
+    def __len__(self):
+        return len(self.topics)
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def _insert(self, field: str, slug: str, text: str):
+        signature = self.hasher.signature(shingles(text))
+        self._signatures[field][slug] = signature
+        self._words[field][slug] = words(text)
+        for key in self._band_keys(signature):
+            self._tables[field][key].add(slug)
+
+    def _remove(self, field: str, slug: str):
+        signature = self._signatures[field].pop(slug, None)
+        self._words[field].pop(slug, None)
+        if signature is None:
+            return
+        table = self._tables[field]
+        for key in self._band_keys(signature):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(slug)
+                if not bucket:
+                    del table[key]
+
+    def add(self, slug: str, topic: str, summary: Optional[str] = None, updated: Optional[float] = None):
+        """Index (or re-index) a published cube."""
+        for field in self._tables:
+            self._remove(field, slug)
+        self.topics[slug] = topic
+        self.updated[slug] = updated
+        self._insert("topic", slug, topic)
+        if summary:
+            self._insert("summary", slug, summary)
+
+    def age(self, slug: str, now: float) -> Optional[float]:
+        """Seconds since `slug` was last published, if known."""
+        updated = self.updated.get(slug)
+        return None if updated is None else now - updated
+
+    def query(self, text: str, field: str = "topic", threshold: Optional[float] = None) -> List[Match]:
+        """Published cubes similar to `text`, best first."""
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.hasher.signature(shingles(text))
+        tokens = words(text)
+        table = self._tables[field]
+        candidates: Set[str] = set()
+        for key in self._band_keys(signature):
+            candidates |= table.get(key, set())
+        matches = []
+        for slug in candidates:
+            score = MinHasher.similarity(signature, self._signatures[field][slug])
+            if score >= threshold:
+                score = min(score, jaccard(tokens, self._words[field][slug]))
+            if score >= threshold:
+                matches.append(Match(slug, self.topics[slug], score, field))
+        return sorted(matches, key=lambda m: m.score, reverse=True)
+
+    def find_duplicate(self, topic: str, summary: Optional[str] = None) -> Optional[Match]:
+        """Best match for `topic` among published topics, or for `summary` among their summaries."""
+        matches = self.query(topic)
+        if summary:
+            matches += self.query(summary, field="summary")
+        return max(matches, key=lambda m: m.score) if matches else None
+
+    @classmethod
+    def from_cubes(cls, cubes_dir: Path = CUBES_DIR, **kwargs) -> "TopicIndex":
+        """Build an index from cubes/index.json and each cube's summary."""
+        index = cls(**kwargs)
+        try:
+            with open(cubes_dir / "index.json", "r") as f:
+                entries = json.load(f).get("cubes", [])
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            logger.warning(f"No cube index loaded from {cubes_dir}: {e}")
+            return index
+        for entry in entries:
+            slug = entry.get("slug")
+            if not slug:
+                continue
+            summary = None
+            try:
+                with open(cubes_dir / f"{slug}.json", "r") as f:
+                    content = json.load(f).get("content")
+                if isinstance(content, dict) and isinstance(content.get("summary"), str):
+                    summary = content["summary"]
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+            index.add(slug, entry.get("topic", slug), summary,
+                      _timestamp(entry.get("updated") or entry.get("created")))
+        return index
@@ -0,0 +1,331 @@
+"""
+Tracing - Span instrumentation for the A2A message path.
+
+Spans follow a request across MessageBus.send, the agent inbox,
+process_mesh_packet, handle_task and Cube pack/unpack. The trace id is the
+request's x-a2a-context-id; parent/child links travel in the
+x-a2a-span-id / x-a2a-parent-span-id headers.
+
+Tracing is off by default. While disabled, `tracer.span()` returns a shared
+no-op span, so the instrumented hot path pays one attribute check.
+
+Usage:
+  from agents.tracing import tracer
+  tracer.enable("trace.json", fmt="chrome")   # or fmt="jsonl"
+  ...
+  tracer.disable()                            # flushes the export file
+"""
+import asyncio
+import atexit
+import collections
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+CONTEXT_HEADER = "x-a2a-context-id"
+HOP_HEADER = "x-a2a-hop-count"
+SPAN_HEADER = "x-a2a-span-id"
+PARENT_HEADER = "x-a2a-parent-span-id"
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("a2a_current_span", default=None)
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class Span:
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "agent", "intent",
+                 "start_ns", "end_ns", "attrs", "thread_id", "_token", "_prev_active")
+
+    def __init__(self, tracer, name, trace_id, parent_id, agent=None, intent=None, attrs=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.agent = agent
+        self.intent = intent
+        self.attrs = attrs
+        self.start_ns = 0
+        self.end_ns = 0
+        self.thread_id = 0
+        self._token = None
+        self._prev_active = None
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        self._token = _current_span.set(self)
+        if self.tracer._track_active:
+            self._prev_active = self.tracer._set_active(self.thread_id, self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if self.tracer._track_active:
+            self.tracer._set_active(self.thread_id, self._prev_active)
+        if exc_type is not None:
+            self.attrs = {**(self.attrs or {}), "error": repr(exc)}
+        self.tracer._finish(self)
+        return False
+
+    def inject(self, headers: Dict[str, Any]):
+        """Stamp this span as the parent of whatever receives `headers`."""
+        if headers is not None:
+            headers.setdefault(CONTEXT_HEADER, self.trace_id)
+            headers[SPAN_HEADER] = self.span_id
+            headers[PARENT_HEADER] = self.parent_id or ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "agent": self.agent,
+            "intent": self.intent,
+            "start_ns": self.start_ns,
+            "duration_us": (self.end_ns - self.start_ns) / 1000,
+            "thread_id": self.thread_id,
+            "attrs": self.attrs or {},
+        }
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled; every operation is a no-op."""
+    __slots__ = ()
+    span_id = None
+    trace_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def inject(self, headers):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects finished spans and exports them to a JSONL or Chrome trace
+    (chrome://tracing / Perfetto) file.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path: Optional[str] = None
+        self.fmt = "jsonl"
+        self._buffer: List[Span] = []
+        self._chrome_started = False
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._active: Dict[Any, Span] = {}           # asyncio task, or thread id outside a task
+        self._loops: Dict[int, asyncio.AbstractEventLoop] = {}
+        self._track_active = False
+        self.flush_every = 1024
+        atexit.register(self.flush)
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def enable(self, path: Optional[str] = None, fmt: str = "jsonl"):
+        if fmt not in ("jsonl", "chrome"):
+            raise ValueError(f"Unknown trace format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self._chrome_started = False
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.flush()
+
+    # -- span creation -------------------------------------------------------
+
+    def span(self, name: str, headers: Optional[Dict[str, Any]] = None, agent: str = None,
+             intent: str = None, **attrs):
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            headers = headers or {}
+            trace_id = headers.get(CONTEXT_HEADER) or _new_id()
+            parent_id = headers.get(SPAN_HEADER)
+        if headers and HOP_HEADER in headers:
+            attrs["hop"] = headers[HOP_HEADER]
+        return Span(self, name, trace_id, parent_id, agent, intent, attrs or None)
+
+    def record(self, name: str, start_ns: int, end_ns: int, headers: Optional[Dict[str, Any]] = None,
+               agent: str = None, **attrs):
+        """Record an already-measured interval (e.g. time spent queued in an inbox)."""
+        if not self.enabled:
+            return
+        span = self.span(name, headers=headers, agent=agent, **attrs)
+        span.start_ns, span.end_ns = start_ns, end_ns
+        span.thread_id = threading.get_ident()
+        self._finish(span)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def _set_active(self, thread_id: int, span: Optional[Span]) -> Optional[Span]:
+        """
+        Note `span` as running for the profiler. Inside an event loop tasks
+        interleave on one thread, so spans are tracked per task (their
+        nesting is strictly LIFO within a task) and the profiler looks up
+        whichever task the loop is running when it samples.
+        """
+        loop = asyncio._get_running_loop()
+        task = asyncio.current_task(loop) if loop is not None else None
+        if task is not None:
+            self._loops[thread_id] = loop
+            key = task
+        else:
+            key = thread_id
+        previous = self._active.get(key)
+        if span is None:
+            self._active.pop(key, None)
+        else:
+            self._active[key] = span
+        return previous
+
+    def active_span(self, thread_id: int) -> Optional[Span]:
+        """Span running on `thread_id` right now, as seen from another thread."""
+        loop = self._loops.get(thread_id)
+        task = asyncio.current_task(loop) if loop is not None else None
+        if task is not None:
+            return self._active.get(task)
+        return self._active.get(thread_id)
+
+    # -- export --------------------------------------------------------------
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self._buffer.append(span)
+            should_flush = len(self._buffer) >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return and clear buffered spans without writing them."""
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        return [s.to_dict() for s in spans]
+
+    def flush(self):
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        if not self.path or not spans:
+            return
+        with self._export_lock, open(self.path, "a") as f:
+            if self.fmt == "jsonl":
+                for span in spans:
+                    f.write(json.dumps(span.to_dict(), separators=(",", ":")) + "\n")
+            else:
+                self._write_chrome(f, spans)
+
+    def _write_chrome(self, f, spans: List[Span]):
+        # JSON Array Format: the closing "]" is optional for chrome://tracing and
+        # Perfetto, so each flush appends its events instead of rewriting the file
+        if not self._chrome_started:
+            f.truncate(0)
+            f.write("[\n")
+            self._chrome_started = True
+        pid = os.getpid()
+        for span in spans:
+            event = {
+                "name": span.name,
+                "cat": span.agent or "bus",
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {"trace_id": span.trace_id, "span_id": span.span_id,
+                         "parent_id": span.parent_id, "intent": span.intent, **(span.attrs or {})},
+            }
+            f.write(json.dumps(event, separators=(",", ":"), default=str) + ",\n")
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of threads running traced spans every `interval`
+    seconds and attributes CPU time to (agent, intent, function).
+
+    Threads parked in the event loop's selector are idle, not busy, and are
+    not counted.
+    """
+
+    IDLE_FUNCTIONS = {"select", "poll", "epoll", "_run_once", "wait"}
+
+    def __init__(self, tracer: 'Tracer', interval: float = 0.005):
+        self.tracer = tracer
+        self.interval = interval
+        self.samples: collections.Counter = collections.Counter()
+        self.total_samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.tracer._track_active = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="a2a-sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.tracer._track_active = False
+        self.tracer._active.clear()
+        self.tracer._loops.clear()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            threads = {key for key in list(self.tracer._active) if isinstance(key, int)} | set(list(self.tracer._loops))
+            for thread_id in threads:
+                span = self.tracer.active_span(thread_id)
+                if span is None or thread_id == own or thread_id not in frames:
+                    continue
+                frame = frames[thread_id]
+                code = frame.f_code
+                if code.co_name in self.IDLE_FUNCTIONS:
+                    continue
+                where = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+                self.samples[(span.agent or "-", span.intent or span.name, where)] += 1
+                self.total_samples += 1
+
+    def report(self, top: int = 20) -> List[Dict[str, Any]]:
+        """Busy time per (agent, intent, function), largest first."""
+        return [
+            {"agent": agent, "intent": intent, "function": where,
+             "samples": count, "cpu_ms": round(count * self.interval * 1000, 2)}
+            for (agent, intent, where), count in self.samples.most_common(top)
+        ]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+# Process-wide tracer used by the platform instrumentation
+tracer = Tracer()
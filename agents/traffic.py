@@ -0,0 +1,313 @@
+"""
+Traffic Capture & Replay - Reproduce mesh load locally.
+
+`MessageBus.start_capture(path)` writes every routed message, with its send
+time, to a compact binary trace. `TrafficReplayer` pushes a trace back
+through a MessageBus against stub agents at 1x, Nx or maximum speed and
+reports throughput and latency percentiles, so engine changes can be
+compared on identical traffic.
+
+Trace format (little endian):
+  header: b"A2AT" | version:u8 | capture_start_unix_ns:u64
+  record: offset_ns:u64 | kind:u8 | target_len:u16 | payload_len:u32 | target | payload
+  kind: 0 = compact JSON (mesh packets)
+        1 = typed JSON {"type": "TaskRequest", "fields": {...}} (dataclass messages)
+        2 = roster: JSON list of agent ids registered on the bus (no message)
+        bit 0x80 = zlib-compressed payload
+
+Payloads are always JSON, so a trace from elsewhere can be replayed without
+executing anything it contains.
+
+Usage:
+  python -m agents.traffic info trace.a2at
+  python -m agents.traffic replay trace.a2at --speed 2
+  python -m agents.traffic replay trace.a2at --speed max --service-us 50
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import struct
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+MAGIC = b"A2AT"
+VERSION = 2
+HEADER = struct.Struct("<4sBQ")
+RECORD = struct.Struct("<QBHI")
+
+KIND_JSON = 0
+KIND_TYPED = 1
+KIND_ROSTER = 2
+FLAG_ZLIB = 0x80
+COMPRESS_MIN_BYTES = 512
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _encode(message: Any) -> Tuple[int, bytes]:
+    if isinstance(message, dict):
+        return KIND_JSON, _dumps(message)
+    if dataclasses.is_dataclass(message):
+        fields = dataclasses.asdict(message)
+    else:
+        fields = dict(getattr(message, "__dict__", None) or {"repr": repr(message)})
+    return KIND_TYPED, _dumps({"type": type(message).__name__, "fields": fields})
+
+
+@lru_cache(maxsize=1)
+def _message_types() -> Dict[str, type]:
+    """Dataclass messages a typed record can be rebuilt as (empty without the platform)."""
+    try:
+        from agents.platform import TaskRequest, TaskResponse
+    except ImportError:
+        return {}
+    return {cls.__name__: cls for cls in (TaskRequest, TaskResponse)}
+
+
+def _decode_typed(record: dict) -> Any:
+    """Rebuild a typed record; unknown types come back as the {"type", "fields"} dict."""
+    cls = _message_types().get(record.get("type"))
+    if cls is None:
+        return record
+    names = {f.name for f in dataclasses.fields(cls)}
+    return cls(**{k: v for k, v in record.get("fields", {}).items() if k in names})
+
+
+class TrafficRecorder:
+    """Appends routed messages (and the agents they could reach) to a binary trace file."""
+
+    def __init__(self, path: str, compress: bool = True, agents: Iterable[str] = ()):
+        self.path = path
+        self.compress = compress
+        self.count = 0
+        self._lock = threading.Lock()
+        self._start_ns = time.perf_counter_ns()
+        self._file = open(path, "wb", buffering=1 << 20)
+        self._file.write(HEADER.pack(MAGIC, VERSION, time.time_ns()))
+        self.add_agents(agents)
+
+    def add_agents(self, agent_ids: Iterable[str]):
+        """Note agents registered on the bus, so replayed broadcasts reach as many stubs."""
+        agent_ids = list(agent_ids)
+        if agent_ids:
+            self._write(KIND_ROSTER, None, _dumps(agent_ids))
+
+    def record(self, message: Any, target_id: Optional[str]):
+        kind, payload = _encode(message)
+        self._write(kind, target_id, payload)
+
+    def _write(self, kind: int, target_id: Optional[str], payload: bytes):
+        offset = time.perf_counter_ns() - self._start_ns
+        if self.compress and len(payload) >= COMPRESS_MIN_BYTES:
+            packed = zlib.compress(payload, 1)
+            if len(packed) < len(payload):
+                kind, payload = kind | FLAG_ZLIB, packed
+        target = (target_id or "").encode("utf-8")
+        with self._lock:
+            self._file.write(RECORD.pack(offset, kind, len(target), len(payload)))
+            self._file.write(target)
+            self._file.write(payload)
+            if kind & ~FLAG_ZLIB != KIND_ROSTER:
+                self.count += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_trace(path: str, agents: Optional[Set[str]] = None) -> Iterator[Tuple[int, Optional[str], Any]]:
+    """
+    Yield (offset_ns, target_id, message) records from a trace file. Roster
+    records are not yielded; pass a set as `agents` to collect their ids.
+    """
+    with open(path, "rb") as f:
+        magic, version, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an A2A traffic trace (v{VERSION}); re-capture it")
+        while True:
+            head = f.read(RECORD.size)
+            if len(head) < RECORD.size:
+                return
+            offset, kind, target_len, payload_len = RECORD.unpack(head)
+            target = f.read(target_len).decode("utf-8") or None
+            payload = f.read(payload_len)
+            if kind & FLAG_ZLIB:
+                payload = zlib.decompress(payload)
+            kind &= ~FLAG_ZLIB
+            if kind == KIND_ROSTER:
+                if agents is not None:
+                    agents.update(json.loads(payload))
+                continue
+            if kind == KIND_JSON:
+                message = json.loads(payload)
+            elif kind == KIND_TYPED:
+                message = _decode_typed(json.loads(payload))
+            else:
+                raise ValueError(f"{path}: unknown record kind {kind}")
+            yield offset, target, message
+
+
+@dataclass
+class _Card:
+    """Same fields as agents.platform.AgentCard, so schedulers and dashboards can read stubs."""
+    uuid: str
+    name: str
+    description: str = "traffic replay stub"
+    version: str = "1.0.0"
+    capabilities: list = field(default_factory=list)
+    registry_id: Optional[str] = None
+
+
+class StubAgent:
+    """
+    Stands in for a captured agent: queues deliveries and drains them after an
+    optional fixed service time, recording send-to-processed latency.
+    """
+
+    def __init__(self, agent_id: str, service_time: float = 0.0):
+        self.card = _Card(uuid=agent_id, name=f"stub-{agent_id[:8]}")
+        self.service_time = service_time
+        self.bus = None
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.latencies_ns: List[int] = []
+
+    def connect(self, bus):
+        self.bus = bus
+
+    async def receive(self, message: Any):
+        await self.inbox.put((time.perf_counter_ns(), message))
+
+    async def run(self, sent_at: dict):
+        while True:
+            enqueued, message = await self.inbox.get()
+            if self.service_time:
+                await asyncio.sleep(self.service_time)
+            # A broadcast reaches every stub, so the send time is read, not popped
+            started = sent_at.get(id(message), enqueued)
+            self.latencies_ns.append(time.perf_counter_ns() - started)
+            self.inbox.task_done()
+
+
+@dataclass
+class ReplayReport:
+    messages: int
+    duration_s: float
+    throughput: float
+    latency_ms: dict = field(default_factory=dict)
+    schedule_lag_ms: dict = field(default_factory=dict)
+
+    def __str__(self):
+        lat = ", ".join(f"{k}={v:.3f}" for k, v in self.latency_ms.items())
+        lag = ", ".join(f"{k}={v:.3f}" for k, v in self.schedule_lag_ms.items())
+        return (f"Messages:   {self.messages}\n"
+                f"Duration:   {self.duration_s:.3f} s\n"
+                f"Throughput: {self.throughput:,.0f} msg/s\n"
+                f"Latency ms: {lat}\n"
+                f"Lag ms:     {lag}")
+
+
+def _percentiles(values_ns: List[int]) -> dict:
+    if not values_ns:
+        return {}
+    ordered = sorted(values_ns)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] / 1e6
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "p999": pick(0.999), "max": ordered[-1] / 1e6}
+
+
+class TrafficReplayer:
+    """Replays a captured trace through a MessageBus."""
+
+    def __init__(self, path: str):
+        self.agents: Set[str] = set()
+        self.records = list(read_trace(path, self.agents))
+
+    async def replay(self, speed: float = 1.0, bus=None, service_time: float = 0.0) -> ReplayReport:
+        """
+        speed: 1.0 = recorded pacing, N = N times faster, 0 or inf = as fast as possible.
+        """
+        if bus is None:
+            from agents.platform import MessageBus
+            bus = MessageBus()
+
+        targets = self.agents | {target for _, target, _ in self.records if target}
+        if not targets and self.records:
+            # Broadcast-only trace captured without a roster: give it one receiver
+            targets = {str(uuid.uuid4())}
+        stubs = [StubAgent(target, service_time) for target in sorted(targets)]
+        for stub in stubs:
+            bus.register(stub)
+        sent_at: dict = {}
+        workers = [asyncio.create_task(stub.run(sent_at)) for stub in stubs]
+
+        max_speed = not speed or speed == float("inf")
+        lags: List[int] = []
+        start = time.perf_counter_ns()
+        for i, (offset, target, message) in enumerate(self.records):
+            if not max_speed:
+                due = start + int(offset / speed)
+                delay = due - time.perf_counter_ns()
+                if delay > 0:
+                    await asyncio.sleep(delay / 1e9)
+                lags.append(max(0, time.perf_counter_ns() - due))
+            elif i % 256 == 0:
+                await asyncio.sleep(0)
+            sent_at[id(message)] = time.perf_counter_ns()
+            await bus.send(message, target)
+
+        await asyncio.gather(*(stub.inbox.join() for stub in stubs))
+        duration = (time.perf_counter_ns() - start) / 1e9
+        sent_at.clear()
+        for worker in workers:
+            worker.cancel()
+
+        latencies = [lat for stub in stubs for lat in stub.latencies_ns]
+        return ReplayReport(
+            messages=len(self.records),
+            duration_s=duration,
+            throughput=len(self.records) / duration if duration else 0.0,
+            latency_ms=_percentiles(latencies),
+            schedule_lag_ms=_percentiles(lags),
+        )
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="A2A traffic trace tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="summarize a trace")
+    info.add_argument("trace")
+    replay = sub.add_parser("replay", help="replay a trace against stub agents")
+    replay.add_argument("trace")
+    replay.add_argument("--speed", default="1", help="pacing multiplier, or 'max'")
+    replay.add_argument("--service-us", type=float, default=0.0, help="simulated per-message service time")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        agents: Set[str] = set()
+        records = list(read_trace(args.trace, agents))
+        targets = {t for _, t, _ in records}
+        span = records[-1][0] / 1e9 if records else 0.0
+        print(f"Records:  {len(records)}")
+        print(f"Targets:  {len(targets)}")
+        print(f"Agents:   {len(agents)}")
+        print(f"Duration: {span:.3f} s")
+        return
+
+    speed = 0.0 if args.speed == "max" else float(args.speed)
+    report = asyncio.run(TrafficReplayer(args.trace).replay(speed=speed, service_time=args.service_us / 1e6))
+    print(report)
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,30 +1,134 @@
 import sys
-import os
 from pathlib import Path
 
-# Add parent directory to path to allow imports when run as script
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add parent directory to path only when run as a script; package imports
+# must not mutate sys.path.
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import asyncio
+import heapq
 import logging
 import json
-from typing import List, Dict, Any
+import time
+from html.parser import HTMLParser
+from typing import List, Dict, Any, Optional, Union
 
 from agents.agent_platform import BaseAgent, TaskRequest, TaskResponse
+from agents.topic_index import TopicIndex, slugify
 
 logger = logging.getLogger("trend-pipeline")
 
+# Structured trends contract: the Google Trends agent may attach an artifact
+#   {"type": "trending_topics", "topics": [{"topic": str, "score": float, "rank": int}, ...]}
+# (as a dict or JSON string). The HTML table in `output` is only a fallback.
+TRENDING_TOPICS_ARTIFACT = "trending_topics"
+TOPICS_PER_RUN = 3
+# Ranked candidates read per run, so skipped near-duplicates do not use up the run
+TOPIC_CANDIDATES = 25
+HTML_FEED_CHUNK = 4096
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _TrendTableParser(HTMLParser):
+    """
+    Incremental parser for the trends HTML table: takes the first topic-like
+    cell of each <tr> and stops as soon as `limit` distinct topics are found.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.topics: List[str] = []
+        self._seen = set()
+        self._cell: Optional[List[str]] = None
+        self._cell_has_markup = False
+        self._row_done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row_done = False
+        elif tag == "td":
+            self._cell, self._cell_has_markup = [], False
+        elif self._cell is not None:
+            self._cell_has_markup = True  # only plain-text cells hold topic names
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def handle_endtag(self, tag):
+        if tag != "td" or self._cell is None:
+            return
+        text = "".join(self._cell).strip()
+        self._cell = None
+        if self._row_done or self._cell_has_markup or "#" in text:
+            return
+        if text and not text.isdigit() and len(text) > 3:
+            self._row_done = True
+            if text not in self._seen:
+                self._seen.add(text)
+                self.topics.append(text)
+                if len(self.topics) >= self.limit:
+                    raise _StopParsing()
+
+def _rank_key(entry: Any) -> Optional[tuple]:
+    """(rank, -score) sort key of a trending_topics entry; None if rank/score are not numbers."""
+    if not isinstance(entry, dict):
+        return None
+    try:
+        rank = float(entry["rank"]) if entry.get("rank") is not None else float("inf")
+        score = float(entry.get("score") or 0)
+    except (TypeError, ValueError):
+        return None
+    return rank, -score
+
+
+def _cube_summary(cube_json: Any) -> Optional[str]:
+    """content.summary of a generated cube (dict or JSON string), if present."""
+    if isinstance(cube_json, str):
+        try:
+            cube_json = json.loads(cube_json)
+        except json.JSONDecodeError:
+            return None
+    content = cube_json.get("content") if isinstance(cube_json, dict) else None
+    summary = content.get("summary") if isinstance(content, dict) else None
+    return summary if isinstance(summary, str) else None
+
+
 class TrendPipelineAgent(BaseAgent):
     """
     Orchestrator agent that automates the trend-to-cube pipeline.
     Coordinates: Google Trends → Content Generator → Cube Publisher
     """
     
+    # What to do with a topic that closely matches an already-published cube:
+    # "skip" it, or "update" the existing cube instead of creating a new one.
+    duplicate_policy = "skip"
+    # Under "skip", a match last published longer ago than this is updated instead
+    refresh_after = 7 * 24 * 3600
+
     def __init__(self):
         super().__init__(
             name="Trend Pipeline",
             description="Automates the trend-to-cube content generation pipeline. Fetches trends, generates summaries, publishes cubes."
         )
+        self.topic_index: Optional[TopicIndex] = None
+
+    async def _topic_index(self) -> TopicIndex:
+        """Published-cube index, read from disk once (off the loop) and then kept current in memory."""
+        if self.topic_index is None:
+            self.topic_index = await asyncio.to_thread(TopicIndex.from_cubes)
+        return self.topic_index
+
+    def _should_skip(self, index: TopicIndex, duplicate) -> bool:
+        if self.duplicate_policy != "skip":
+            return False
+        age = index.age(duplicate.slug, time.time())
+        return age is None or age < self.refresh_after
     
     async def handle_task(self, request: TaskRequest):
         """
@@ -50,32 +154,46 @@ class TrendPipelineAgent(BaseAgent):
             await self.send_message(trends_request, target_id=trends_agent_id)
             trends_response = await self._wait_for_response(trends_request.task_id, timeout=30)
             
-            # Parse trends from response (this is simplified - in production, parse the HTML table)
-            # For now, we'll use a sample trend
-            topics = self._extract_topics_from_response(trends_response.output)
+            # Prefer the structured trends artifact; fall back to streaming the HTML table
+            topics = self._extract_topics(trends_response, limit=TOPIC_CANDIDATES)
             
             if not topics:
                 topics = ["barcelona - frankfurt"]  # Fallback to known trend
             
-            # Limit to top 3 for demo
-            topics = topics[:3]
-            
             # Step 2 & 3: For each topic, generate content and publish cube
             published_cubes = []
+            topic_index = await self._topic_index()
             
+            generated = 0
             for topic in topics:
+                if generated >= TOPICS_PER_RUN:
+                    break
                 try:
                     logger.info(f"Processing topic: {topic}")
                     
+                    # Skip (or update) near-duplicates of already-published cubes
+                    duplicate = topic_index.find_duplicate(topic)
+                    if duplicate and self._should_skip(topic_index, duplicate):
+                        logger.info(f"Skipping '{topic}': near-duplicate of cube '{duplicate.slug}' ({duplicate.score:.2f})")
+                        published_cubes.append({
+                            "topic": topic,
+                            "status": "duplicate",
+                            "existing": duplicate.slug
+                        })
+                        continue
+                    
                     # Generate content
                     content_gen_id = self._find_agent("Content Generator")
                     if not content_gen_id:
                         raise Exception("Content Generator not found")
+                    generated += 1
                     
                     content_request = TaskRequest(
                         requester_id=self.card.uuid,
                         content=topic
                     )
+                    if duplicate:
+                        content_request.context = {"mode": "update", "slug": duplicate.slug, "topic": duplicate.topic}
                     
                     await self.send_message(content_request, target_id=content_gen_id)
                     content_response = await self._wait_for_response(content_request.task_id, timeout=60)
@@ -83,6 +201,21 @@ class TrendPipelineAgent(BaseAgent):
                     # Extract Agent Voxel JSON from artifacts
                     if content_response.artifacts:
                         cube_json = content_response.artifacts[0]
+                        summary = _cube_summary(cube_json)
+                        
+                        # The topic was new; the generated summary may still repeat a published cube
+                        if not duplicate and summary:
+                            duplicate = topic_index.find_duplicate(topic, summary)
+                            if duplicate and self._should_skip(topic_index, duplicate):
+                                logger.info(f"Skipping '{topic}': summary matches cube '{duplicate.slug}' ({duplicate.score:.2f})")
+                                published_cubes.append({
+                                    "topic": topic,
+                                    "status": "duplicate",
+                                    "existing": duplicate.slug
+                                })
+                                continue
+                            if duplicate:
+                                content_request.context = {"mode": "update", "slug": duplicate.slug, "topic": duplicate.topic}
                         
                         # Publish cube
                         publisher_id = self._find_agent("Cube Publisher")
@@ -91,7 +224,8 @@ class TrendPipelineAgent(BaseAgent):
                         
                         publish_request = TaskRequest(
                             requester_id=self.card.uuid,
-                            content=cube_json
+                            content=cube_json,
+                            context=content_request.context
                         )
                         
                         await self.send_message(publish_request, target_id=publisher_id)
@@ -101,6 +235,10 @@ class TrendPipelineAgent(BaseAgent):
                             "topic": topic,
                             "status": publish_response.status
                         })
+                        # Later variants in this run (and later runs) are near-duplicates too
+                        if publish_response.status == "completed":
+                            topic_index.add(duplicate.slug if duplicate else slugify(topic),
+                                            duplicate.topic if duplicate else topic, summary, time.time())
                     
                 except Exception as e:
                     logger.error(f"Failed to process topic '{topic}': {e}")
@@ -114,7 +252,7 @@ class TrendPipelineAgent(BaseAgent):
             output = f"""
 <div style="margin-bottom: 20px;">
     <h3 style="margin: 0 0 15px 0; color: #00d4ff;">🚀 Pipeline Execution Complete</h3>
-    <p style="color: #a0aec0;">Processed {len(topics)} trending topics</p>
+    <p style="color: #a0aec0;">Processed {len(published_cubes)} trending topics</p>
 </div>
 
 <table style="width: 100%; border-collapse: collapse; background: rgba(255,255,255,0.05); border-radius: 8px; overflow: hidden;">
@@ -128,8 +266,12 @@ class TrendPipelineAgent(BaseAgent):
 """
             
             for cube in published_cubes:
-                status_color = "#10b981" if cube["status"] == "completed" else "#ef4444"
-                status_text = "✅ Published" if cube["status"] == "completed" else "❌ Failed"
+                if cube["status"] == "completed":
+                    status_color, status_text = "#10b981", "✅ Published"
+                elif cube["status"] == "duplicate":
+                    status_color, status_text = "#a0aec0", f"⏭️ Already published ({cube['existing']})"
+                else:
+                    status_color, status_text = "#ef4444", "❌ Failed"
                 
                 output += f"""
         <tr style="border-bottom: 1px solid rgba(255,255,255,0.05);">
@@ -204,24 +346,51 @@ class TrendPipelineAgent(BaseAgent):
         
         raise TimeoutError(f"No response received for task {task_id}")
     
-    def _extract_topics_from_response(self, html_output: str) -> List[str]:
-        """Extract topic names from HTML table response."""
-        # Simple extraction - look for topic names in the HTML
-        # In production, use proper HTML parsing
-        import re
-        topics = []
-        
-        # Look for patterns like: <td ...>topic name</td>
-        matches = re.findall(r'<td[^>]*>([^<#]+)</td>', html_output)
-        
-        # Filter out numbers, scores, and other non-topic content
-        for match in matches:
-            match = match.strip()
-            if match and not match.isdigit() and len(match) > 3:
-                if match not in topics:
-                    topics.append(match)
-        
-        return topics[:10]  # Return top 10
+    def _extract_topics(self, response: TaskResponse, limit: int = TOPICS_PER_RUN) -> List[str]:
+        """Top `limit` topics from the structured artifact, else from the HTML output."""
+        topics = self._topics_from_artifacts(response.artifacts or [], limit)
+        if topics is None:
+            topics = self._extract_topics_from_response(response.output, limit)
+        return topics
+
+    def _topics_from_artifacts(self, artifacts: list, limit: int) -> Optional[List[str]]:
+        """Ranked topics from a trending_topics artifact, or None if there is none."""
+        for artifact in artifacts:
+            if isinstance(artifact, str) and artifact.lstrip().startswith("{"):
+                try:
+                    artifact = json.loads(artifact)
+                except json.JSONDecodeError:
+                    continue
+            if not isinstance(artifact, dict) or artifact.get("type") != TRENDING_TOPICS_ARTIFACT:
+                continue
+            # Dedupe first (keeping each topic's best rank), then take the top `limit`
+            best: Dict[str, tuple] = {}
+            for entry in artifact.get("topics") or []:
+                key = _rank_key(entry)
+                topic = str(entry.get("topic") or "").strip() if key else ""
+                if topic and (topic not in best or key < best[topic]):
+                    best[topic] = key
+            return [topic for topic, _ in heapq.nsmallest(limit, best.items(), key=lambda item: item[1])]
+        return None
+
+    def _extract_topics_from_response(self, html_output: Union[str, dict, list], limit: int = 10) -> List[str]:
+        """Extract topic names from the HTML table response, stopping after `limit` rows."""
+        if not isinstance(html_output, str):
+            # Structured output (TaskResponse.output may be a dict or list): a
+            # trending_topics object, a list of them, or a plain list of topics
+            items = html_output if isinstance(html_output, list) else [html_output]
+            topics = self._topics_from_artifacts(items, limit)
+            if topics is None:
+                topics = list(dict.fromkeys(t.strip() for t in items if isinstance(t, str) and t.strip()))[:limit]
+            return topics
+        parser = _TrendTableParser(limit)
+        try:
+            for start in range(0, len(html_output), HTML_FEED_CHUNK):
+                parser.feed(html_output[start:start + HTML_FEED_CHUNK])
+            parser.close()
+        except _StopParsing:
+            pass
+        return parser.topics
 
 if __name__ == "__main__":
     import argparse
@@ -229,6 +398,8 @@ if __name__ == "__main__":
     # Parse args
     parser = argparse.ArgumentParser(description='Automated Trend Content Pipeline')
     parser.add_argument('--auto-publish', action='store_true', help='Automatically publish generated content')
+    parser.add_argument('--metrics-port', type=int, default=9464, help='Serve Prometheus /metrics on this loopback port (0 disables)')
+    parser.add_argument('--events-port', type=int, default=9465, help='Serve the control.html event stream on this loopback port (0 disables)')
     args = parser.parse_args()
     
     # Define main async routine
@@ -243,6 +414,15 @@ if __name__ == "__main__":
         from agents.cube_publisher import CubePublisherAgent
         
         bus = MessageBus()
+        if args.metrics_port:
+            from agents.metrics import start_metrics_server
+            start_metrics_server(port=args.metrics_port)
+        if args.events_port:
+            from agents.events import EventHub, start_event_server
+            hub = bus.attach_events(EventHub())
+            hub.start()
+            await start_event_server(hub, port=args.events_port)
+            logger.info(f"Event stream: control.html?events=http://127.0.0.1:{args.events_port}")
         
         # Register agents
         pipeline = TrendPipelineAgent()
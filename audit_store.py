@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+Audit Store: Memory-Mapped Columnar Compliance Queries
+Compacts sealed audit_compliance.jsonl logs into columnar segments and
+answers filter / group-by questions over them without re-parsing JSON.
+
+Each segment (at most SEGMENT_ROWS events) is a directory of fixed-width
+.npy columns opened with mmap:
+
+  ts       int64   microseconds since the Unix epoch (UTC)
+  event    uint8   event_type   (dictionary code)
+  node     uint16  node_id      (dictionary code)
+  source   uint32  source agent (dictionary code, shared "agent" dictionary)
+  target   uint32  target agent
+  action   uint32  action
+  reason   uint32  block reason
+
+plus dicts.json (code -> string per dictionary; code 0 is "missing") and a
+tx_id index: tx.npy holds the 32-byte ids sorted, tx_rows.npy the row of
+each. Non-hex tx ids are indexed by their SHA-256 and kept in tx_aliases.
+
+A log is sealed by renaming it (logrotate's dateext names, optionally .gz,
+or --seal here). compact only reads sources not yet in the store manifest,
+one process per log, and records per-segment timestamp ranges so time
+filters skip whole segments.
+
+Usage:
+  python audit_store.py compact --seal
+  python audit_store.py query --group-by source hour --where event_type=ALLOW,BLOCK --rate event_type=BLOCK
+  python audit_store.py query --count --where source=Rogue_Agent --since 2026-01-28
+  python audit_store.py tx bb9c77ca
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+AUDIT_LOG_PATH = Path("audit_compliance.jsonl")
+SEALED_GLOB = "audit_compliance.jsonl-*"
+STORE_DIR = Path("cache/audit_store")
+
+# Bump when the segment layout changes: stale stores are rebuilt from scratch
+STORE_VERSION = 1
+SEGMENT_ROWS = 4_000_000
+PART_BYTES = 256 << 20        # plain logs are compacted in ranges of this many bytes
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+HOUR_US = 3_600_000_000
+DAY_US = 24 * HOUR_US
+
+# column -> (numpy dtype, dictionary it is coded against)
+COLUMNS = {
+    "ts": ("<i8", None),
+    "event": ("u1", "event"),
+    "node": ("<u2", "node"),
+    "source": ("<u4", "agent"),
+    "target": ("<u4", "agent"),
+    "action": ("<u4", "action"),
+    "reason": ("<u4", "reason"),
+}
+DICTIONARIES = ("event", "node", "agent", "action", "reason")
+CODED_COLUMNS = ("event", "node", "source", "target", "action", "reason")
+
+# query field -> column
+FIELDS = {
+    "event_type": "event",
+    "node": "node",
+    "node_id": "node",
+    "source": "source",
+    "target": "target",
+    "action": "action",
+    "reason": "reason",
+}
+TIME_KEYS = {"hour": HOUR_US, "day": DAY_US}
+
+
+# ============================================================================
+# COMPACTION (runs in pool workers)
+# ============================================================================
+
+def _micros(timestamp: str) -> int:
+    dt = datetime.fromisoformat(timestamp)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def tx_key(tx_id: str) -> bytes:
+    """32-byte index key: the id itself when it is 64 hex digits, else its SHA-256."""
+    if len(tx_id) == 64:
+        try:
+            return bytes.fromhex(tx_id)
+        except ValueError:
+            pass
+    return hashlib.sha256(tx_id.encode()).digest()
+
+
+class _SegmentBuilder:
+    """Accumulates parsed events into compact arrays until flushed to disk."""
+
+    def __init__(self):
+        self.codes = {name: {"": 0} for name in DICTIONARIES}
+        self.columns = {
+            "ts": array("q"), "event": array("B"), "node": array("H"),
+            "source": array("I"), "target": array("I"), "action": array("I"), "reason": array("I"),
+        }
+        self.tx = bytearray()
+        self.tx_rows = array("I")
+        self.tx_aliases: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self.columns["ts"])
+
+    def add(self, event: dict):
+        """Append one decoded event; raises before touching any column if it is malformed."""
+        details = event.get("details") or {}
+        ts = _micros(event["timestamp"])
+        codes = self.codes
+        row_codes = []
+        for dictionary, value in (("event", event.get("event_type")), ("node", event.get("node_id")),
+                                  ("agent", details.get("source", details.get("from"))),
+                                  ("agent", details.get("target", details.get("to"))),
+                                  ("action", details.get("action")), ("reason", details.get("reason"))):
+            if value is None:
+                row_codes.append(0)
+                continue
+            table = codes[dictionary]
+            code = table.get(value)
+            if code is None:
+                code = table[value] = len(table)
+            row_codes.append(code)
+        tx_id = details.get("tx_id")
+        key = tx_key(tx_id) if tx_id else None
+
+        cols = self.columns
+        row = len(cols["ts"])
+        cols["ts"].append(ts)
+        for name, code in zip(CODED_COLUMNS, row_codes):
+            cols[name].append(code)
+        if key is not None:
+            if len(tx_id) != 64 or key.hex() != tx_id.lower():
+                self.tx_aliases[key.hex()] = tx_id
+            self.tx += key
+            self.tx_rows.append(row)
+
+    def write(self, path: Path, source: str) -> dict:
+        """Write the segment directory atomically and return its manifest entry."""
+        tmp = path.with_name(path.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        if len(self.codes["event"]) > 256 or len(self.codes["node"]) > 65536:
+            raise ValueError(f"{source}: too many distinct event types or nodes for their column width")
+
+        for name, (dtype, _) in COLUMNS.items():
+            np.save(tmp / f"{name}.npy", np.frombuffer(self.columns[name], dtype=dtype))
+        keys = np.frombuffer(bytes(self.tx), dtype="S32")
+        order = np.argsort(keys, kind="stable")
+        np.save(tmp / "tx.npy", keys[order])
+        np.save(tmp / "tx_rows.npy", np.frombuffer(self.tx_rows, dtype="<u4")[order])
+        with open(tmp / "dicts.json", "w") as f:
+            json.dump({"dictionaries": {name: list(codes) for name, codes in self.codes.items()},
+                       "tx_aliases": self.tx_aliases}, f, separators=(",", ":"))
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+        ts = self.columns["ts"]
+        return {"name": path.name, "source": source, "rows": len(ts),
+                "ts_min": min(ts) if ts else 0, "ts_max": max(ts) if ts else 0}
+
+
+def _open_log(path: str):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def compact_log(job: Tuple[str, str, int, int, Optional[int], int]) -> Tuple[str, List[dict], int]:
+    """
+    Convert the lines of one sealed log that start in [start, end) into
+    segments. Returns (log path, segment entries, bad lines).
+    """
+    log_path, store_dir, segment_rows, start, end, part = job
+    stem = Path(log_path).name.replace(".jsonl", "").replace(".gz", "")
+    # Path digest keeps same-named logs from different directories apart
+    stem = f"{stem}-{hashlib.sha1(log_path.encode()).hexdigest()[:8]}-{part:03d}"
+    segments, bad = [], 0
+    builder = _SegmentBuilder()
+    loads = json.loads
+    with _open_log(log_path) as f:
+        if start:
+            # Skip the line straddling `start`; the previous range owns it
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        for line in f:
+            if end is not None and pos >= end:
+                break
+            pos += len(line)
+            try:
+                builder.add(loads(line))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                bad += line.strip() != b""
+                continue
+            if len(builder) >= segment_rows:
+                segments.append(builder.write(Path(store_dir) / f"{stem}-{len(segments):04d}", log_path))
+                builder = _SegmentBuilder()
+    if len(builder) or not segments:
+        segments.append(builder.write(Path(store_dir) / f"{stem}-{len(segments):04d}", log_path))
+    return log_path, segments, bad
+
+
+def _jobs_for(log: str, size: int, store_dir: str, segment_rows: int) -> List[tuple]:
+    """Plain logs larger than PART_BYTES are split into byte ranges compacted in parallel."""
+    if log.endswith(".gz") or size <= PART_BYTES:
+        return [(log, store_dir, segment_rows, 0, None, 0)]
+    bounds = list(range(0, size, PART_BYTES))
+    return [(log, store_dir, segment_rows, lo, hi, part)
+            for part, (lo, hi) in enumerate(zip(bounds, bounds[1:] + [None]))]
+
+
+def seal_log(path: Path = AUDIT_LOG_PATH) -> Optional[Path]:
+    """Rotate the live log aside (the sentinel reopens it per event) so it can be compacted."""
+    if not path.exists() or path.stat().st_size == 0:
+        return None
+    sealed = path.with_name(f"{path.name}-{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}")
+    os.replace(path, sealed)
+    return sealed
+
+
+def load_manifest(store_dir: Path) -> dict:
+    try:
+        with open(store_dir / "manifest.json") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": STORE_VERSION, "sources": {}, "segments": []}
+    if manifest.get("version") != STORE_VERSION:
+        return {"version": STORE_VERSION, "sources": {}, "segments": []}
+    return manifest
+
+
+def save_manifest(store_dir: Path, manifest: dict):
+    tmp = store_dir / "manifest.json.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, store_dir / "manifest.json")
+
+
+def compact(logs: Iterable[str], store_dir: Path = STORE_DIR, workers: int = None,
+            segment_rows: int = SEGMENT_ROWS) -> dict:
+    """Compact every log not already in the store (a changed log replaces its segments)."""
+    start = time.perf_counter()
+    store_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(store_dir)
+    if not manifest["segments"]:
+        # A fresh or version-bumped manifest: drop whatever segments are on disk
+        for child in store_dir.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child)
+
+    jobs = []
+    for log in sorted(set(logs)):
+        st = os.stat(log)
+        seen = manifest["sources"].get(log)
+        if seen and seen["size"] == st.st_size and seen["mtime_ns"] == st.st_mtime_ns:
+            continue
+        jobs.extend(_jobs_for(log, st.st_size, str(store_dir), segment_rows))
+        manifest["sources"][log] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            results = list(pool.map(compact_log, jobs))
+    else:
+        results = [compact_log(job) for job in jobs]
+
+    fresh: Dict[str, List[dict]] = {}
+    bad = 0
+    for log, segments, skipped in results:
+        fresh.setdefault(log, []).extend(segments)
+        bad += skipped
+    for log, segments in fresh.items():
+        names = {s["name"] for s in segments}
+        for old in manifest["segments"]:
+            if old["source"] == log and old["name"] not in names:
+                shutil.rmtree(store_dir / old["name"], ignore_errors=True)
+        manifest["segments"] = [s for s in manifest["segments"] if s["source"] != log] + segments
+    rows = sum(s["rows"] for segments in fresh.values() for s in segments)
+    if jobs:
+        save_manifest(store_dir, manifest)
+
+    return {
+        "logs": len(fresh),
+        "rows": rows,
+        "bad_lines": bad,
+        "segments": len(manifest["segments"]),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def _as_micros(value) -> int:
+    if isinstance(value, datetime):
+        return _micros(value.isoformat())
+    if isinstance(value, (int, float)):
+        return int(value * 1_000_000)
+    return _micros(str(value))
+
+
+def _iso(micros: int) -> str:
+    return (EPOCH + timedelta(microseconds=int(micros))).isoformat()
+
+
+class Segment:
+    """One compacted segment; columns are memory-mapped on first use."""
+
+    def __init__(self, path: Path, meta: dict):
+        self.path = path
+        self.meta = meta
+        self.rows = meta["rows"]
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dicts = None
+        self._lookup: Dict[str, Dict[str, int]] = {}
+        self._tx_of_row = None
+
+    def column(self, name: str) -> np.ndarray:
+        col = self._columns.get(name)
+        if col is None:
+            col = self._columns[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return col
+
+    @property
+    def dictionaries(self) -> dict:
+        if self._dicts is None:
+            with open(self.path / "dicts.json") as f:
+                self._dicts = json.load(f)
+        return self._dicts
+
+    def values(self, column: str) -> List[str]:
+        return self.dictionaries["dictionaries"][COLUMNS[column][1]]
+
+    def code(self, column: str, value: str) -> Optional[int]:
+        name = COLUMNS[column][1]
+        lookup = self._lookup.get(name)
+        if lookup is None:
+            lookup = self._lookup[name] = {v: i for i, v in enumerate(self.dictionaries["dictionaries"][name])}
+        return lookup.get(value)
+
+    def tx_range(self, lo: bytes, hi: bytes) -> np.ndarray:
+        """Rows whose tx key k satisfies lo <= k <= hi."""
+        keys = self.column("tx")
+        left = np.searchsorted(keys, np.bytes_(lo), side="left")
+        right = np.searchsorted(keys, np.bytes_(hi), side="right")
+        return self.column("tx_rows")[left:right]
+
+    def tx_of(self, row: int) -> Optional[str]:
+        if self._tx_of_row is None:
+            tx_rows = self.column("tx_rows")
+            self._tx_of_row = np.full(self.rows, -1, dtype=np.int64)
+            self._tx_of_row[tx_rows] = np.arange(len(tx_rows))
+        i = self._tx_of_row[row]
+        if i < 0:
+            return None
+        key = bytes(self.column("tx")[i]).ljust(32, b"\0").hex()
+        return self.dictionaries["tx_aliases"].get(key, key)
+
+    def row(self, i: int) -> dict:
+        event = {"timestamp": _iso(self.column("ts")[i])}
+        for field, column in (("event_type", "event"), ("node_id", "node"), ("source", "source"),
+                              ("target", "target"), ("action", "action"), ("reason", "reason")):
+            code = int(self.column(column)[i])
+            if code:
+                event[field] = self.values(column)[code]
+        tx_id = self.tx_of(i)
+        if tx_id:
+            event["tx_id"] = tx_id
+        return event
+
+
+class AuditStore:
+    """
+    Vectorized queries over every compacted segment. Filters are keyword
+    arguments: a field (event_type, node, source, target, action, reason)
+    equal to a value or one of a list of values, plus since/until bounds.
+    """
+
+    def __init__(self, store_dir: Path = STORE_DIR):
+        self.store_dir = Path(store_dir)
+        manifest = load_manifest(self.store_dir)
+        self.segments = [Segment(self.store_dir / meta["name"], meta) for meta in manifest["segments"]]
+
+    def __len__(self):
+        return sum(segment.rows for segment in self.segments)
+
+    def _matches(self, filters: dict) -> Iterator[Tuple[Segment, Optional[np.ndarray]]]:
+        """(segment, boolean mask or None for every row) for each segment that can match."""
+        filters = dict(filters)
+        since = filters.pop("since", None)
+        until = filters.pop("until", None)
+        since = _as_micros(since) if since is not None else None
+        until = _as_micros(until) if until is not None else None
+        unknown = set(filters) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"unknown filter fields: {', '.join(sorted(unknown))}")
+
+        for segment in self.segments:
+            if not segment.rows:
+                continue
+            if since is not None and segment.meta["ts_max"] < since:
+                continue
+            if until is not None and segment.meta["ts_min"] >= until:
+                continue
+            mask = None
+            for field, wanted in filters.items():
+                column = FIELDS[field]
+                wanted = wanted if isinstance(wanted, (list, tuple, set, frozenset)) else (wanted,)
+                codes = [c for c in (segment.code(column, v) for v in wanted) if c is not None]
+                if not codes:
+                    break
+                col = segment.column(column)
+                hit = col == codes[0] if len(codes) == 1 else np.isin(col, codes)
+                mask = hit if mask is None else mask & hit
+            else:
+                if since is not None and segment.meta["ts_min"] < since:
+                    hit = segment.column("ts") >= since
+                    mask = hit if mask is None else mask & hit
+                if until is not None and segment.meta["ts_max"] >= until:
+                    hit = segment.column("ts") < until
+                    mask = hit if mask is None else mask & hit
+                yield segment, mask
+
+    def count(self, **filters) -> int:
+        return sum(segment.rows if mask is None else int(np.count_nonzero(mask))
+                   for segment, mask in self._matches(filters))
+
+    def group_by(self, keys: Sequence[str], **filters) -> Dict[tuple, int]:
+        """
+        Event counts per distinct combination of `keys` (fields, or "hour" /
+        "day" buckets rendered as ISO prefixes).
+        """
+        for key in keys:
+            if key not in FIELDS and key not in TIME_KEYS:
+                raise ValueError(f"cannot group by {key!r}")
+        totals: Counter = Counter()
+        for segment, mask in self._matches(filters):
+            if not keys:
+                totals[()] += segment.rows if mask is None else int(np.count_nonzero(mask))
+                continue
+            parts, radices, decoders = [], [], []
+            for key in keys:
+                if key in TIME_KEYS:
+                    ts = segment.column("ts") if mask is None else segment.column("ts")[mask]
+                    buckets = ts // TIME_KEYS[key]
+                    base = int(buckets.min()) if len(buckets) else 0
+                    parts.append(buckets - base)
+                    radices.append(int(buckets.max()) - base + 1 if len(buckets) else 1)
+                    width = 13 if key == "hour" else 10
+                    decoders.append(lambda c, base=base, step=TIME_KEYS[key], width=width:
+                                    _iso((c + base) * step)[:width])
+                else:
+                    column = FIELDS[key]
+                    col = segment.column(column)
+                    parts.append((col if mask is None else col[mask]).astype(np.int64))
+                    values = segment.values(column)
+                    radices.append(len(values))
+                    decoders.append(lambda c, values=values: values[c] if c else None)
+
+            if not len(parts[0]):
+                continue
+            combined = parts[0]
+            for part, radix in zip(parts[1:], radices[1:]):
+                combined = combined * radix + part
+            cells = int(np.prod(radices, dtype=np.float64))
+            if cells <= 1 << 22:
+                counts = np.bincount(combined)
+                present = np.flatnonzero(counts)
+                counts = counts[present]
+            else:
+                present, counts = np.unique(combined, return_counts=True)
+            for value, n in zip(present.tolist(), counts.tolist()):
+                codes = []
+                for radix in reversed(radices):
+                    value, c = divmod(value, radix)
+                    codes.append(c)
+                totals[tuple(decode(c) for decode, c in zip(decoders, reversed(codes)))] += n
+        return dict(totals)
+
+    def rate(self, keys: Sequence[str], where: dict, **filters) -> Dict[tuple, Tuple[int, int, float]]:
+        """(matching `where`, total, share) per group; e.g. block rate by source per hour."""
+        totals = self.group_by(keys, **filters)
+        hits = self.group_by(keys, **{**filters, **where})
+        return {key: (hits.get(key, 0), total, hits.get(key, 0) / total) for key, total in totals.items()}
+
+    def rows(self, limit: int = 100, **filters) -> List[dict]:
+        out = []
+        for segment, mask in self._matches(filters):
+            idx = range(segment.rows) if mask is None else np.flatnonzero(mask)
+            for i in idx:
+                if len(out) >= limit:
+                    return out
+                out.append(segment.row(int(i)))
+        return out
+
+    def tx(self, tx_id: str) -> List[dict]:
+        """
+        Every event for `tx_id`: a hex string of up to 64 digits matches as a
+        prefix, anything else must match an indexed (aliased) id exactly.
+        """
+        try:
+            int(tx_id, 16)
+            is_hex = len(tx_id) <= 64
+        except ValueError:
+            is_hex = False
+        if is_hex:
+            digits = tx_id.lower()
+            lo = bytes.fromhex(digits + "0" * (len(digits) % 2))
+            hi = bytes.fromhex(digits + "f" * (len(digits) % 2)).ljust(32, b"\xff")
+        else:
+            lo = hi = tx_key(tx_id)
+        found = []
+        for segment in self.segments:
+            if segment.rows:
+                found.extend(segment.row(int(i)) for i in segment.tx_range(lo, hi))
+        return sorted(found, key=lambda event: event["timestamp"])
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _parse_where(items: Sequence[str]) -> dict:
+    filters = {}
+    for item in items or ():
+        field, _, value = item.partition("=")
+        values = value.split(",")
+        filters[field] = values if len(values) > 1 else value
+    return filters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar store for sealed compliance audit logs")
+    parser.add_argument("--store", default=str(STORE_DIR), help="store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p_compact = commands.add_parser("compact", help="compact sealed logs into segments")
+    p_compact.add_argument("logs", nargs="*", help=f"logs to compact (default: {SEALED_GLOB})")
+    p_compact.add_argument("--seal", action="store_true", help=f"rotate {AUDIT_LOG_PATH} first")
+    p_compact.add_argument("--workers", type=int, default=None)
+
+    p_query = commands.add_parser("query", help="count or group events")
+    p_query.add_argument("--where", nargs="*", default=[], help="field=value[,value...]")
+    p_query.add_argument("--since")
+    p_query.add_argument("--until")
+    p_query.add_argument("--group-by", nargs="*", default=None)
+    p_query.add_argument("--rate", help="field=value[,value...]: share of each group matching it")
+    p_query.add_argument("--count", action="store_true")
+    p_query.add_argument("--rows", type=int, default=0, help="print up to N matching events")
+
+    p_tx = commands.add_parser("tx", help="events for a tx_id or hex prefix")
+    p_tx.add_argument("tx_id")
+    args = parser.parse_args()
+
+    store_dir = Path(args.store)
+    print("NODE: 0x923-SEA")
+    if args.command == "compact":
+        if args.seal:
+            sealed = seal_log()
+            print(f"SEALED: {sealed or 'nothing to seal'}")
+        logs = args.logs or glob.glob(SEALED_GLOB)
+        stats = compact(logs, store_dir, workers=args.workers)
+        print(f"LOGS: {stats['logs']} compacted ({stats['rows']:,} events, {stats['bad_lines']} bad lines)")
+        print(f"SEGMENTS: {stats['segments']}")
+        print(f"ELAPSED: {stats['elapsed_ms']} ms")
+    elif args.command == "query":
+        store = AuditStore(store_dir)
+        filters = _parse_where(args.where)
+        if args.since:
+            filters["since"] = args.since
+        if args.until:
+            filters["until"] = args.until
+        start = time.perf_counter()
+        if args.group_by is not None and args.rate:
+            result = store.rate(args.group_by, _parse_where([args.rate]), **filters)
+            for key, (hits, total, share) in sorted(result.items(), key=lambda kv: str(kv[0])):
+                print(f"  {' | '.join(map(str, key))}: {hits}/{total} ({share:.1%})")
+        elif args.group_by is not None:
+            for key, n in sorted(store.group_by(args.group_by, **filters).items(), key=lambda kv: -kv[1]):
+                print(f"  {' | '.join(map(str, key))}: {n:,}")
+        if args.count or (args.group_by is None and not args.rows):
+            print(f"COUNT: {store.count(**filters):,} of {len(store):,}")
+        for event in store.rows(args.rows, **filters) if args.rows else ():
+            print(f"  {json.dumps(event)}")
+        print(f"ELAPSED: {(time.perf_counter() - start) * 1000:.2f} ms")
+    else:
+        for event in AuditStore(store_dir).tx(args.tx_id):
+            print(f"  {json.dumps(event)}")
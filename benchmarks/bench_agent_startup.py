@@ -0,0 +1,46 @@
+"""
+Agent Startup Benchmark
+Measures BaseAgent construction cost for a swarm of N agents, with the shared
+identity/codec caches warm versus invalidated before every agent.
+
+Usage:
+  python benchmarks/bench_agent_startup.py --agents 1000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents import platform
+from agents.identity_cache import identity_provider
+
+
+def build_swarm(count: int, cold: bool) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        if cold:
+            identity_provider.invalidate()
+            platform._shared_cube_codec.cache_clear()
+            platform._mesh_class.cache_clear()
+        platform.BaseAgent(name=f"Agent {i % 14:02d}", description="benchmark agent", instruction="Benchmark role")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BaseAgent startup benchmark")
+    parser.add_argument("--agents", type=int, default=1000)
+    args = parser.parse_args()
+
+    cold = build_swarm(args.agents, cold=True)
+    warm = build_swarm(args.agents, cold=False)
+
+    print(f"Agents:         {args.agents}")
+    print(f"Uncached:       {cold * 1000:.1f} ms ({cold / args.agents * 1e6:.1f} us/agent)")
+    print(f"Shared caches:  {warm * 1000:.1f} ms ({warm / args.agents * 1e6:.1f} us/agent)")
+    print(f"Speedup:        {cold / max(warm, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Audit Store Benchmark
+Writes a seeded synthetic sealed audit log in the ComplianceSentinel format,
+compacts it into columnar segments and times the same questions answered by
+the store and by scanning the JSONL line by line:
+
+  block rate by source agent per hour
+  all events for a tx_id prefix
+  count of one agent's blocks in a time window
+
+Usage:
+  python benchmarks/bench_audit_store.py --events 2000000 --segment-rows 500000
+"""
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audit_store import AuditStore, compact
+
+REASONS = ["MISSING_SIGNATURE", "PROTOCOL_NOT_ALLOWED (HTTP/1.1)", "ACTION_BLOCKED (shell_exec)",
+           "PAYLOAD_EXCEEDS_LIMIT (1500000 > 1000000)"]
+ACTIONS = ["balance_query", "send_notification", "data_export", "shell_exec"]
+
+
+def write_log(path: Path, count: int, agents: int, seed: int) -> str:
+    """Synthetic log spanning about a week; returns one tx_id to look up."""
+    rng = random.Random(seed)
+    names = [f"AGENT_{i:02d}" for i in range(agents)]
+    start = datetime(2026, 1, 28, tzinfo=timezone.utc)
+    step = 7 * 86400 / count
+    probe = None
+    with open(path, "w") as f:
+        for i in range(count):
+            ts = (start + timedelta(seconds=i * step)).isoformat()
+            tx_id = f"{rng.getrandbits(256):064x}"
+            source, target = rng.choice(names), rng.choice(names)
+            if rng.random() < 0.2:
+                details = {"tx_id": tx_id, "reason": rng.choice(REASONS), "source": source,
+                           "target": target, "action": rng.choice(ACTIONS)}
+                event_type = "BLOCK"
+            else:
+                details = {"tx_id": tx_id, "source": source, "target": target, "action": rng.choice(ACTIONS)}
+                event_type = "ALLOW"
+            if i == count // 2:
+                probe = tx_id
+            f.write(json.dumps({"timestamp": ts, "event_type": event_type, "node_id": "SEA-SENTINEL-001",
+                                "details": details, "signature": tx_id[:16]}, separators=(",", ":")) + "\n")
+    return probe
+
+
+def scan_block_rate(path: Path):
+    totals, blocks = Counter(), Counter()
+    with open(path) as f:
+        for line in f:
+            event = json.loads(line)
+            if event["event_type"] not in ("ALLOW", "BLOCK"):
+                continue
+            key = (event["details"].get("source"), event["timestamp"][:13])
+            totals[key] += 1
+            if event["event_type"] == "BLOCK":
+                blocks[key] += 1
+    return {key: (blocks[key], n, blocks[key] / n) for key, n in totals.items()}
+
+
+def scan_tx(path: Path, prefix: str):
+    with open(path) as f:
+        return [json.loads(line) for line in f if f'"tx_id":"{prefix}' in line]
+
+
+def scan_count(path: Path, source: str, since: str, until: str):
+    n = 0
+    with open(path) as f:
+        for line in f:
+            event = json.loads(line)
+            if (event["event_type"] == "BLOCK" and event["details"].get("source") == source
+                    and since <= event["timestamp"] < until):
+                n += 1
+    return n
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar audit store vs JSONL scans")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--agents", type=int, default=14)
+    parser.add_argument("--segment-rows", type=int, default=250_000)
+    parser.add_argument("--seed", type=int, default=923)
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="bench-audit-store-"))
+    try:
+        log = work / "audit_compliance.jsonl-20260204"
+        probe, elapsed = timed(write_log, log, args.events, args.agents, args.seed)
+        print(f"Log:          {args.events:,} events, {log.stat().st_size / 1e6:.1f} MB (written in {elapsed:.1f} s)")
+
+        stats, elapsed = timed(compact, [str(log)], work / "store", segment_rows=args.segment_rows)
+        size = sum(p.stat().st_size for p in (work / "store").rglob("*") if p.is_file())
+        print(f"Compaction:   {elapsed:.2f} s ({args.events / elapsed:,.0f} events/s), "
+              f"{stats['segments']} segments, {size / 1e6:.1f} MB")
+
+        store = AuditStore(work / "store")
+        since, until = "2026-01-30T00:00:00+00:00", "2026-01-31T00:00:00+00:00"
+        questions = [
+            ("block rate by source/hour",
+             lambda: store.rate(["source", "hour"], {"event_type": "BLOCK"}, event_type=["ALLOW", "BLOCK"]),
+             lambda: scan_block_rate(log)),
+            ("tx_id prefix lookup",
+             lambda: store.tx(probe[:10]),
+             lambda: scan_tx(log, probe[:10])),
+            ("agent blocks in a day",
+             lambda: store.count(event_type="BLOCK", source="AGENT_03", since=since, until=until),
+             lambda: scan_count(log, "AGENT_03", since[:19], until[:19])),
+        ]
+        print(f"{'question':28} {'store ms':>10} {'scan ms':>10} {'speedup':>9}")
+        for name, fast, slow in questions:
+            got, fast_s = timed(fast)
+            want, slow_s = timed(slow)
+            if name.startswith("block rate"):
+                assert got.keys() == want.keys() and all(got[k][:2] == want[k][:2] for k in got), name
+            elif name.startswith("tx_id"):
+                assert [e["tx_id"] for e in got] == [e["details"]["tx_id"] for e in want], name
+            else:
+                assert got == want, (name, got, want)
+            print(f"{name:28} {fast_s * 1e3:>10.2f} {slow_s * 1e3:>10.1f} {slow_s / fast_s:>8.0f}x")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Broker Scaling Benchmark
+Runs CPU-bound agents across 1..N worker processes behind a Broker and
+measures end-to-end message throughput (request -> work -> reply).
+
+Usage:
+  python benchmarks/bench_broker.py --max-workers 4 --messages 4000 --work 20000
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.broker import Broker
+
+
+@dataclass
+class _Card:
+    uuid: str
+    name: str
+
+
+class HashAgent:
+    """CPU-bound stand-in: hashes its payload `rounds` times, then replies."""
+
+    def __init__(self):
+        self.card = _Card(uuid=str(uuid.uuid4()), name="Hash Worker")
+        self.bus = None
+        self.inbox = asyncio.Queue()
+
+    def connect(self, bus):
+        self.bus = bus
+
+    async def receive(self, message):
+        await self.inbox.put(message)
+
+    async def start(self):
+        while True:
+            reply_to, payload, rounds = await self.inbox.get()
+            digest = payload
+            for _ in range(rounds):
+                digest = hashlib.sha256(digest).digest()
+            await self.bus.send(("done", digest), reply_to)
+
+
+class Sink:
+    def __init__(self, expected):
+        self.card = _Card(uuid=str(uuid.uuid4()), name="Bench Sink")
+        self.expected = expected
+        self.count = 0
+        self.done = asyncio.Event()
+
+    def connect(self, bus):
+        pass
+
+    async def receive(self, message):
+        self.count += 1
+        if self.count >= self.expected:
+            self.done.set()
+
+
+async def run(workers: int, messages: int, rounds: int) -> float:
+    broker = Broker(workers=workers)
+    broker.add_agents(HashAgent, count=workers)
+    sink = Sink(messages)
+    broker.bus.register(sink)
+    await broker.start()
+    targets = [aid for aid, agent in broker.bus._agents.items() if agent.card.name == "Hash Worker"]
+
+    start = time.perf_counter()
+    for i in range(messages):
+        await broker.bus.send((sink.card.uuid, i.to_bytes(8, "big"), rounds), targets[i % len(targets)])
+        if i % 256 == 0:
+            await asyncio.sleep(0)
+    await sink.done.wait()
+    elapsed = time.perf_counter() - start
+    await broker.stop()
+    return messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process broker scaling benchmark")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--messages", type=int, default=4000)
+    parser.add_argument("--work", type=int, default=20000, help="sha256 rounds per message")
+    args = parser.parse_args()
+
+    base = None
+    workers = 1
+    while workers <= args.max_workers:
+        rate = asyncio.run(run(workers, args.messages, args.work))
+        base = base or rate
+        print(f"{workers:3d} workers: {rate:10,.0f} msg/s  speedup {rate / base:5.2f}x  efficiency {rate / base / workers:6.1%}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Chunked Cube Benchmark
+Packs a seeded synthetic payload both as a cube-1.0 document (one base64
+gzip stream) and as a chunked cube-1.1 document, then compares:
+
+  random range reads   legacy full decode vs. chunked (pread + one block)
+  full decode          chunked on 1 thread vs. a thread pool
+
+Usage:
+  python benchmarks/bench_cube_chunks.py --size-mb 64 --block-kb 64 --reads 200
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.cube_chunks import ChunkedCube, decode_legacy, write
+
+WORDS = "cube voxel agent mesh sentinel trend barcelona frankfurt seattle ledger drift".split()
+
+
+def make_payload(size: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    rows = []
+    total = 0
+    while total < size:
+        row = json.dumps({"rank": len(rows), "topic": " ".join(rng.choices(WORDS, k=6)),
+                          "score": rng.random(), "id": f"{rng.getrandbits(64):016x}"})
+        rows.append(row)
+        total += len(row) + 2
+    return ("[" + ",\n".join(rows) + "]").encode()[:size]
+
+
+def write_legacy(path: str, payload: bytes):
+    packer = zlib.compressobj(9, zlib.DEFLATED, 31)
+    data = base64.b64encode(packer.compress(payload) + packer.flush()).decode()
+    with open(path, "w") as f:
+        json.dump({"protocol_version": "cube-1.0", "descriptor": "BENCH|CHUNKS|OK",
+                   "cube": {"dimensions": [1, 1, 1], "encoding": "base64", "data": data}}, f)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked vs single-stream cube reads")
+    parser.add_argument("--size-mb", type=float, default=32)
+    parser.add_argument("--block-kb", type=int, default=64)
+    parser.add_argument("--read-kb", type=int, default=4, help="size of each random read")
+    parser.add_argument("--reads", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=923)
+    args = parser.parse_args()
+
+    payload = make_payload(int(args.size_mb * 1024 * 1024), args.seed)
+    work = tempfile.mkdtemp(prefix="bench-chunks-")
+    legacy_path, chunked_path = os.path.join(work, "legacy.cube"), os.path.join(work, "chunked.cube")
+    try:
+        _, legacy_s = timed(write_legacy, legacy_path, payload)
+        _, chunked_s = timed(write, chunked_path, payload, "BENCH|CHUNKS|OK", block_size=args.block_kb * 1024)
+        print(f"Payload:      {len(payload) / 1e6:.1f} MB, blocks of {args.block_kb} KB")
+        print(f"Pack:         legacy {legacy_s:.2f} s ({os.path.getsize(legacy_path) / 1e6:.1f} MB), "
+              f"chunked {chunked_s:.2f} s ({os.path.getsize(chunked_path) / 1e6:.1f} MB)")
+
+        rng = random.Random(args.seed)
+        read_len = args.read_kb * 1024
+        offsets = [rng.randrange(0, len(payload) - read_len) for _ in range(args.reads)]
+
+        def legacy_read(offset):
+            with open(legacy_path) as f:
+                return decode_legacy(json.load(f))[offset:offset + read_len]
+
+        legacy_ms = []
+        for offset in offsets[:max(1, min(10, args.reads))]:
+            data, seconds = timed(legacy_read, offset)
+            assert data == payload[offset:offset + read_len]
+            legacy_ms.append(seconds * 1e3)
+
+        chunked_ms = []
+        for offset in offsets:
+            with ChunkedCube(chunked_path) as cube:
+                data, seconds = timed(cube.read, offset, read_len)
+            assert data == payload[offset:offset + read_len]
+            chunked_ms.append(seconds * 1e3)
+        _, open_s = timed(lambda: ChunkedCube(chunked_path).close())
+        print(f"Random read:  legacy p50 {statistics.median(legacy_ms):.1f} ms, "
+              f"chunked p50 {statistics.median(chunked_ms):.3f} ms "
+              f"(+{open_s * 1e3:.2f} ms header), {args.read_kb} KB each")
+
+        for workers in sorted({1, args.workers}):
+            with ChunkedCube(chunked_path, workers=workers) as cube:
+                data, seconds = timed(cube.read)
+            assert data == payload
+            print(f"Full decode:  {workers:>2} thread(s) {seconds * 1e3:8.1f} ms ({len(payload) / seconds / 1e6:,.0f} MB/s)")
+    finally:
+        for path in (legacy_path, chunked_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(work)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Cube Delta Benchmark
+Publishes a seeded series of minor revisions of one topic through
+cube_versions.VersionStore and compares what a subscriber polling
+/cubes/latest downloads per revision:
+
+  full      the whole gzip payload (base64), as before versioning
+  delta     the precomputed delta from the version it already holds
+
+Also reports raw diff()/patch() throughput on a larger payload.
+
+Usage:
+  python benchmarks/bench_cube_delta.py --rows 2000 --revisions 40
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.cube_delta import diff, patch
+from cube_versions import CubeSubscriber, VersionStore
+
+WORDS = "cube voxel agent mesh sentinel trend barcelona frankfurt seattle ledger drift".split()
+
+
+def make_rows(count: int, rng: random.Random) -> list:
+    return [{"rank": i, "topic": " ".join(rng.choices(WORDS, k=6)), "score": round(rng.random(), 6),
+             "id": f"{rng.getrandbits(64):016x}"} for i in range(count)]
+
+
+def revise(rows: list, rng: random.Random, edits: int):
+    """A minor update: rescore a few rows, replace one, append one."""
+    for _ in range(edits):
+        rng.choice(rows)["score"] = round(rng.random(), 6)
+    rows[rng.randrange(len(rows))] = make_rows(1, rng)[0]
+    rows.append(make_rows(1, rng)[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta vs full cube updates")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--revisions", type=int, default=40)
+    parser.add_argument("--edits", type=int, default=5, help="rows rescored per revision")
+    parser.add_argument("--seed", type=int, default=923)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = make_rows(args.rows, rng)
+    subscriber = CubeSubscriber()
+    full_bytes, delta_bytes, publish_ms, kinds = [], [], [], {"full": 0, "delta": 0}
+    with tempfile.TemporaryDirectory(prefix="bench-delta-") as root:
+        store = VersionStore(Path(root))
+        for _ in range(args.revisions):
+            payload = json.dumps({"topic": "bench", "rows": rows}, indent=2).encode()
+            start = time.perf_counter()
+            entry = store.publish("bench", payload, topic="bench")
+            publish_ms.append((time.perf_counter() - start) * 1e3)
+            kinds[entry["kind"]] += 1
+
+            update = store.latest("bench", subscriber.hashes.get("bench"))
+            assert subscriber.apply(update) == payload
+            if update["kind"] == "delta":
+                delta_bytes.append(len(json.dumps(update)))
+                full_bytes.append(len(json.dumps(store.latest("bench"))))
+            revise(rows, rng, args.edits)
+
+    print(f"Payload:      {len(payload) / 1e3:,.0f} KB, {args.revisions} revisions "
+          f"({kinds['full']} stored full, {kinds['delta']} as deltas)")
+    print(f"Per update:   full {statistics.median(full_bytes) / 1e3:,.1f} KB, "
+          f"delta {statistics.median(delta_bytes) / 1e3:,.2f} KB "
+          f"({statistics.median(full_bytes) / statistics.median(delta_bytes):,.0f}x smaller)")
+    print(f"Publish:      p50 {statistics.median(publish_ms):.1f} ms (store + serve deltas + cube + index)")
+
+    big = json.dumps({"rows": make_rows(args.rows * 10, rng)}).encode()
+    rows = json.loads(big)["rows"]
+    revise(rows, rng, args.edits * 10)
+    target = json.dumps({"rows": rows}).encode()
+    start = time.perf_counter()
+    delta = diff(big, target)
+    diff_s = time.perf_counter() - start
+    start = time.perf_counter()
+    assert patch(big, delta) == target
+    patch_s = time.perf_counter() - start
+    print(f"Throughput:   {len(target) / 1e6:.1f} MB payload, diff {diff_s * 1e3:.1f} ms "
+          f"({len(target) / diff_s / 1e6:,.0f} MB/s), patch {patch_s * 1e3:.1f} ms "
+          f"({len(target) / patch_s / 1e6:,.0f} MB/s), delta {len(delta):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Event Stream Fan-out Benchmark
+Drives an EventHub from a simulated 14-agent bus (state changes plus a burst
+of routed messages per tick) and fans frames out to thousands of local
+subscribers, a share of which read slowly. Reports:
+
+  flush      time to build, encode and fan out one frame
+  delivery   frames and bytes received by fast vs. slow subscribers
+  lag        snapshot resets and the largest queue any subscriber held
+  polling    requests and encodes the same clients would cost polling
+             /api/a2a/agents, for much staler data
+
+With --sockets N, also serves the stream over loopback and checks that N
+real SSE connections each receive every frame.
+
+Usage:
+  python benchmarks/bench_event_stream.py --subscribers 5000 --slow 0.1 --ticks 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.events import EventHub, start_event_server
+
+CAPABILITIES = ["fuzzing", "drift_repair", "value_exchange", "task_decomposition"]
+
+
+class Inbox:
+    def __init__(self):
+        self.depth = 0
+
+    def qsize(self):
+        return self.depth
+
+
+class FakeBus:
+    """Just enough of MessageBus for EventHub.watch(): agents with cards, stats and inboxes."""
+
+    def __init__(self, count: int, rng: random.Random):
+        self._agents = {}
+        for i in range(count):
+            card = SimpleNamespace(name=f"AGENT_{i:02d}", capabilities=rng.sample(CAPABILITIES, 2))
+            stats = {"messages_received": 0, "messages_sent": 0, "compression_ratio": 0.0}
+            self._agents[f"agent-{i:02d}"] = SimpleNamespace(card=card, stats=stats, inbox=Inbox())
+
+    def tick(self, hub: EventHub, rng: random.Random, messages: int):
+        ids = list(self._agents)
+        for _ in range(messages):
+            target = rng.choice(ids)
+            agent = self._agents[target]
+            agent.stats["messages_received"] += 1
+            self._agents[rng.choice(ids)].stats["messages_sent"] += 1
+            agent.inbox.depth = rng.randrange(4)
+            hub.message(object(), target, self)
+        self._agents[rng.choice(ids)].stats["compression_ratio"] = round(rng.uniform(0.6, 0.9), 3)
+
+
+async def run_local(args, rng):
+    bus = FakeBus(args.agents, rng)
+    hub = EventHub(max_pending=args.max_pending)
+    hub.watch(bus)
+    subscribers = [hub.subscribe() for _ in range(args.subscribers)]
+    slow = set(rng.sample(range(args.subscribers), int(args.subscribers * args.slow)))
+    counts = {"fast_frames": 0, "fast_bytes": 0, "slow_frames": 0, "slow_bytes": 0}
+    tick = {"n": 0, "event": asyncio.Event(), "done": False}
+
+    async def reader(subscriber, is_slow):
+        seen = 0
+        while True:
+            if is_slow:
+                # Wake only every `slow_every` ticks, then read one frame
+                while tick["n"] - seen < args.slow_every and not tick["done"]:
+                    tick["event"].clear()
+                    await tick["event"].wait()
+                seen = tick["n"]
+            frame = await subscriber.get()
+            if frame is None:
+                return
+            key = "slow" if is_slow else "fast"
+            counts[key + "_frames"] += 1
+            counts[key + "_bytes"] += len(frame)
+
+    tasks = [asyncio.ensure_future(reader(sub, i in slow)) for i, sub in enumerate(subscribers)]
+    await asyncio.sleep(0)
+    flush_ms, frame_bytes, max_queue = [], [], 0
+    for _ in range(args.ticks):
+        bus.tick(hub, rng, args.messages)
+        start = time.perf_counter()
+        frame = hub.flush()
+        flush_ms.append((time.perf_counter() - start) * 1e3)
+        frame_bytes.append(len(frame))
+        max_queue = max(max_queue, max(len(sub.frames) for sub in subscribers))
+        tick["n"] += 1
+        tick["event"].set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    tick["done"] = True
+    tick["event"].set()
+    for sub in subscribers:
+        sub.close()
+    await asyncio.gather(*tasks)
+
+    fast, n_slow = args.subscribers - len(slow), max(1, len(slow))
+    resets = sum(sub.resets for sub in subscribers)
+    snapshot = len(hub.snapshot())
+    seconds = args.ticks * hub.interval
+    polls = args.subscribers * seconds / args.poll_interval
+    poll_bytes = len(json.dumps(hub.agents())) * polls
+    print(f"Subscribers:  {args.subscribers:,} ({len(slow):,} slow, reading every {args.slow_every} ticks), "
+          f"{args.agents} agents, {args.messages} messages/tick")
+    print(f"Flush:        p50 {statistics.median(flush_ms):.2f} ms, max {max(flush_ms):.2f} ms "
+          f"(frame p50 {int(statistics.median(frame_bytes)):,} B, snapshot {snapshot:,} B)")
+    print(f"Delivery:     fast {counts['fast_frames'] / max(1, fast):.1f} frames/client, "
+          f"slow {counts['slow_frames'] / n_slow:.1f} frames/client of {args.ticks}")
+    print(f"Lag:          {resets:,} snapshot resets, largest queue {max_queue} frames (cap {args.max_pending})")
+    print(f"Server work:  push {hub.stats['frames']} frame + {hub.stats['snapshots']} snapshot encodes, "
+          f"{counts['fast_bytes'] / max(1, fast) / seconds / 1e3:.1f} KB/s per client, <= {hub.interval:.2f} s stale; "
+          f"polling every {args.poll_interval:.0f} s: {polls:,.0f} requests/encodes, "
+          f"{poll_bytes / args.subscribers / seconds / 1e3:.1f} KB/s per client, <= {args.poll_interval:.0f} s stale, "
+          f"no activity events")
+
+
+async def run_sockets(args, rng):
+    bus = FakeBus(args.agents, rng)
+    hub = EventHub()
+    hub.watch(bus)
+    server = await start_event_server(hub, port=0, host="127.0.0.1")
+    port = server.sockets[0].getsockname()[1]
+
+    async def client(received: list):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /api/a2a/events HTTP/1.1\r\nHost: bench\r\n\r\n")
+        await reader.readuntil(b"\r\n\r\n")
+        try:
+            while True:
+                block = await reader.readuntil(b"\n\n")
+                if block.startswith(b"id: "):
+                    received.append(int(block[4:block.index(b"\n")]))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    received = [[] for _ in range(args.sockets)]
+    clients = [asyncio.ensure_future(client(r)) for r in received]
+    while len(hub) < args.sockets:
+        await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        bus.tick(hub, rng, args.messages)
+        hub.flush()
+        await asyncio.sleep(0.001)
+    while min(r[-1] if r else 0 for r in received) < hub.seq and time.perf_counter() - start < 30:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    complete = sum(1 for r in received if r and r[-1] == hub.seq)
+    server.close()
+    hub.close()
+    await asyncio.gather(*clients, return_exceptions=True)
+    await server.wait_closed()
+    print(f"Sockets:      {complete}/{args.sockets} SSE clients reached seq {hub.seq} "
+          f"in {elapsed:.2f} s ({args.sockets * args.ticks / elapsed:,.0f} frames/s delivered)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EventHub fan-out to many subscribers")
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--slow", type=float, default=0.1, help="share of subscribers that read slowly")
+    parser.add_argument("--slow-every", type=int, default=50, help="ticks between reads of a slow subscriber")
+    parser.add_argument("--max-pending", type=int, default=32)
+    parser.add_argument("--agents", type=int, default=14)
+    parser.add_argument("--messages", type=int, default=40, help="routed messages per tick")
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="dashboard polling period to compare against")
+    parser.add_argument("--sockets", type=int, default=0, help="also stream to N loopback SSE connections")
+    parser.add_argument("--seed", type=int, default=923)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    asyncio.run(run_local(args, rng))
+    if args.sockets:
+        asyncio.run(run_sockets(args, rng))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Governance Benchmark
+Measures GovernanceService.check_operation throughput with N concurrent
+thread workers, each checking a mix of agents and call chains.
+
+Usage:
+  python benchmarks/bench_governance.py --workers 32 --ops 20000
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.governance import GovernanceService
+
+
+def run(workers: int, ops: int, agents: int) -> float:
+    service = GovernanceService(budget_limit=float("inf"), window_limit=float("inf"), rate_limit=1e12, burst=1e12)
+    barrier = threading.Barrier(workers + 1)
+
+    def worker(wid):
+        headers = {"x-a2a-context-id": f"ctx-{wid}", "x-a2a-hop-count": "1"}
+        names = [f"AGENT_{(wid + i) % agents:02d}" for i in range(agents)]
+        barrier.wait()
+        for i in range(ops):
+            service.check_operation(names[i % agents], 0.001, headers)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(workers)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GovernanceService throughput benchmark")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=20000, help="checks per worker")
+    parser.add_argument("--agents", type=int, default=14)
+    args = parser.parse_args()
+
+    single = run(1, args.ops, args.agents)
+    elapsed = run(args.workers, args.ops, args.agents)
+    total = args.workers * args.ops
+    print(f"1 worker:            {args.ops / single:,.0f} checks/sec ({single / args.ops * 1e6:.2f} us/check)")
+    print(f"{args.workers} workers:          {total / elapsed:,.0f} checks/sec ({elapsed / total * 1e6:.2f} us/check)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Import-Time Benchmark
+Runs `python -X importtime` in fresh interpreters and reports the cumulative
+import cost of the agents package, plus wall-clock time-to-first-message for a
+cold process. Exits non-zero when a budget is exceeded so CI can gate on it.
+
+Usage:
+  python benchmarks/bench_import_time.py --module agents --budget-ms 5
+  python benchmarks/bench_import_time.py --module agents.platform --first-message
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+FIRST_MESSAGE_SNIPPET = """
+import asyncio
+from agents import BaseAgent, MessageBus, TaskRequest
+
+async def main():
+    bus = MessageBus()
+    agent = BaseAgent(name="Cold Start", description="benchmark")
+    bus.register(agent)
+    await bus.send(TaskRequest(requester_id="bench", content="ping"), agent.card.uuid)
+    await agent.inbox.get()
+
+asyncio.run(main())
+"""
+
+
+def parse_importtime(stderr: str, module: str) -> dict:
+    """Return {'cumulative_us': ..., 'top': [(us, name), ...]} from -X importtime output."""
+    cumulative = None
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # header row
+        cum_us, name = int(fields[1]), fields[2].strip()
+        rows.append((cum_us, name))
+        if name == module:
+            cumulative = cum_us
+    rows.sort(reverse=True)
+    return {"cumulative_us": cumulative, "top": rows[:10]}
+
+
+def measure_import(module: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return parse_importtime(proc.stderr, module)
+
+
+def measure_first_message() -> float:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", FIRST_MESSAGE_SNIPPET], cwd=ROOT_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument("--module", default="agents")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if median import exceeds this")
+    parser.add_argument("--first-message", action="store_true", help="also time a fresh process to its first delivered message")
+    args = parser.parse_args()
+
+    samples = [measure_import(args.module) for _ in range(args.runs)]
+    median_ms = statistics.median(s["cumulative_us"] or 0 for s in samples) / 1000
+
+    print(f"Module:        {args.module}")
+    print(f"Import median: {median_ms:.2f} ms over {args.runs} runs")
+    print("Slowest imports (last run):")
+    for cum_us, name in samples[-1]["top"]:
+        print(f"  {cum_us / 1000:8.2f} ms  {name}")
+
+    if args.first_message:
+        wall = statistics.median(measure_first_message() for _ in range(args.runs))
+        print(f"Time to first message: {wall * 1000:.1f} ms (fresh interpreter)")
+
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        print(f"FAIL: {median_ms:.2f} ms exceeds budget of {args.budget_ms:.2f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
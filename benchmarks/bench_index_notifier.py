@@ -0,0 +1,117 @@
+"""
+Index Notifier Benchmark
+Runs IndexNotifier against a local keep-alive stub of the Indexing API that
+answers single and batch publishes and throttles every Nth request with a
+429, then reports throughput and retry counts.
+
+Usage:
+  python benchmarks/bench_index_notifier.py --urls 10000 --throttle-every 25
+"""
+import argparse
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from index_notifier import IndexNotifier
+
+ITEM_RE = re.compile(rb"Content-ID: <item(\d+)>")
+
+
+class StubIndexingServer:
+    """Minimal HTTP/1.1 keep-alive server speaking the publish and batch endpoints."""
+
+    def __init__(self, throttle_every: int = 0, retry_after: float = 0.05):
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.notifications = 0
+        self.connections = 0
+        self.server = None
+
+    async def start(self, host: str = "127.0.0.1") -> int:
+        self.server = await asyncio.start_server(self._handle, host, 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b""
+                writer.write(self._respond(request_line, body))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, request_line: bytes, body: bytes) -> bytes:
+        self.requests += 1
+        if self.throttle_every and self.requests % self.throttle_every == 0:
+            return _http(429, b'{"error":"rate limited"}', "application/json", {"Retry-After": str(self.retry_after)})
+        if b"/batch" in request_line:
+            items = ITEM_RE.findall(body)
+            self.notifications += len(items)
+            boundary = "batch_stub"
+            parts = [
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-item{i.decode()}>\r\n\r\n"
+                f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{{}}\r\n"
+                for i in items
+            ]
+            payload = ("".join(parts) + f"--{boundary}--\r\n").encode()
+            return _http(200, payload, f"multipart/mixed; boundary={boundary}")
+        self.notifications += 1
+        return _http(200, b"{}", "application/json")
+
+
+def _http(status: int, body: bytes, content_type: str, extra: dict = None) -> bytes:
+    reason = {200: "OK", 429: "Too Many Requests"}[status]
+    headers = [f"HTTP/1.1 {status} {reason}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}"]
+    headers += [f"{k}: {v}" for k, v in (extra or {}).items()]
+    return ("\r\n".join(headers) + "\r\n\r\n").encode() + body
+
+
+async def run(args):
+    server = StubIndexingServer(throttle_every=args.throttle_every)
+    port = await server.start()
+    base = f"http://127.0.0.1:{port}"
+    notifier = IndexNotifier(
+        "stub-token", "0" * 64,
+        concurrency=args.concurrency, rate=args.rate, batch_size=args.batch_size,
+        publish_endpoint=f"{base}/v3/urlNotifications:publish", batch_endpoint=f"{base}/batch",
+    )
+    urls = [f"https://philhills.ai/cubes/topic-{i:06d}.html" for i in range(args.urls)]
+    report = await notifier.notify(urls)
+    await server.stop()
+
+    print(report)
+    print(f"Stub:       {server.requests} requests, {server.notifications} notifications, {server.connections} connections")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index notifier benchmark against a local stub server")
+    parser.add_argument("--urls", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=10000.0, help="notifications per second")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--throttle-every", type=int, default=25, help="answer every Nth request with 429 (0 = never)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Market Engine Benchmark
+Generates seeded synthetic order flow (per-capability random-walk mid prices,
+mixed bids/asks, partial fills, a share of cancels) and replays it through
+MarketEngine in batches, reporting orders/sec, fills and batch latency.
+
+Usage:
+  python benchmarks/bench_market.py --orders 500000 --batch 256
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.market import ASK, BID, STANDARD_RATE, Ledger, MarketEngine
+
+TICK = 1e-6
+
+
+def make_flow(count: int, capabilities: int = 8, agents: int = 64, cancel_ratio: float = 0.03, seed: int = 923):
+    """List of ("submit", side, owner, capability, qty, price) / ("cancel", back) events."""
+    rng = random.Random(seed)
+    caps = [f"capability_{i}" for i in range(capabilities)]
+    owners = [f"AGENT_{i:02d}" for i in range(agents)]
+    mids = {cap: STANDARD_RATE for cap in caps}
+    flow = []
+    for _ in range(count):
+        if rng.random() < cancel_ratio:
+            flow.append(("cancel", rng.randint(1, 64)))
+            continue
+        cap = rng.choice(caps)
+        mids[cap] = max(TICK * 10, mids[cap] * (1 + rng.gauss(0, 0.001)))
+        side = BID if rng.random() < 0.5 else ASK
+        skew = -1 if side == BID else 1
+        price = round(mids[cap] * (1 + skew * abs(rng.gauss(0, 0.01)) - skew * 0.005) / TICK) * TICK
+        flow.append(("submit", side, rng.choice(owners), cap, rng.randint(1, 500), max(TICK, price)))
+    return flow, owners
+
+
+def replay(flow, owners, batch: int):
+    engine = MarketEngine(Ledger({owner: 1e12 for owner in owners}))
+    submit, match, cancel = engine.submit, engine.match, engine.cancel
+    fills = 0
+    batch_ns = []
+    placed = []
+    start = time.perf_counter()
+    pending = 0
+    t0 = time.perf_counter_ns()
+    for event in flow:
+        if event[0] == "submit":
+            placed.append(submit(*event[1:]).id)
+        elif placed:
+            cancel(placed[-min(event[1], len(placed))])
+        pending += 1
+        if pending == batch:
+            fills += len(match())
+            now = time.perf_counter_ns()
+            batch_ns.append(now - t0)
+            t0, pending = now, 0
+    fills += len(match())
+    elapsed = time.perf_counter() - start
+    return engine, fills, elapsed, batch_ns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order-book matching engine benchmark")
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=256, help="orders submitted between match() calls")
+    parser.add_argument("--capabilities", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=923)
+    args = parser.parse_args()
+
+    flow, owners = make_flow(args.orders, args.capabilities, seed=args.seed)
+    engine, fills, elapsed, batch_ns = replay(flow, owners, args.batch)
+    batch_ns.sort()
+    open_orders = len(engine.orders)
+
+    print(f"Orders:       {len(flow):,} ({args.capabilities} books, batch {args.batch})")
+    print(f"Elapsed:      {elapsed:.3f} s")
+    print(f"Throughput:   {len(flow) / elapsed:,.0f} orders/s")
+    print(f"Fills:        {fills:,} ({fills / elapsed:,.0f}/s), open orders {open_orders:,}")
+    if batch_ns:
+        print(f"Batch p50:    {batch_ns[len(batch_ns) // 2] / 1e3:.1f} us, p99 {batch_ns[int(len(batch_ns) * 0.99)] / 1e3:.1f} us")
+    print(f"Fees:         {engine.ledger.fees:.4f} credits over {engine.ledger.settlements:,} settlements")
+
+
+if __name__ == "__main__":
+    main()
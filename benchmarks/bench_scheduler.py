@@ -0,0 +1,140 @@
+"""
+Task Scheduler Benchmark
+Simulates the 14-agent swarm (the six registry agents plus elastic agents
+06-13 offering overlapping capabilities at different prices and speeds) as
+single-server FIFO queues and routes a seeded Poisson task stream with three
+policies:
+
+  first_match  the first capable agent in registry order (today's name match)
+  cheapest     lowest cost_per_token, ignoring load
+  scheduler    TaskScheduler: cost weighted by inbox depth and latency, spill-over
+
+Reports total cost, p50/p99 task latency (queue wait + service) in simulated
+seconds, spill-over counts and the wall-clock cost of each routing decision.
+
+Usage:
+  python benchmarks/bench_scheduler.py --tasks 100000 --load 0.5 0.8 1.2
+"""
+import argparse
+import heapq
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.scheduler import TaskScheduler, load_registry
+
+# Elastic agents 06-13: (capabilities offered, cost_per_token multiplier, speed multiplier)
+ELASTIC = [
+    ("fuzzing vulnerability_scanning", 1.3, 1.5),
+    ("drift_repair auto_patching", 1.25, 1.4),
+    ("value_exchange ledger_management", 2.0, 2.0),
+    ("task_decomposition goal_negotiation", 1.5, 1.6),
+    ("fuzzing drift_repair", 1.8, 2.2),
+    ("architectural_review provenance_signing", 0.8, 0.7),
+    ("reputation_defense identity_lock value_exchange", 1.6, 1.8),
+    ("task_decomposition vulnerability_scanning auto_patching", 2.2, 2.5),
+]
+TOKENS_PER_SECOND = 4000      # base agent throughput; elastic agents scale it by their speed
+
+
+def swarm(seed: int):
+    """[(id, capabilities, cost_per_token, tokens/sec)] in registry order."""
+    rng = random.Random(seed)
+    agents = []
+    for entry in load_registry()["agents"]:
+        agents.append((entry["id"], entry["capabilities"], entry["cost_per_token"],
+                       TOKENS_PER_SECOND * rng.uniform(0.8, 1.2)))
+    base_cost = sum(a[2] for a in agents) / len(agents)
+    for i, (caps, cost, speed) in enumerate(ELASTIC, start=len(agents)):
+        agents.append((f"AGENT_{i:02d}", caps.split(), round(base_cost * cost * rng.uniform(0.9, 1.1), 5),
+                       TOKENS_PER_SECOND * speed))
+    return agents
+
+
+def workload(agents, count: int, load: float, seed: int):
+    """Poisson arrivals sized so that `load` is the offered/total service capacity ratio."""
+    rng = random.Random(seed)
+    capabilities = sorted({c for _, caps, _, _ in agents for c in caps})
+    mean_tokens = 600
+    capacity = sum(speed for *_, speed in agents)
+    rate = load * capacity / mean_tokens              # tasks per simulated second
+    now, tasks = 0.0, []
+    for _ in range(count):
+        now += rng.expovariate(rate)
+        tasks.append((now, rng.choice(capabilities), max(1, int(rng.expovariate(1 / mean_tokens)))))
+    return tasks
+
+
+def simulate(agents, tasks, policy: str):
+    by_id = {a[0]: a for a in agents}
+    first = {}
+    cheapest = {}
+    for agent_id, caps, cost, _ in agents:
+        for cap in caps:
+            first.setdefault(cap, agent_id)
+            if cap not in cheapest or cost < by_id[cheapest[cap]][2]:
+                cheapest[cap] = agent_id
+    scheduler = TaskScheduler()
+    for agent_id, caps, cost, _ in agents:
+        scheduler.add_agent(agent_id, caps, cost)
+
+    free_at = {a[0]: 0.0 for a in agents}
+    completions = []                  # (finish time, agent id, service seconds)
+    latencies, total_cost, decide_ns = [], 0.0, 0
+    for arrival, capability, tokens in tasks:
+        while completions and completions[0][0] <= arrival:
+            _, done_id, service = heapq.heappop(completions)
+            scheduler.complete(done_id, service)
+        t0 = time.perf_counter_ns()
+        if policy == "first_match":
+            agent_id = first[capability]
+        elif policy == "cheapest":
+            agent_id = cheapest[capability]
+        else:
+            agent_id = scheduler.schedule(capability, tokens)
+        decide_ns += time.perf_counter_ns() - t0
+
+        _, _, cost, speed = by_id[agent_id]
+        service = tokens / speed
+        finish = max(arrival, free_at[agent_id]) + service
+        free_at[agent_id] = finish
+        if policy != "scheduler":
+            scheduler.agents[agent_id].depth += 1
+        heapq.heappush(completions, (finish, agent_id, service))
+        latencies.append(finish - arrival)
+        total_cost += tokens * cost
+    latencies.sort()
+    return {
+        "cost": total_cost,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "spilled": scheduler.stats["spilled"] + scheduler.stats["saturated"] if policy == "scheduler" else 0,
+        "decision_us": decide_ns / len(tasks) / 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduler vs first-match routing on simulated workloads")
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--load", type=float, nargs="+", default=[0.3, 0.6, 0.9],
+                        help="offered load as a fraction of total swarm capacity")
+    parser.add_argument("--seed", type=int, default=923)
+    args = parser.parse_args()
+
+    agents = swarm(args.seed)
+    print(f"Swarm: {len(agents)} agents, {len({c for _, caps, _, _ in agents for c in caps})} capabilities, "
+          f"{args.tasks:,} tasks per run")
+    print(f"{'load':>5} {'policy':12} {'cost':>12} {'p50 s':>10} {'p99 s':>10} {'spilled':>8} {'us/decision':>12}")
+    for load in args.load:
+        tasks = workload(agents, args.tasks, load, args.seed)
+        for policy in ("first_match", "cheapest", "scheduler"):
+            r = simulate(agents, tasks, policy)
+            print(f"{load:>5.2f} {policy:12} {r['cost']:>12.2f} {r['p50']:>10.3f} {r['p99']:>10.3f} "
+                  f"{r['spilled']:>8,} {r['decision_us']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Shared-Memory Transport Benchmark
+Moves 1 MB - 100 MB payloads to a second process and compares a ShmRing
+reference (CubeRef over a pipe, zero-copy view on the receiver) against
+pickling the payload over a socket-backed multiprocessing Pipe.
+
+Usage:
+  python benchmarks/bench_shm.py --sizes 1 10 100 --repeats 5 [--hash]
+"""
+import argparse
+import hashlib
+import multiprocessing
+import os
+import pickle
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.shm_transport import ShmRing, resolve
+
+MB = 1024 * 1024
+
+
+def _consume(buffer, do_hash: bool):
+    if do_hash:
+        return hashlib.sha256(buffer).hexdigest()
+    return len(buffer)
+
+
+def receiver(conn, do_hash: bool):
+    while True:
+        kind, data = conn.recv()
+        if kind == "stop":
+            return
+        if kind == "ref":
+            with resolve(data) as payload:
+                result = _consume(payload.view, do_hash)
+                payload.check()
+        else:
+            result = _consume(pickle.loads(conn.recv_bytes()), do_hash)
+        conn.send(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ShmRing vs pickle/socket transfer benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="payload sizes in MB")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--hash", action="store_true", help="receiver hashes the payload (same cost both ways)")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe()
+    proc = ctx.Process(target=receiver, args=(child, args.hash), daemon=True)
+    proc.start()
+    ring = ShmRing.create(capacity=2 * max(args.sizes) * MB + MB)
+
+    print(f"{'size':>8} {'shm ref':>12} {'pickle/pipe':>14} {'speedup':>9}")
+    try:
+        for size_mb in args.sizes:
+            payload = os.urandom(size_mb * MB)
+            shm_times, pipe_times = [], []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                parent.send(("ref", ring.put(payload)))
+                parent.recv()
+                shm_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                parent.send(("pickle", None))
+                parent.send_bytes(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+                parent.recv()
+                pipe_times.append(time.perf_counter() - start)
+            shm_ms = statistics.median(shm_times) * 1000
+            pipe_ms = statistics.median(pipe_times) * 1000
+            print(f"{size_mb:>6}MB {shm_ms:>10.2f}ms {pipe_ms:>12.2f}ms {pipe_ms / shm_ms:>8.1f}x")
+    finally:
+        parent.send(("stop", None))
+        proc.join()
+        ring.close()
+
+
+if __name__ == "__main__":
+    main()
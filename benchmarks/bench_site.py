@@ -0,0 +1,64 @@
+"""
+Site Builder Benchmark
+Builds a synthetic cubes/ tree and times a cold render of every page against
+an unchanged rebuild and a rebuild after a single publish.
+
+Usage:
+  python benchmarks/bench_site.py --cubes 50000
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from build_site import TEMPLATES, build_site
+
+
+def make_site(root: Path, count: int):
+    (root / "cubes").mkdir()
+    (root / "projects").mkdir()
+    for name in TEMPLATES:
+        shutil.copy(ROOT / "projects" / name, root / "projects" / name)
+    shutil.copy(ROOT / "sitemap.xml", root / "sitemap.xml")
+    for i in range(count):
+        write_cube(root, i, "2025-12-09T18:44:29")
+
+
+def write_cube(root: Path, i: int, created: str):
+    cube = {
+        "protocol_version": "identity-cube-1.0",
+        "identity": {"subject": f"topic {i}", "author": "Phil Hills", "created": created,
+                     "type": "software" if i % 10 == 0 else "trending_topic_summary"},
+        "content": {"topic": f"topic {i}", "summary": f"Summary paragraph for topic {i}.\n\n" * 6},
+    }
+    with open(root / "cubes" / f"topic-{i:06d}.json", "w") as f:
+        json.dump(cube, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Static site builder benchmark")
+    parser.add_argument("--cubes", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_site(root, args.cubes)
+        cold = build_site(root, workers=args.workers)
+        warm = build_site(root, workers=args.workers)
+        write_cube(root, 0, "2026-01-01T00:00:00")
+        one = build_site(root, workers=args.workers)
+
+    print(f"Pages:              {cold['pages']}")
+    print(f"Cold build:         {cold['elapsed_ms']:.1f} ms (rendered {cold['rendered']})")
+    print(f"Unchanged re-run:   {warm['elapsed_ms']:.1f} ms (rendered {warm['rendered']})")
+    print(f"One cube published: {one['elapsed_ms']:.1f} ms (rendered {one['rendered']})")
+
+
+if __name__ == "__main__":
+    main()
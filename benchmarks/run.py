@@ -0,0 +1,354 @@
+"""
+Benchmark Suite - Hot paths of the agent mesh.
+
+Every benchmark uses a fixed seed and reports operations/sec. Results can be
+saved as a JSON baseline and later runs fail (exit 1) when any benchmark
+regresses by more than --threshold against that baseline.
+
+Benchmarks whose dependencies are not installed (q-protocol, the platform
+transport modules) are reported as skipped rather than failing the run.
+
+Usage:
+  python benchmarks/run.py                         # run and compare to baselines.json
+  python benchmarks/run.py --save-baseline         # record a new baseline
+  python benchmarks/run.py --only interleave_3d --threshold 0.1
+"""
+import argparse
+import asyncio
+import atexit
+import contextlib
+import io
+import json
+import logging
+import platform as host_platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+SEED = 923
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark setup when its dependencies are unavailable."""
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark. The decorated function receives a seeded Random,
+    does its setup, and returns a zero-argument callable that runs one batch
+    and returns the number of operations performed.
+    """
+    def wrap(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return wrap
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+@benchmark("interleave_3d")
+def bench_interleave(rng):
+    from core.interleave import interleave_3d
+    coords = [(rng.getrandbits(21), rng.getrandbits(21), rng.getrandbits(21)) for _ in range(2000)]
+
+    def batch():
+        for x, y, d in coords:
+            interleave_3d(x, y, d)
+        return len(coords)
+    return batch
+
+
+@benchmark("revenue_swarm_cycle")
+def bench_revenue_cycle(rng):
+    from agents.revenue_extraction import RevenueSwarm
+    logging.disable(logging.INFO)
+    random.seed(rng.random())
+    swarm = RevenueSwarm()
+
+    def batch():
+        for _ in range(50):
+            swarm.execute_cycle()
+        return 50
+    return batch
+
+
+@benchmark("market_order_flow")
+def bench_market(rng):
+    from agents.market import ASK, BID, STANDARD_RATE, Ledger, MarketEngine
+    owners = [f"AGENT_{i:02d}" for i in range(14)]
+    caps = ["fuzzing", "drift_repair", "value_exchange", "task_decomposition"]
+    orders = [
+        (BID if rng.random() < 0.5 else ASK, rng.choice(owners), rng.choice(caps),
+         rng.randint(1, 500), round(STANDARD_RATE * rng.uniform(0.95, 1.05), 6))
+        for _ in range(2000)
+    ]
+    engine = MarketEngine(Ledger({owner: 1e12 for owner in owners}))
+
+    def batch():
+        engine.submit_many(orders)
+        engine.cancel_open()
+        return len(orders)
+    return batch
+
+
+@benchmark("scheduler_decision")
+def bench_scheduler(rng):
+    from agents.scheduler import TaskScheduler
+    caps = ["fuzzing", "drift_repair", "value_exchange", "task_decomposition"]
+    scheduler = TaskScheduler()
+    for i in range(14):
+        scheduler.add_agent(f"AGENT_{i:02d}", rng.sample(caps, 2), round(rng.uniform(0.001, 0.005), 4))
+    requests = [rng.choice(caps) for _ in range(2000)]
+
+    def batch():
+        schedule, complete = scheduler.schedule, scheduler.complete
+        for capability in requests:
+            complete(schedule(capability), 0.05)
+        return len(requests)
+    return batch
+
+
+@benchmark("compliance_audit_transaction")
+def bench_compliance_audit(rng):
+    import compliance_sentinel
+    from compliance_sentinel import AgentTransaction, ComplianceSentinel
+
+    log_dir = tempfile.mkdtemp(prefix="bench-audit-")
+    atexit.register(shutil.rmtree, log_dir, True)
+    compliance_sentinel.AUDIT_LOG_PATH = Path(log_dir) / "audit_compliance.jsonl"
+    with contextlib.redirect_stdout(io.StringIO()):
+        sentinel = ComplianceSentinel()
+    actions = ["balance_query", "send_notification", "shell_exec", "data_export"]
+    txs = [
+        AgentTransaction(
+            tx_id=f"{rng.getrandbits(256):064x}",
+            source_agent=f"AGENT_{rng.randrange(14):02d}",
+            target_agent=f"AGENT_{rng.randrange(14):02d}",
+            action=rng.choice(actions),
+            payload_size=rng.randrange(1, 2_000_000),
+            protocol=rng.choice(["Q-Protocol/1.2", "A2AC/1.0", "HTTP/1.1"]),
+            signature=rng.choice([None, "sig"]),
+        )
+        for _ in range(500)
+    ]
+
+    def batch():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for tx in txs:
+                sentinel.audit_transaction(tx)
+        return len(txs)
+    return batch
+
+
+@benchmark("compliance_handshake")
+def bench_compliance_handshake(rng):
+    import compliance_sentinel
+    from compliance_sentinel import ComplianceSentinel
+    from core.handshake import pair_key
+
+    log_dir = tempfile.mkdtemp(prefix="bench-handshake-")
+    atexit.register(shutil.rmtree, log_dir, True)
+    compliance_sentinel.AUDIT_LOG_PATH = Path(log_dir) / "audit_compliance.jsonl"
+    with contextlib.redirect_stdout(io.StringIO()):
+        sentinel = ComplianceSentinel()
+    pairs = [(f"AGENT_{rng.randrange(14):02d}", f"AGENT_{rng.randrange(14):02d}") for _ in range(2000)]
+    tokens = {}
+
+    def batch():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for agent_a, agent_b in pairs:
+                key = pair_key(agent_a, agent_b)
+                tokens[key] = sentinel.verify_handshake(agent_a, agent_b, tokens.get(key)) or tokens.get(key)
+        return len(pairs)
+    return batch
+
+
+def _platform():
+    try:
+        from agents import platform as agent_platform
+    except ImportError as e:
+        raise SkipBenchmark(f"agents.platform unavailable: {e}")
+    return agent_platform
+
+
+@benchmark("message_bus_send")
+def bench_message_bus(rng):
+    agent_platform = _platform()
+    logging.disable(logging.INFO)
+    bus = agent_platform.MessageBus()
+    agents = [agent_platform.BaseAgent(name=f"Bench {i}", description="bench") for i in range(14)]
+    for agent in agents:
+        bus.register(agent)
+    targets = [rng.choice(agents).card.uuid for _ in range(2000)]
+    packet = {"headers": {"x-a2a-sender": "bench"}, "body": {"intent": "BENCH|PING", "payload": {}}}
+    loop = asyncio.new_event_loop()
+
+    async def send_all():
+        for target in targets:
+            await bus.send(packet, target)
+        for agent in agents:
+            while not agent.inbox.empty():
+                agent.inbox.get_nowait()
+        bus._history.clear()
+
+    def batch():
+        loop.run_until_complete(send_all())
+        return len(targets)
+    return batch
+
+
+def _compression_agent(rng):
+    agent_platform = _platform()
+    if not agent_platform.CUBE_AVAILABLE:
+        raise SkipBenchmark("q-protocol not installed")
+    logging.disable(logging.INFO)
+    agent = agent_platform.BaseAgent(name="Bench Codec", description="bench")
+    payload = {"topic": "barcelona - frankfurt", "rows": [{"rank": i, "score": rng.random()} for i in range(50)]}
+    return agent, payload
+
+
+@benchmark("base_agent_compress")
+def bench_compress(rng):
+    agent, payload = _compression_agent(rng)
+
+    def batch():
+        for _ in range(200):
+            agent.compress_message(payload, "BENCH", "COMPRESS", "OK")
+        return 200
+    return batch
+
+
+@benchmark("base_agent_decompress")
+def bench_decompress(rng):
+    agent, payload = _compression_agent(rng)
+    message = agent.compress_message(payload, "BENCH", "COMPRESS", "OK")
+
+    def batch():
+        for _ in range(200):
+            agent.decompress_message(message)
+        return 200
+    return batch
+
+
+@benchmark("cube_transport_roundtrip")
+def bench_cube_transport(rng):
+    agent_platform = _platform()
+    from agents.protocol import CubeTransport
+    requests = [agent_platform.TaskRequest(requester_id="bench", content=f"topic {rng.random()}") for _ in range(200)]
+
+    def batch():
+        for request in requests:
+            CubeTransport.unpack(CubeTransport.pack(request, from_agent="bench"))
+        return len(requests)
+    return batch
+
+
+# ============================================================================
+# HARNESS
+# ============================================================================
+
+def run_benchmark(name: str, repeats: int, min_time: float) -> dict:
+    rng = random.Random(f"{SEED}:{name}")
+    try:
+        batch = BENCHMARKS[name](rng)
+    except SkipBenchmark as e:
+        return {"name": name, "skipped": str(e)}
+
+    batch()  # warmup
+    rates = []
+    for _ in range(repeats):
+        ops, start = 0, time.perf_counter()
+        while True:
+            ops += batch()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        rates.append(ops / elapsed)
+    return {
+        "name": name,
+        "ops_per_sec": round(statistics.median(rates), 1),
+        "best_ops_per_sec": round(max(rates), 1),
+        "us_per_op": round(1e6 / statistics.median(rates), 3),
+    }
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Names of benchmarks whose median throughput fell more than `threshold` below baseline."""
+    regressions = []
+    for result in results:
+        base = baseline.get("results", {}).get(result["name"])
+        if "ops_per_sec" not in result or not base:
+            continue
+        change = result["ops_per_sec"] / base["ops_per_sec"] - 1
+        result["vs_baseline"] = round(change, 4)
+        if change < -threshold:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent mesh benchmark suite")
+    parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed fractional slowdown")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+
+    names = args.only or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = [run_benchmark(name, args.repeats, args.min_time) for name in names]
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = [] if args.save_baseline else compare(results, baseline, args.threshold)
+
+    print(f"{'benchmark':32} {'ops/sec':>14} {'us/op':>10} {'vs base':>9}")
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['name']:32} {'skipped':>14}   {r['skipped']}")
+            continue
+        delta = f"{r['vs_baseline'] * 100:+.1f}%" if "vs_baseline" in r else "-"
+        print(f"{r['name']:32} {r['ops_per_sec']:>14,.1f} {r['us_per_op']:>10.3f} {delta:>9}")
+
+    report = {
+        "seed": SEED,
+        "python": host_platform.python_version(),
+        "machine": host_platform.machine(),
+        "results": {r["name"]: r for r in results if "ops_per_sec" in r},
+    }
+    if args.output:
+        args.output.write_text(json.dumps({**report, "skipped": [r for r in results if "skipped" in r]}, indent=2))
+    if args.save_baseline:
+        merged = {**baseline, **report, "results": {**baseline.get("results", {}), **report["results"]}}
+        args.baseline.write_text(json.dumps(merged, indent=2) + "\n")
+        print(f"Baseline saved: {args.baseline}")
+
+    if regressions:
+        print(f"REGRESSION (> {args.threshold:.0%} slower): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Provenance Builder: Multi-Subject Site Attestation
+Walks the site tree, hashes every published artifact in parallel and emits a
+provenance document with one subject per file plus a Merkle root.
+
+Only files whose (size, mtime) changed since the last run are rehashed; the
+digest cache is persisted next to the provenance output.
+
+Usage:
+  python build_provenance.py [--root .] [--workers 8]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROVENANCE_DIR = Path("data/provenance")
+OUTPUT_PATH = PROVENANCE_DIR / "latest_provenance.json"
+CACHE_PATH = PROVENANCE_DIR / ".digest_cache.json"
+SIGNATURE_PATH = PROVENANCE_DIR / "latest_provenance.sig"
+BUILD_TYPE = "https://philhills.ai/q-protocol/v1.2/provenance"
+
+ATTESTED_SUFFIXES = {".html", ".voxel", ".cube", ".json", ".js", ".txt", ".xml", ".md", ".sig", ".token", ".jpg", ".png"}
+SKIP_DIRS = {".git", ".github", "__pycache__", ".pytest_cache", ".venv", "venv", "node_modules"}
+# The provenance output must not attest itself, nor the signatures made over it
+# (every re-sign would change the next root and leave the signature stale)
+SKIP_FILES = {OUTPUT_PATH.as_posix(), CACHE_PATH.as_posix(), SIGNATURE_PATH.as_posix()}
+SIGNATURE_SUFFIXES = {".sig"}
+
+READ_CHUNK = 1 << 20          # buffered read size for small files
+MMAP_THRESHOLD = 1 << 20      # files above this size are hashed straight from an mmap
+
+
+# ============================================================================
+# HASHING
+# ============================================================================
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file. hashlib releases the GIL, so threads hash in parallel."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        else:
+            while chunk := f.read(READ_CHUNK):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _try_hash(path: Path):
+    """Digest of `path`, or None if it was deleted or became unreadable after the walk."""
+    try:
+        return hash_file(path)
+    except (FileNotFoundError, PermissionError, IsADirectoryError):
+        return None
+
+
+def merkle_root(subjects: list) -> str:
+    """
+    Merkle root over sorted subjects. Leaves and nodes are domain-separated
+    (0x00 / 0x01 prefixes); an odd node is promoted unchanged to the next level.
+    """
+    if not subjects:
+        return hashlib.sha256(b"").hexdigest()
+    level = [
+        hashlib.sha256(b"\x00" + s["name"].encode() + b"\x00" + bytes.fromhex(s["digest"]["sha256"])).digest()
+        for s in subjects
+    ]
+    while len(level) > 1:
+        nxt = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0].hex()
+
+
+# ============================================================================
+# TREE WALK + CACHE
+# ============================================================================
+
+def is_skipped(rel: str) -> bool:
+    if rel in SKIP_FILES:
+        return True
+    parent, _, name = rel.rpartition("/")
+    return parent == PROVENANCE_DIR.as_posix() and os.path.splitext(name)[1].lower() in SIGNATURE_SUFFIXES
+
+
+def walk_tree(root: Path):
+    """
+    Yield (relative_posix_path, size, mtime_ns) for every attested file.
+    Files or directories that vanish or are unreadable mid-walk are skipped.
+    """
+    prefix_len = len(str(root)) + 1
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            if os.path.splitext(entry.name)[1].lower() not in ATTESTED_SUFFIXES:
+                                continue
+                            rel = entry.path[prefix_len:].replace(os.sep, "/")
+                            if is_skipped(rel):
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                            yield rel, st.st_size, st.st_mtime_ns
+                    except (FileNotFoundError, PermissionError):
+                        continue
+        except (FileNotFoundError, PermissionError, NotADirectoryError):
+            continue
+
+
+def load_json(path: Path) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(path: Path, cache: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def collect_subjects(root: Path, cache_path: Path, workers: int = None) -> tuple[list, dict]:
+    """
+    Return (subjects, stats). Files whose (size, mtime_ns) match the cache
+    reuse the cached digest; everything else is hashed on a thread pool.
+    """
+    cache = load_json(cache_path)
+    new_cache = {}
+    stale = []
+
+    for rel, size, mtime_ns in walk_tree(root):
+        cached = cache.get(rel)
+        if cached and cached[0] == size and cached[1] == mtime_ns:
+            new_cache[rel] = cached
+        else:
+            stale.append((rel, size, mtime_ns))
+
+    vanished = 0
+    if stale:
+        with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 2)) as pool:
+            digests = pool.map(lambda item: _try_hash(root / item[0]), stale)
+            for (rel, size, mtime_ns), digest in zip(stale, digests):
+                if digest is None:
+                    vanished += 1
+                    continue
+                new_cache[rel] = [size, mtime_ns, digest]
+
+    if new_cache != cache:
+        save_cache(cache_path, new_cache)
+
+    subjects = [{"name": rel, "digest": {"sha256": new_cache[rel][2]}} for rel in sorted(new_cache)]
+    stats = {"files": len(subjects), "rehashed": len(stale) - vanished, "removed": len(set(cache) - set(new_cache))}
+    return subjects, stats
+
+
+# ============================================================================
+# PROVENANCE DOCUMENT
+# ============================================================================
+
+def build_invocation(previous: dict) -> tuple[dict, dict]:
+    """Builder/invocation block from the GitHub Actions environment, else the previous document."""
+    env = os.environ
+    if env.get("GITHUB_RUN_ID"):
+        server = env.get("GITHUB_SERVER_URL", "https://github.com")
+        repo = env.get("GITHUB_REPOSITORY", "Phil-Hills/philhills-ai")
+        builder = {"id": f"{server}/{repo}/actions/runs/{env['GITHUB_RUN_ID']}"}
+        invocation = {
+            "configSource": {"uri": f"git+{server}/{repo}@{env.get('GITHUB_SHA', '')}", "entryPoint": "provenance.yml"},
+            "parameters": {"ref": env.get("GITHUB_REF", ""), "actor": env.get("GITHUB_ACTOR", "")},
+        }
+        return builder, invocation
+    return previous.get("builder", {}), previous.get("invocation", {})
+
+
+def build_provenance(root: Path = Path("."), output: Path = None, cache_path: Path = None, workers: int = None) -> dict:
+    root = root.resolve()
+    output = output or root / OUTPUT_PATH
+    cache_path = cache_path or root / CACHE_PATH
+
+    start = time.perf_counter()
+    subjects, stats = collect_subjects(root, cache_path, workers)
+    previous = load_json(output)
+    builder, invocation = build_invocation(previous)
+
+    document = {
+        "builder": builder,
+        "buildType": BUILD_TYPE,
+        "invocation": invocation,
+        "merkleRoot": {"sha256": merkle_root(subjects)},
+        "subject": subjects,
+    }
+    # Unchanged tree: leave the existing document untouched
+    if previous != document:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w") as f:
+            f.write(json.dumps(document, indent=2) + "\n")
+
+    stats["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    stats["merkle_root"] = document["merkleRoot"]["sha256"]
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build multi-subject provenance for the site tree")
+    parser.add_argument("--root", default=".", help="site root to attest")
+    parser.add_argument("--workers", type=int, default=None, help="hashing threads")
+    args = parser.parse_args()
+
+    stats = build_provenance(Path(args.root), workers=args.workers)
+    print(f"NODE: 0x923-SEA")
+    print(f"SUBJECTS: {stats['files']} (rehashed {stats['rehashed']}, removed {stats['removed']})")
+    print(f"MERKLE_ROOT: {stats['merkle_root']}")
+    print(f"ELAPSED: {stats['elapsed_ms']} ms")
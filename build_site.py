@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Site Builder: Incremental Static Pages From Published Cubes
+Renders one HTML page per cubes/<slug>.json with precompiled Jinja2 templates
+and regenerates sitemap.xml.
+
+Every page depends on its cube file and its template. A cache manifest keeps
+(size, mtime, sha256, template, lastmod) for each page along with the
+template hashes, so a rebuild touches only pages whose cube or template
+changed. Large rebuilds are rendered on a process pool; a single publish is
+rendered inline.
+
+Usage:
+  python build_site.py [--root .] [--workers 8] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SITE_URL = "https://philhills.ai"
+CUBES_DIR = Path("cubes")
+TEMPLATES_DIR = Path("projects")
+SITEMAP_PATH = Path("sitemap.xml")
+MANIFEST_PATH = Path("cache/site_manifest.json")
+BYTECODE_DIR = Path("cache/jinja")
+
+# Bump when page_context() or the manifest layout changes: forces a full rebuild
+BUILD_VERSION = 2
+
+DEFAULT_TEMPLATE = "article_template.html"
+TEMPLATE_FOR_TYPE = {
+    "trending_topic_summary": "article_template.html",
+    "article": "article_template.html",
+    "software": "software_template.html",
+    "software_source_code": "software_template.html",
+}
+TEMPLATES = sorted(set(TEMPLATE_FOR_TYPE.values()) | {DEFAULT_TEMPLATE})
+
+SKIP_CUBES = {"index.json"}
+INLINE_THRESHOLD = 256        # fewer dirty pages than this are rendered without a pool
+SITEMAP_URL_LIMIT = 50000     # sitemaps.org cap per urlset file
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+DESCRIPTION_LENGTH = 160
+LINK_SCHEMES = {"http", "https"}
+
+
+# ============================================================================
+# PAGE RENDERING (runs in pool workers)
+# ============================================================================
+
+_env = None
+
+
+def make_environment(templates_dir: str, bytecode_dir: str) -> Environment:
+    """Jinja2 environment whose compiled templates are cached on disk across runs."""
+    os.makedirs(bytecode_dir, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(templates_dir),
+        autoescape=select_autoescape(["html"]),
+        bytecode_cache=FileSystemBytecodeCache(bytecode_dir),
+        auto_reload=False,
+    )
+
+
+def _init_worker(templates_dir: str, bytecode_dir: str):
+    global _env
+    _env = make_environment(templates_dir, bytecode_dir)
+    # Compile every template once per worker instead of once per page
+    for name in TEMPLATES:
+        _env.get_template(name)
+
+
+def safe_url(value) -> Optional[str]:
+    """
+    `value` if it may go in an href: an http(s) URL or a relative link.
+    javascript:, data: and any other scheme are rejected (None). Browsers
+    drop whitespace and control characters before reading the scheme, so
+    the check does too.
+    """
+    if not isinstance(value, str):
+        return None
+    probe = "".join(ch for ch in value if ch > " " and ch != "\x7f")
+    try:
+        scheme = urlsplit(probe).scheme
+    except ValueError:
+        return None
+    if scheme and scheme.lower() not in LINK_SCHEMES:
+        return None
+    return value.strip() or None
+
+
+def _backlinks(links) -> list:
+    """Backlinks whose URL is safe to render; the rest are dropped."""
+    if not isinstance(links, list):
+        return []
+    return [{**link, "url": url} for link in links
+            if isinstance(link, dict) and (url := safe_url(link.get("url")))]
+
+
+def _summarize(text: str, limit: int = DESCRIPTION_LENGTH) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",;:.") + "…"
+
+
+def page_context(slug: str, cube: dict) -> dict:
+    """Template variables for one cube; shared by both page templates."""
+    identity = cube.get("identity", {})
+    content = cube.get("content", {})
+    summary = content.get("summary", "")
+    paragraphs = [p.strip() for p in summary.split("\n\n") if p.strip()]
+    created = identity.get("created", "")
+    updated = identity.get("updated", created)
+
+    return {
+        "slug": slug,
+        "headline": content.get("title") or (content.get("topic") or identity.get("subject") or slug).title(),
+        "description": content.get("description") or _summarize(paragraphs[0] if paragraphs else ""),
+        "paragraphs": paragraphs,
+        "author": identity.get("author", "Phil Hills"),
+        "url": page_url(slug),
+        "json_url": f"{SITE_URL}/{CUBES_DIR.as_posix()}/{slug}.json",
+        "cube_url": f"{SITE_URL}/{CUBES_DIR.as_posix()}/{slug}.cube",
+        "date_published": created[:10],
+        "date_modified": updated[:10],
+        "image": content.get("image"),
+        "backlinks": _backlinks(content.get("backlinks", [])),
+        "code_repository": safe_url(content.get("code_repository")),
+        "languages": content.get("programming_languages", []),
+        "license": content.get("license", "https://opensource.org/licenses/MIT"),
+    }
+
+
+def page_url(slug: str) -> str:
+    return f"{SITE_URL}/{CUBES_DIR.as_posix()}/{slug}.html"
+
+
+def render_page(job: tuple) -> tuple:
+    """
+    Hash the cube and, if it or its template changed, render its page.
+    job = (slug, cube_path, out_path, prev_digest, prev_template, stale_templates)
+    Returns (slug, digest, template, lastmod, rendered, error); a malformed
+    cube returns its error message instead of aborting the build.
+    """
+    slug, cube_path, out_path, prev_digest, prev_template, stale_templates = job
+    try:
+        with open(cube_path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        cube = json.loads(raw)
+        identity = cube.get("identity", {})
+        template = TEMPLATE_FOR_TYPE.get(identity.get("type"), DEFAULT_TEMPLATE)
+        lastmod = (identity.get("updated") or identity.get("created") or "")[:10]
+
+        if digest == prev_digest and template == prev_template and template not in stale_templates:
+            return slug, digest, template, lastmod, False, None
+
+        html = _env.get_template(template).render(page_context(slug, cube))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        return slug, None, None, None, False, f"{type(e).__name__}: {e}"
+    tmp = out_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp, out_path)
+    return slug, digest, template, lastmod, True, None
+
+
+# ============================================================================
+# DEPENDENCY SCAN + MANIFEST
+# ============================================================================
+
+def scan_cubes(cubes_dir: Path):
+    """Yield (slug, path, size, mtime_ns) for every cube summary JSON."""
+    with os.scandir(cubes_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or entry.name in SKIP_CUBES:
+                continue
+            if entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                yield entry.name[:-5], entry.path, st.st_size, st.st_mtime_ns
+
+
+def hash_templates(templates_dir: Path) -> dict:
+    hashes = {}
+    for name in TEMPLATES:
+        with open(templates_dir / name, "rb") as f:
+            hashes[name] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def load_json(path: Path) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(path: Path, manifest: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+# ============================================================================
+# SITEMAP
+# ============================================================================
+
+def read_static_entries(root: Path, generated_prefix: str) -> list:
+    """
+    Hand-maintained <url> entries from the current sitemap (and its parts when
+    it is a sitemap index). Generated cube pages are dropped; they come from
+    the manifest.
+    """
+    entries = []
+    pending = [root / SITEMAP_PATH]
+    seen = set()
+    while pending:
+        path = pending.pop(0)
+        if path in seen or not path.exists():
+            continue
+        seen.add(path)
+        for _, elem in ET.iterparse(path):
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if tag == "url":
+                fields = {child.tag.rsplit("}", 1)[-1]: (child.text or "").strip() for child in elem}
+                loc = fields.get("loc", "")
+                if not (loc.startswith(generated_prefix) and loc.endswith(".html")):
+                    entries.append(fields)
+                elem.clear()
+            elif tag == "sitemap":
+                loc = elem.findtext(f"{{{SITEMAP_NS}}}loc", "").strip()
+                pending.append(root / loc.rsplit("/", 1)[-1])
+                elem.clear()
+    return entries
+
+
+def _url_entry(fields: dict) -> str:
+    parts = ["  <url>\n"]
+    for key in ("loc", "lastmod", "changefreq", "priority"):
+        if fields.get(key):
+            parts.append(f"    <{key}>{escape(fields[key])}</{key}>\n")
+    parts.append("  </url>\n")
+    return "".join(parts)
+
+
+def write_sitemap(root: Path, static_entries: list, pages: dict) -> int:
+    """
+    Stream the sitemap to disk entry by entry. Beyond SITEMAP_URL_LIMIT URLs
+    the entries are split into sitemap-N.xml parts behind a sitemap index.
+    Returns the number of files written.
+    """
+    def entries():
+        for fields in static_entries:
+            yield _url_entry(fields)
+        for slug in sorted(pages):
+            yield _url_entry({"loc": page_url(slug), "lastmod": pages[slug][4], "changefreq": "monthly", "priority": "0.6"})
+
+    total = len(static_entries) + len(pages)
+    split = total > SITEMAP_URL_LIMIT
+    part_count = -(-total // SITEMAP_URL_LIMIT) if split else 1
+    stream = entries()
+    written = []
+
+    for part in range(1, part_count + 1):
+        path = root / (f"sitemap-{part}.xml" if split else SITEMAP_PATH.as_posix())
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n')
+            for _, entry in zip(range(SITEMAP_URL_LIMIT), stream):
+                f.write(entry)
+            f.write("</urlset>\n")
+        os.replace(tmp, path)
+        written.append(path)
+
+    if split:
+        today = time.strftime("%Y-%m-%d")
+        tmp = (root / SITEMAP_PATH).with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n')
+            for path in written:
+                f.write(f"  <sitemap>\n    <loc>{SITE_URL}/{path.name}</loc>\n    <lastmod>{today}</lastmod>\n  </sitemap>\n")
+            f.write("</sitemapindex>\n")
+        os.replace(tmp, root / SITEMAP_PATH)
+        written.append(root / SITEMAP_PATH)
+
+    # Parts left over from a previous, larger split
+    for path in root.glob("sitemap-*.xml"):
+        if path not in written and path.stem[len("sitemap-"):].isdigit():
+            path.unlink()
+    return len(written)
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def build_site(root: Path = Path("."), workers: int = None, force: bool = False) -> dict:
+    root = root.resolve()
+    start = time.perf_counter()
+    manifest_path = root / MANIFEST_PATH
+    manifest = {} if force else load_json(manifest_path)
+    if manifest.get("version") != BUILD_VERSION:
+        manifest = {}
+
+    templates = hash_templates(root / TEMPLATES_DIR)
+    previous_templates = manifest.get("templates", {})
+    stale_templates = frozenset(name for name, digest in templates.items() if previous_templates.get(name) != digest)
+    previous = manifest.get("pages", {})
+    pages = {}
+    jobs = []
+
+    cubes_dir = root / CUBES_DIR
+    for slug, path, size, mtime_ns in scan_cubes(cubes_dir):
+        cached = previous.get(slug)
+        if cached and cached[0] == size and cached[1] == mtime_ns and cached[3] not in stale_templates:
+            pages[slug] = cached
+            continue
+        prev_digest, prev_template = (cached[2], cached[3]) if cached else (None, None)
+        jobs.append((slug, path, str(cubes_dir / f"{slug}.html"), prev_digest, prev_template, stale_templates))
+        pages[slug] = [size, mtime_ns]
+
+    rendered, failed = 0, {}
+    if jobs:
+        if len(jobs) < INLINE_THRESHOLD:
+            _init_worker(str(root / TEMPLATES_DIR), str(root / BYTECODE_DIR))
+            results = map(render_page, jobs)
+            rendered = _collect(results, pages, previous, failed)
+        else:
+            workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(str(root / TEMPLATES_DIR), str(root / BYTECODE_DIR)),
+            ) as pool:
+                chunksize = max(1, len(jobs) // (workers * 8))
+                rendered = _collect(pool.map(render_page, jobs, chunksize=chunksize), pages, previous, failed)
+
+    removed = set(previous) - set(pages)
+    for slug in removed:
+        try:
+            os.remove(cubes_dir / f"{slug}.html")
+        except FileNotFoundError:
+            pass
+
+    sitemap_files = 0
+    sitemap_dirty = removed or any(slug in pages and previous.get(slug, [None] * 5)[4] != pages[slug][4]
+                                   for slug, *_ in jobs)
+    if sitemap_dirty or not (root / SITEMAP_PATH).exists():
+        static_entries = read_static_entries(root, f"{SITE_URL}/{CUBES_DIR.as_posix()}/")
+        sitemap_files = write_sitemap(root, static_entries, pages)
+
+    new_manifest = {"version": BUILD_VERSION, "templates": templates, "pages": pages}
+    if new_manifest != manifest:
+        save_manifest(manifest_path, new_manifest)
+
+    return {
+        "pages": len(pages),
+        "checked": len(jobs),
+        "rendered": rendered,
+        "removed": len(removed),
+        "failed": failed,
+        "sitemap_files": sitemap_files,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+def _collect(results, pages: dict, previous: dict, failed: dict) -> int:
+    """
+    Record rendered pages. A cube that failed keeps its previous page and
+    manifest entry (retried next build since its size/mtime differ), or is
+    left out if it never rendered.
+    """
+    rendered = 0
+    for slug, digest, template, lastmod, did_render, error in results:
+        if error:
+            failed[slug] = error
+            if slug in previous:
+                pages[slug] = previous[slug]
+            else:
+                del pages[slug]
+            continue
+        pages[slug] = pages[slug][:2] + [digest, template, lastmod]
+        rendered += did_render
+    return rendered
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render cube pages and sitemap.xml")
+    parser.add_argument("--root", default=".", help="site root")
+    parser.add_argument("--workers", type=int, default=None, help="render processes")
+    parser.add_argument("--force", action="store_true", help="ignore the cache manifest and rebuild every page")
+    args = parser.parse_args()
+
+    stats = build_site(Path(args.root), workers=args.workers, force=args.force)
+    print(f"NODE: 0x923-SEA")
+    print(f"PAGES: {stats['pages']} (rendered {stats['rendered']}, checked {stats['checked']}, removed {stats['removed']})")
+    for slug, error in sorted(stats["failed"].items()):
+        print(f"SKIPPED: {slug} ({error})")
+    print(f"SITEMAP_FILES: {stats['sitemap_files']}")
+    print(f"ELAPSED: {stats['elapsed_ms']} ms")
@@ -15,6 +15,8 @@ from dataclasses import dataclass, asdict
 from typing import Literal, Optional
 from pathlib import Path
 
+from core.handshake import DEFAULT_MAX_SESSIONS, DEFAULT_TTL, HandshakeSessions
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -40,7 +42,7 @@ COMPLIANCE_RULES = {
 class AuditEvent:
     """Immutable audit log entry."""
     timestamp: str
-    event_type: Literal["HANDSHAKE", "TX_VERIFY", "BLOCK", "ALLOW"]
+    event_type: Literal["HANDSHAKE", "REVOKE", "TX_VERIFY", "BLOCK", "ALLOW"]
     node_id: str
     details: dict
     signature: str
@@ -71,10 +73,13 @@ class ComplianceSentinel:
     Implements deterministic policy enforcement with immutable logging.
     """
 
-    def __init__(self, node_id: str = NODE_ID):
+    def __init__(self, node_id: str = NODE_ID, session_key: Optional[bytes] = None,
+                 session_ttl: float = DEFAULT_TTL, max_sessions: int = DEFAULT_MAX_SESSIONS):
         self.node_id = node_id
         self.rules = COMPLIANCE_RULES
         self.log_path = AUDIT_LOG_PATH
+        self.sessions = HandshakeSessions(session_key, max_sessions, session_ttl)
+        self.events = None  # agents.events.EventHub mirroring audit entries to live dashboards
         self._boot_sequence()
 
     def _boot_sequence(self):
@@ -101,8 +106,32 @@ class ComplianceSentinel:
         )
         with open(self.log_path, "a") as f:
             f.write(event.to_json() + "\n")
+        if self.events is not None:
+            # Same level/message shape as ReputationSentinel, which control.html renders
+            summary = " ".join(f"{key}={value}" for key, value in details.items())
+            self.events.publish("audit", {
+                "node_id": self.node_id,
+                "level": "WARNING" if event_type in ("BLOCK", "REVOKE") else "INFO",
+                "message": f"{event_type} {summary}".rstrip(),
+                "event_type": event_type,
+                "details": details,
+            })
         return event
 
+    def _block(self, tx: AgentTransaction, reason: str) -> tuple[bool, str]:
+        """Log a BLOCK with the parties involved, so block rates can be grouped by agent."""
+        self._log_event("BLOCK", {
+            "tx_id": tx.tx_id,
+            "reason": reason,
+            "source": tx.source_agent,
+            "target": tx.target_agent,
+            "action": tx.action
+        })
+        print(f"[BLOCK] TX {tx.tx_id[:8]}... | Reason: {reason}")
+        # A pair caught in a violation must handshake again before resuming
+        self.revoke_handshake(tx.source_agent, tx.target_agent, reason="BLOCKED_TX")
+        return False, reason
+
     def audit_transaction(self, tx: AgentTransaction) -> tuple[bool, str]:
         """
         Audit an agent transaction against compliance rules.
@@ -111,30 +140,22 @@ class ComplianceSentinel:
         # Rule 1: Signature Required
         if self.rules["require_signature"] and not tx.signature:
             reason = "MISSING_SIGNATURE"
-            self._log_event("BLOCK", {"tx_id": tx.tx_id, "reason": reason})
-            print(f"[BLOCK] TX {tx.tx_id[:8]}... | Reason: {reason}")
-            return False, reason
+            return self._block(tx, reason)
 
         # Rule 2: Payload Size Limit
         if tx.payload_size > self.rules["max_payload_bytes"]:
             reason = f"PAYLOAD_EXCEEDS_LIMIT ({tx.payload_size} > {self.rules['max_payload_bytes']})"
-            self._log_event("BLOCK", {"tx_id": tx.tx_id, "reason": reason})
-            print(f"[BLOCK] TX {tx.tx_id[:8]}... | Reason: {reason}")
-            return False, reason
+            return self._block(tx, reason)
 
         # Rule 3: Protocol Allowlist
         if tx.protocol not in self.rules["allowed_protocols"]:
             reason = f"PROTOCOL_NOT_ALLOWED ({tx.protocol})"
-            self._log_event("BLOCK", {"tx_id": tx.tx_id, "reason": reason})
-            print(f"[BLOCK] TX {tx.tx_id[:8]}... | Reason: {reason}")
-            return False, reason
+            return self._block(tx, reason)
 
         # Rule 4: Blocked Actions
         if tx.action in self.rules["blocked_actions"]:
             reason = f"ACTION_BLOCKED ({tx.action})"
-            self._log_event("BLOCK", {"tx_id": tx.tx_id, "reason": reason})
-            print(f"[BLOCK] TX {tx.tx_id[:8]}... | Reason: {reason}")
-            return False, reason
+            return self._block(tx, reason)
 
         # All checks passed
         self._log_event("ALLOW", {
@@ -146,18 +167,53 @@ class ComplianceSentinel:
         print(f"[ALLOW] TX {tx.tx_id[:8]}... | {tx.source_agent} → {tx.target_agent}")
         return True, "COMPLIANT"
 
-    def verify_handshake(self, agent_a: str, agent_b: str) -> bool:
-        """Verify A2AC handshake between two agents."""
-        self._log_event("HANDSHAKE", {"from": agent_a, "to": agent_b, "status": "VERIFIED"})
-        print(f"[HANDSHAKE] {agent_a} ↔ {agent_b} | Status: VERIFIED")
-        return True
+    def verify_handshake(self, agent_a: str, agent_b: str, token: Optional[str] = None) -> Optional[str]:
+        """
+        Verify A2AC handshake between two agents.
+        A valid resumption token resumes the pair's session without a new
+        audit entry; otherwise a full handshake is logged, establishing a
+        session only if the pair has no live one (a missing or bad token
+        never replaces it).
+        Returns the token to present on the pair's next exchange: `token`
+        when it resumed, a new one when a session was established, and None
+        when the pair already holds a live session issued to someone else.
+        """
+        if token is not None and self.sessions.resume(agent_a, agent_b, token):
+            return token
+        issued = None
+        session = self.sessions.live(agent_a, agent_b)
+        if session is None:
+            issued = self.sessions.establish(agent_a, agent_b)
+            session = self.sessions.get(agent_a, agent_b)
+        self._log_event("HANDSHAKE", {
+            "from": agent_a,
+            "to": agent_b,
+            "status": "VERIFIED",
+            "session_id": session.session_id,
+            "expires": datetime.fromtimestamp(session.expires, timezone.utc).isoformat()
+        })
+        print(f"[HANDSHAKE] {agent_a} ↔ {agent_b} | Status: VERIFIED | Session: {session.session_id}")
+        return issued
+
+    def revoke_handshake(self, agent_a: str, agent_b: Optional[str] = None, reason: str = "REVOKED") -> int:
+        """Revoke the session of a pair, or every session of `agent_a`. Logs one REVOKE per session."""
+        revoked = self.sessions.revoke(agent_a, agent_b)
+        for session in revoked:
+            self._log_event("REVOKE", {
+                "from": session.pair[0],
+                "to": session.pair[1],
+                "session_id": session.session_id,
+                "reason": reason
+            })
+            print(f"[REVOKE] {session.pair[0]} ↔ {session.pair[1]} | Reason: {reason}")
+        return len(revoked)
 
     def generate_report(self) -> dict:
         """Generate compliance summary from audit log."""
         if not self.log_path.exists():
             return {"error": "No audit log found"}
 
-        events = {"ALLOW": 0, "BLOCK": 0, "HANDSHAKE": 0, "BOOT": 0}
+        events = {"ALLOW": 0, "BLOCK": 0, "HANDSHAKE": 0, "REVOKE": 0, "BOOT": 0}
         with open(self.log_path, "r") as f:
             for line in f:
                 event = json.loads(line)
@@ -170,6 +226,8 @@ class ComplianceSentinel:
             "total_events": sum(events.values()),
             "allowed": events["ALLOW"],
             "blocked": events["BLOCK"],
+            "handshakes": events["HANDSHAKE"],
+            "handshakes_resumed": self.sessions.stats["resumed"],
             "compliance_rate": f"{events['ALLOW'] / max(1, events['ALLOW'] + events['BLOCK']) * 100:.1f}%"
         }
 
@@ -231,6 +289,12 @@ if __name__ == "__main__":
     # Handshake verification
     sentinel.verify_handshake("Sentinel_Core", "Gateway_Agent")
 
+    # Chatty pair: one logged handshake, then token resumptions
+    token = sentinel.verify_handshake("Treasury_Agent", "Audit_Agent")
+    for _ in range(100):
+        sentinel.verify_handshake("Treasury_Agent", "Audit_Agent", token)
+    sentinel.revoke_handshake("Treasury_Agent", "Audit_Agent", reason="KEY_ROTATION")
+
     # Compliant transaction
     tx4 = AgentTransaction(
         tx_id=hashlib.sha256(b"tx_004").hexdigest(),
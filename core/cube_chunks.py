@@ -0,0 +1,336 @@
+"""
+Chunked Cubes - Seekable cube-1.1 documents for random access into large payloads.
+
+A cube-1.0 document holds one gzip stream, base64-encoded, so reading any
+byte means decoding all of it. A chunked cube splits the payload into
+fixed-size blocks that are gzipped and base64-encoded independently and
+concatenated into cube.data. The header carries a block table of
+[offset, length, sha256] (offset/length in characters of cube.data; the
+digest covers the block's gzip bytes) and the top-level hash is the
+SHA-256 of the concatenated block digests, so one block can be verified
+without touching the others.
+
+Documents are written with "data_offset" first and cube.data last:
+
+  {"data_offset":412,"protocol_version":"cube-1.1",...,"cube":{...,"blocks":[...],"data":"<blocks>"}}
+
+data_offset is the byte position where cube.data starts, so a reader can
+fetch a prefix, parse the header from it, and then fetch only the byte
+range of the blocks it needs (locally with pread, remotely with an HTTP
+Range request). Blocks are verified and decompressed on a thread pool;
+zlib and hashlib release the GIL, so decoding scales across cores.
+
+Usage:
+  python core/cube_chunks.py pack cubes/barcelona-frankfurt.cube /tmp/bf.cube --block-size 4096
+  python core/cube_chunks.py read /tmp/bf.cube --offset 1000 --length 200
+  python core/cube_chunks.py verify /tmp/bf.cube
+"""
+import argparse
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Union
+
+PROTOCOL_VERSION = "cube-1.1"
+HASH_ALGORITHM = "SHA256-BLOCKS"
+DEFAULT_BLOCK_SIZE = 64 * 1024
+MAX_BLOCK_SIZE = 64 << 20
+HEADER_PROBE = 4096           # bytes fetched first when opening a ranged source
+MAX_HEADER_BYTES = 16 << 20   # ~200k blocks; larger tables are rejected before fetching
+GZIP_WBITS = 31               # zlib container flag for gzip framing (what pako.ungzip reads)
+
+_DATA_OFFSET = re.compile(rb'^\{"data_offset":(\d+),')
+
+
+class CubeFormatError(ValueError):
+    pass
+
+
+class CubeIntegrityError(CubeFormatError):
+    pass
+
+
+def root_hash(digests: Sequence[str]) -> str:
+    """Top-level hash: SHA-256 over the raw per-block digests in order."""
+    return hashlib.sha256(b"".join(bytes.fromhex(d) for d in digests)).hexdigest()
+
+
+def _encoded_bound(block_size: int) -> int:
+    """Largest base64 length a gzip member of `block_size` input bytes can have."""
+    deflated = block_size + 5 * (block_size // 16383 + 1) + 18     # stored blocks + gzip framing
+    return 4 * -(-deflated // 3)
+
+
+def _compress_block(args):
+    block, level = args
+    packer = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    compressed = packer.compress(block) + packer.flush()
+    return base64.b64encode(compressed), hashlib.sha256(compressed).hexdigest()
+
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+def pack(data: bytes, descriptor: str, dimensions: Optional[List[int]] = None,
+         block_size: int = DEFAULT_BLOCK_SIZE, level: int = 9, workers: Optional[int] = None) -> bytes:
+    """Serialize `data` as a chunked cube document."""
+    if not 0 < block_size <= MAX_BLOCK_SIZE:
+        raise ValueError(f"block_size must be in 1..{MAX_BLOCK_SIZE}")
+    blocks = [data[i:i + block_size] for i in range(0, len(data), block_size)]
+    jobs = [(block, level) for block in blocks]
+    if len(jobs) > 1 and workers != 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            encoded = list(pool.map(_compress_block, jobs))
+    else:
+        encoded = [_compress_block(job) for job in jobs]
+
+    table, offset = [], 0
+    for chunk, digest in encoded:
+        table.append([offset, len(chunk), digest])
+        offset += len(chunk)
+
+    doc = {
+        "data_offset": 0,
+        "protocol_version": PROTOCOL_VERSION,
+        "descriptor": descriptor,
+        "hash": {"algorithm": HASH_ALGORITHM, "value": root_hash([entry[2] for entry in table])},
+        "cube": {
+            "dimensions": dimensions or cube_dimensions(offset),
+            "encoding": "base64",
+            "compression": "gzip",
+            "block_size": block_size,
+            "length": len(data),
+            "blocks": table,
+            "data": "",
+        },
+    }
+    # data_offset counts its own digits: settle it before splicing in the data
+    while True:
+        head = json.dumps(doc, separators=(",", ":")).encode()[:-3]      # drop '"}}'
+        if doc["data_offset"] == len(head):
+            break
+        doc["data_offset"] = len(head)
+    return b"".join([head] + [chunk for chunk, _ in encoded] + [b'"}}'])
+
+
+def cube_dimensions(n: int) -> List[int]:
+    """Same near-cubic fit voxel-protocol.js uses for cube-1.0."""
+    if n <= 0:
+        return [1, 1, 1]
+    side = max(1, round(n ** (1 / 3)))
+    while side ** 3 < n:
+        side += 1
+    best, waste = [side, side, side], side ** 3 - n
+    for x in range(max(1, side - 2), side + 3):
+        for y in range(max(1, side - 2), side + 3):
+            z = max(1, -(-n // (x * y)))
+            if x * y * z - n < waste:
+                best, waste = [x, y, z], x * y * z - n
+    return best
+
+
+def write(path: str, data: bytes, descriptor: str, **kwargs):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(pack(data, descriptor, **kwargs))
+    os.replace(tmp, path)
+
+
+def decode_legacy(doc: dict) -> bytes:
+    """Payload bytes of a cube-1.0 document (single base64 gzip stream)."""
+    cleaned = doc["cube"]["data"].rstrip("=")
+    return zlib.decompress(base64.b64decode(cleaned + "=" * (-len(cleaned) % 4)), GZIP_WBITS)
+
+
+# ============================================================================
+# READER
+# ============================================================================
+
+Fetch = Callable[[int, int], bytes]
+
+
+class ChunkedCube:
+    """
+    Random-access reader. `source` is a file path, the document bytes, or a
+    fetch(start, length) -> bytes callable (e.g. wrapping HTTP Range GETs).
+    """
+
+    def __init__(self, source: Union[str, bytes, bytearray, memoryview, Fetch], workers: Optional[int] = None):
+        self._fd = None
+        if isinstance(source, str):
+            self._fd = os.open(source, os.O_RDONLY)
+            fd = self._fd
+            self._fetch = lambda start, length: os.pread(fd, length, start)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source)
+            self._fetch = lambda start, length: bytes(view[start:start + length])
+        else:
+            self._fetch = source
+        self._workers = workers
+        self._pool = None
+        try:
+            self._load_header()
+        except BaseException:
+            self.close()
+            raise
+
+    def _load_header(self):
+        self.header = self._read_header()
+        cube = self.header.get("cube")
+        try:
+            self.block_size = int(cube["block_size"])
+            self.length = int(cube["length"])
+            self.blocks = [(int(off), int(size), str(digest)) for off, size, digest in cube["blocks"]]
+            self.data_offset = int(self.header["data_offset"])
+            self.hash = self.header["hash"]["value"]
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            raise CubeFormatError(f"malformed chunked cube header: {e!r}")
+        if not 0 < self.block_size <= MAX_BLOCK_SIZE or self.length < 0:
+            raise CubeFormatError(f"bad block_size {self.block_size} or length {self.length}")
+        if len(self.blocks) != -(-self.length // self.block_size):
+            raise CubeFormatError(f"{len(self.blocks)} blocks cannot hold {self.length} bytes of {self.block_size}")
+        # Blocks must be contiguous and no larger than base64 gzip of block_size can be, so a
+        # header cannot make a reader fetch or allocate more than the payload warrants
+        limit = _encoded_bound(self.block_size)
+        expected_offset = 0
+        for off, size, _ in self.blocks:
+            if off != expected_offset or not 0 < size <= limit:
+                raise CubeFormatError(f"block at {off} (+{size}) breaks the block table")
+            expected_offset += size
+        try:
+            expected = root_hash([digest for _, _, digest in self.blocks])
+        except ValueError:
+            raise CubeFormatError("block digest is not hex")
+        if expected != self.hash:
+            raise CubeIntegrityError("block table does not match the top-level hash")
+
+    def _read_header(self) -> dict:
+        prefix = self._fetch(0, HEADER_PROBE)
+        match = _DATA_OFFSET.match(prefix)
+        if not match:
+            raise CubeFormatError("not a chunked cube (missing leading data_offset)")
+        data_offset = int(match.group(1))
+        if data_offset > MAX_HEADER_BYTES:
+            raise CubeFormatError(f"header of {data_offset} bytes exceeds {MAX_HEADER_BYTES}")
+        if len(prefix) < data_offset:
+            prefix += self._fetch(len(prefix), data_offset - len(prefix))
+        try:
+            header = json.loads(prefix[:data_offset] + b'"}}')
+        except (ValueError, RecursionError) as e:
+            raise CubeFormatError(f"unreadable header: {e}")
+        if not isinstance(header, dict) or header.get("protocol_version") != PROTOCOL_VERSION:
+            raise CubeFormatError("unsupported protocol_version")
+        return header
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.length
+
+    def _decode(self, index: int, chunk: bytes) -> bytes:
+        try:
+            compressed = base64.b64decode(chunk, validate=True)
+        except (binascii.Error, ValueError) as e:
+            raise CubeFormatError(f"block {index}: bad base64: {e}")
+        if hashlib.sha256(compressed).hexdigest() != self.blocks[index][2]:
+            raise CubeIntegrityError(f"block {index}: digest mismatch")
+        try:
+            block = zlib.decompress(compressed, GZIP_WBITS)
+        except zlib.error as e:
+            raise CubeFormatError(f"block {index}: {e}")
+        expected = min(self.block_size, self.length - index * self.block_size)
+        if len(block) != expected:
+            raise CubeFormatError(f"block {index}: {len(block)} bytes, expected {expected}")
+        return block
+
+    def read_blocks(self, first: int, last: int) -> List[bytes]:
+        """Verified, decompressed blocks first..last (inclusive), fetched as one range."""
+        if not 0 <= first <= last < len(self.blocks):
+            raise IndexError(f"blocks {first}..{last} outside 0..{len(self.blocks) - 1}")
+        start = self.blocks[first][0]
+        end = self.blocks[last][0] + self.blocks[last][1]
+        span = self._fetch(self.data_offset + start, end - start)
+        if len(span) != end - start:
+            raise CubeFormatError("truncated cube data")
+        chunks = [(i, span[off - start:off - start + size])
+                  for i, (off, size, _) in enumerate(self.blocks[first:last + 1], start=first)]
+        if len(chunks) == 1 or self._workers == 1:
+            return [self._decode(i, chunk) for i, chunk in chunks]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers)
+        return list(self._pool.map(lambda job: self._decode(*job), chunks))
+
+    def read(self, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Payload bytes [offset, offset + length), decoding only the blocks that overlap it."""
+        if length is None:
+            length = self.length - offset
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must be non-negative")
+        end = min(self.length, offset + length)
+        if offset >= end:
+            return b""
+        first, last = offset // self.block_size, (end - 1) // self.block_size
+        data = b"".join(self.read_blocks(first, last))
+        skip = offset - first * self.block_size
+        return data[skip:skip + end - offset]
+
+    def verify(self) -> bool:
+        """Check every block against its digest; raises CubeIntegrityError on the first mismatch."""
+        if self.blocks:
+            self.read_blocks(0, len(self.blocks) - 1)
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack, read and verify chunked (cube-1.1) cubes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p_pack = commands.add_parser("pack", help="convert a cube-1.0 document or raw file")
+    p_pack.add_argument("source")
+    p_pack.add_argument("output")
+    p_pack.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    p_pack.add_argument("--raw", action="store_true", help="source is a raw payload, not a cube")
+    p_pack.add_argument("--descriptor", default="IDENTITY_CUBE|CHUNKED|PUBLISHED")
+    p_read = commands.add_parser("read", help="print a byte range of the payload")
+    p_read.add_argument("cube")
+    p_read.add_argument("--offset", type=int, default=0)
+    p_read.add_argument("--length", type=int, default=None)
+    p_verify = commands.add_parser("verify", help="verify every block")
+    p_verify.add_argument("cube")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        with open(args.source, "rb") as f:
+            raw = f.read()
+        descriptor = args.descriptor
+        if not args.raw:
+            legacy = json.loads(raw)
+            raw, descriptor = decode_legacy(legacy), legacy.get("descriptor", descriptor)
+        write(args.output, raw, descriptor, block_size=args.block_size)
+        with ChunkedCube(args.output) as cube:
+            print(f"PACKED: {cube.length} bytes in {len(cube.blocks)} blocks -> {args.output}")
+            print(f"HASH: {cube.hash}")
+    elif args.command == "read":
+        with ChunkedCube(args.cube) as cube:
+            print(cube.read(args.offset, args.length).decode("utf-8", "replace"))
+    else:
+        with ChunkedCube(args.cube) as cube:
+            cube.verify()
+            print(f"VERIFIED: {len(cube.blocks)} blocks, {cube.length} bytes, hash {cube.hash}")
@@ -0,0 +1,165 @@
+"""
+Cube Deltas - Binary copy/insert deltas between two versions of a cube payload.
+
+A delta rebuilds `target` from `base` with two operations: COPY a range of
+base bytes or ADD literal bytes. diff() indexes base in aligned 16-byte
+blocks, scans target for matching blocks and greedily extends each match
+in both directions, so any shared run of 31+ bytes becomes one COPY.
+
+Layout (all integers unsigned LEB128 varints):
+
+  b"QDL1" | sha256(base) | sha256(target) | varint(len(target)) | zlib(ops)
+  ops:  0x01 varint(offset) varint(length)     COPY from base
+        0x02 varint(length) <bytes>            ADD literal
+
+patch() checks the base digest before applying anything and the target
+digest and length afterwards, so a delta applied to the wrong base or a
+corrupted delta raises DeltaError instead of yielding a wrong payload.
+"""
+import hashlib
+import zlib
+from typing import NamedTuple
+
+MAGIC = b"QDL1"
+BLOCK = 16
+MAX_TARGET = 256 << 20        # refuse to rebuild payloads larger than this
+
+_COPY = 0x01
+_ADD = 0x02
+
+
+class DeltaError(ValueError):
+    pass
+
+
+class BaseMismatch(DeltaError):
+    """The delta was made against a different base version."""
+
+
+class DeltaHeader(NamedTuple):
+    base: str                 # sha256 hex of the base payload
+    target: str               # sha256 hex of the rebuilt payload
+    length: int               # rebuilt payload length
+
+
+def _varint(n: int, out: bytearray):
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(buf: bytes, pos: int):
+    n = shift = 0
+    while True:
+        if pos >= len(buf) or shift > 63:
+            raise DeltaError("truncated or oversized varint")
+        byte = buf[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def digest(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()
+
+
+def diff(base: bytes, target: bytes, level: int = 9) -> bytes:
+    """Delta that rebuilds `target` from `base`."""
+    index = {}
+    for off in range(0, len(base) - BLOCK + 1, BLOCK):
+        index.setdefault(base[off:off + BLOCK], off)
+
+    ops = bytearray()
+    n, n_base = len(target), len(base)
+    literal = i = 0
+    lookup = index.get
+    while i <= n - BLOCK:
+        off = lookup(target[i:i + BLOCK])
+        if off is None:
+            i += 1
+            continue
+        # Grow the match backwards into the pending literal...
+        back = 0
+        while back < i - literal and back < off and base[off - back - 1] == target[i - back - 1]:
+            back += 1
+        # ...and forwards, a chunk at a time while whole chunks agree
+        end_t, end_b = i + BLOCK, off + BLOCK
+        step = 256
+        while step:
+            if end_t + step <= n and end_b + step <= n_base and target[end_t:end_t + step] == base[end_b:end_b + step]:
+                end_t += step
+                end_b += step
+            else:
+                step >>= 1
+        start = i - back
+        if start > literal:
+            ops.append(_ADD)
+            _varint(start - literal, ops)
+            ops += target[literal:start]
+        ops.append(_COPY)
+        _varint(off - back, ops)
+        _varint(end_t - start, ops)
+        i = literal = end_t
+    if literal < n:
+        ops.append(_ADD)
+        _varint(n - literal, ops)
+        ops += target[literal:]
+
+    header = bytearray(MAGIC)
+    header += hashlib.sha256(base).digest() + hashlib.sha256(target).digest()
+    _varint(n, header)
+    return bytes(header) + zlib.compress(bytes(ops), level)
+
+
+def read_header(delta: bytes) -> DeltaHeader:
+    if len(delta) < 68 or delta[:4] != MAGIC:
+        raise DeltaError("not a cube delta")
+    length, _ = _read_varint(delta, 68)
+    return DeltaHeader(delta[4:36].hex(), delta[36:68].hex(), length)
+
+
+def patch(base: bytes, delta: bytes) -> bytes:
+    """Rebuild and verify the target payload; raises DeltaError on any mismatch."""
+    header = read_header(delta)
+    if digest(base) != header.base:
+        raise BaseMismatch(f"delta base {header.base[:12]} does not match payload {digest(base)[:12]}")
+    if header.length > MAX_TARGET:
+        raise DeltaError(f"target of {header.length} bytes exceeds {MAX_TARGET}")
+    _, pos = _read_varint(delta, 68)
+
+    # Ops can never be much longer than the target they build: cap inflation
+    inflater = zlib.decompressobj()
+    try:
+        ops = inflater.decompress(delta[pos:], 2 * header.length + 64)
+    except zlib.error as e:
+        raise DeltaError(f"corrupt delta body: {e}")
+    if inflater.unconsumed_tail or not inflater.eof:
+        raise DeltaError("delta body is truncated or larger than its target")
+
+    out = bytearray()
+    pos, n_ops, n_base = 0, len(ops), len(base)
+    while pos < n_ops:
+        op = ops[pos]
+        if op == _COPY:
+            off, pos = _read_varint(ops, pos + 1)
+            length, pos = _read_varint(ops, pos)
+            if off + length > n_base:
+                raise DeltaError(f"COPY {off}+{length} past end of base ({n_base})")
+            out += base[off:off + length]
+        elif op == _ADD:
+            length, pos = _read_varint(ops, pos + 1)
+            if pos + length > n_ops:
+                raise DeltaError("ADD past end of delta")
+            out += ops[pos:pos + length]
+            pos += length
+        else:
+            raise DeltaError(f"unknown delta op {op:#x}")
+        if len(out) > header.length:
+            raise DeltaError("delta writes past the declared target length")
+
+    if len(out) != header.length or digest(bytes(out)) != header.target:
+        raise DeltaError("rebuilt payload does not match the target digest")
+    return bytes(out)
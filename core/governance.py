@@ -1,7 +1,197 @@
 """
 Governance Sidecar - Circuit Breakers & Resource Limits
 Ensures agentic safety and cost control.
+
+GovernanceService enforces per-agent budgets, rolling-window spend, token-bucket
+rate limits and per-call-chain recursion depth. State is split across shards,
+each guarded by its own short-lived lock, so concurrent threads and asyncio
+tasks checking different agents rarely contend. Every check is O(1).
+
+Recursion depth belongs to a call path, not to a context id: the hop count
+carried in the headers, or the nesting of enter_chain() blocks held in a
+contextvar. asyncio tasks inherit a copy of their parent's context, so
+parallel sibling calls on one context each see their parent's depth + 1
+rather than adding up.
 """
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+CONTEXT_HEADER = "x-a2a-context-id"
+HOP_HEADER = "x-a2a-hop-count"
+
+# context id -> enter_chain() nesting on the current call path (never mutated; replaced per level)
+_CHAIN_DEPTHS = contextvars.ContextVar("governance_chain_depths", default={})
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/sec, holding at most `capacity`."""
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity=None, now=None):
+        self.rate = float(rate)
+        if not self.rate > 0:
+            raise ValueError(f"TokenBucket rate must be > 0, got {rate!r}")
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def try_acquire(self, amount=1.0, now=None):
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def reserve(self, amount=1.0, now=None):
+        """
+        Take `amount` tokens unconditionally and return how many seconds the
+        caller must wait before using them (0.0 when they were available).
+        Lets async callers pace themselves with a sleep instead of spinning.
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+
+class RollingWindow:
+    """
+    Sum of amounts over the last `window` seconds, kept in a ring of `slots`
+    time buckets. Adding and reading are amortized O(1).
+    """
+    __slots__ = ("slot_width", "slots", "head", "head_index", "total")
+
+    def __init__(self, window=60.0, slots=60, now=None):
+        self.slot_width = window / slots
+        self.slots = [0.0] * slots
+        now = time.monotonic() if now is None else now
+        self.head_index = int(now / self.slot_width)
+        self.head = self.head_index % slots
+        self.total = 0.0
+
+    def _advance(self, now):
+        index = int(now / self.slot_width)
+        steps = min(index - self.head_index, len(self.slots))
+        for _ in range(max(0, steps)):
+            self.head = (self.head + 1) % len(self.slots)
+            self.total -= self.slots[self.head]
+            self.slots[self.head] = 0.0
+        if index > self.head_index:
+            self.head_index = index
+
+    def sum(self, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        return self.total
+
+    def add(self, amount, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        self.slots[self.head] += amount
+        self.total += amount
+
+
+class _AgentState:
+    __slots__ = ("spend", "window", "bucket")
+
+    def __init__(self, window, bucket):
+        self.spend = 0.0
+        self.window = window
+        self.bucket = bucket
+
+
+class GovernanceService:
+    """
+    Process-wide governance shared by many agents, threads and asyncio tasks.
+    """
+
+    def __init__(self, budget_limit=10.0, window_limit=None, window_seconds=60.0,
+                 rate_limit=None, burst=None, max_recursion=5, shards=32):
+        self.budget_limit = budget_limit
+        self.window_limit = window_limit
+        self.window_seconds = window_seconds
+        if rate_limit is not None:
+            TokenBucket(rate_limit, burst)  # reject a bad rate now, not on an agent's first call
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.MAX_RECURSION = max_recursion
+        self._shards = [(threading.Lock(), {}) for _ in range(shards)]
+
+    def _shard(self, shards, key):
+        return shards[hash(key) % len(shards)]
+
+    def _new_state(self, now):
+        window = RollingWindow(self.window_seconds, now=now) if self.window_limit is not None else None
+        bucket = TokenBucket(self.rate_limit, self.burst, now=now) if self.rate_limit is not None else None
+        return _AgentState(window, bucket)
+
+    def chain_depth(self, headers=None):
+        """Recursion depth of this call path: the hop count, or the enter_chain() nesting for its context id."""
+        if not headers:
+            return 0
+        try:
+            depth = int(headers.get(HOP_HEADER, 0))
+        except (TypeError, ValueError):
+            depth = 0
+        context_id = headers.get(CONTEXT_HEADER)
+        if context_id is not None:
+            depth = max(depth, _CHAIN_DEPTHS.get().get(context_id, 0))
+        return depth
+
+    @contextmanager
+    def enter_chain(self, context_id):
+        """Count one level of recursion for `context_id` on the current call path while the block runs."""
+        depths = _CHAIN_DEPTHS.get()
+        depth = depths.get(context_id, 0) + 1
+        if depth > self.MAX_RECURSION:
+            raise RecursionError(f"GOVERNANCE_HALT: Max Recursion Depth ({self.MAX_RECURSION})")
+        token = _CHAIN_DEPTHS.set({**depths, context_id: depth})
+        try:
+            yield depth
+        finally:
+            _CHAIN_DEPTHS.reset(token)
+
+    def check_operation(self, agent_id, cost, headers=None):
+        """
+        Validates if an operation is within safety bounds and records its cost.
+        Raises PermissionError (budget / rate) or RecursionError (call depth).
+        """
+        if self.chain_depth(headers) > self.MAX_RECURSION:
+            raise RecursionError(f"GOVERNANCE_HALT: Max Recursion Depth ({self.MAX_RECURSION})")
+
+        now = time.monotonic()
+        lock, states = self._shard(self._shards, agent_id)
+        with lock:
+            state = states.get(agent_id)
+            if state is None:
+                state = states[agent_id] = self._new_state(now)
+
+            if state.spend + cost > self.budget_limit:
+                raise PermissionError(f"GOVERNANCE_HALT: Budget Exceeded for {agent_id}")
+            if state.window is not None and state.window.sum(now) + cost > self.window_limit:
+                raise PermissionError(f"GOVERNANCE_HALT: Spend Rate Exceeded for {agent_id} ({self.window_limit}/{self.window_seconds:g}s)")
+            if state.bucket is not None and not state.bucket.try_acquire(1.0, now):
+                raise PermissionError(f"GOVERNANCE_HALT: Rate Limited {agent_id}")
+
+            state.spend += cost
+            if state.window is not None:
+                state.window.add(cost, now)
+        return True
+
+    def spend(self, agent_id):
+        lock, states = self._shard(self._shards, agent_id)
+        with lock:
+            state = states.get(agent_id)
+            return state.spend if state else 0.0
+
+    def reset(self, agent_id):
+        lock, states = self._shard(self._shards, agent_id)
+        with lock:
+            states.pop(agent_id, None)
+
 
 class GovernanceSidecar:
     def __init__(self, agent_id, budget_limit=10.0):
@@ -10,26 +200,30 @@ class GovernanceSidecar:
         self.current_spend = 0.0
         self.recursion_depth = 0
         self.MAX_RECURSION = 5
+        self._lock = threading.Lock()
 
     def check_operation(self, cost, is_recursive=False):
         """
         Validates if an operation is within safety bounds.
+        For concurrent agents prefer GovernanceService, which tracks depth per call chain.
         """
-        # Budget Check
-        if self.current_spend + cost > self.budget_limit:
-            raise PermissionError(f"GOVERNANCE_HALT: Budget Exceeded for {self.agent_id}")
-        
-        # Recursion Check
-        if is_recursive:
-            self.recursion_depth += 1
-            if self.recursion_depth > self.MAX_RECURSION:
-                 raise RecursionError(f"GOVERNANCE_HALT: Max Recursion Depth ({self.MAX_RECURSION})")
-
-        self.current_spend += cost
+        with self._lock:
+            # Budget Check
+            if self.current_spend + cost > self.budget_limit:
+                raise PermissionError(f"GOVERNANCE_HALT: Budget Exceeded for {self.agent_id}")
+
+            # Recursion Check
+            if is_recursive:
+                self.recursion_depth += 1
+                if self.recursion_depth > self.MAX_RECURSION:
+                    raise RecursionError(f"GOVERNANCE_HALT: Max Recursion Depth ({self.MAX_RECURSION})")
+
+            self.current_spend += cost
         return True
 
     def reset_depth(self):
-        self.recursion_depth = 0
+        with self._lock:
+            self.recursion_depth = 0
 
 if __name__ == "__main__":
     # Test Circuit Breaker
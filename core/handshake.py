@@ -0,0 +1,130 @@
+"""
+Handshake Sessions - Resumable A2AC handshakes between agent pairs.
+
+A full handshake between two agents establishes a session; until it expires
+or is revoked, further exchanges between the same pair resume it instead of
+repeating (and re-logging) the handshake.
+
+Sessions live in a bounded LRU table keyed by the unordered agent pair.
+Establishing one issues a resumption token
+
+  <session_id>.<expires>.<mac>      mac = HMAC-SHA256(key, a|b|session_id|expires)
+
+that the pair presents on later exchanges. establish() is the only place a
+token is handed out, so only the caller that completed the handshake holds
+it. resume() checks the MAC and the
+expiry from the token itself, then that the session is still in the table,
+so a revoked or evicted session is never resumed even with a valid token.
+Nothing resumes without a valid token; callers fall back to a full handshake
+and, if the pair still holds a live session (live()), keep it rather than
+letting a missing or forged token replace it and invalidate the real one.
+Every operation is O(1) except revoking all sessions of one agent.
+"""
+import hashlib
+import hmac
+import secrets
+import time
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+DEFAULT_TTL = 900.0
+DEFAULT_MAX_SESSIONS = 4096
+
+
+class Session(NamedTuple):
+    pair: Tuple[str, str]
+    session_id: str
+    established: float
+    expires: int
+
+
+def pair_key(agent_a: str, agent_b: str) -> Tuple[str, str]:
+    """Sessions are symmetric: A <-> B and B <-> A share one entry."""
+    return (agent_a, agent_b) if agent_a <= agent_b else (agent_b, agent_a)
+
+
+class HandshakeSessions:
+    """Bounded LRU of live handshake sessions with HMAC resumption tokens."""
+
+    def __init__(self, key: Optional[bytes] = None, max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 ttl: float = DEFAULT_TTL):
+        # A per-process key means tokens do not outlive the sentinel that issued them
+        self._key = key or secrets.token_bytes(32)
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[Tuple[str, str], Session]" = OrderedDict()
+        self.stats = {"established": 0, "resumed": 0, "rejected": 0, "expired": 0, "evicted": 0, "revoked": 0}
+
+    def _mac(self, pair: Tuple[str, str], session_id: str, expires: int) -> str:
+        message = f"{pair[0]}|{pair[1]}|{session_id}|{expires}".encode()
+        return hmac.new(self._key, message, hashlib.sha256).hexdigest()[:32]
+
+    def establish(self, agent_a: str, agent_b: str, now: Optional[float] = None) -> str:
+        """Record a freshly completed handshake and return its resumption token."""
+        now = time.time() if now is None else now
+        pair = pair_key(agent_a, agent_b)
+        expires = int(now + self.ttl)
+        session = Session(pair, secrets.token_hex(8), now, expires)
+        self._sessions[pair] = session
+        self._sessions.move_to_end(pair)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.stats["evicted"] += 1
+        self.stats["established"] += 1
+        return self._token(session)
+
+    def _token(self, session: Session) -> str:
+        return f"{session.session_id}.{session.expires}.{self._mac(session.pair, session.session_id, session.expires)}"
+
+    def resume(self, agent_a: str, agent_b: str, token: Optional[str], now: Optional[float] = None) -> bool:
+        """True if `token` is the valid, unexpired token of the pair's live session."""
+        now = time.time() if now is None else now
+        pair = pair_key(agent_a, agent_b)
+        if not token:
+            self.stats["rejected"] += 1
+            return False
+        session_id, _, rest = token.partition(".")
+        expires, _, mac = rest.partition(".")
+        if not (expires.isascii() and expires.isdigit() and len(expires) <= 12) or not hmac.compare_digest(
+                mac.encode(errors="replace"), self._mac(pair, session_id, int(expires)).encode()):
+            self.stats["rejected"] += 1
+            return False
+        if int(expires) <= now:
+            self.stats["expired"] += 1
+            return False
+        session = self.live(agent_a, agent_b, now)
+        if session is None or session.session_id != session_id:
+            self.stats["rejected"] += 1
+            return False
+        self._sessions.move_to_end(pair)
+        self.stats["resumed"] += 1
+        return True
+
+    def get(self, agent_a: str, agent_b: str) -> Optional[Session]:
+        return self._sessions.get(pair_key(agent_a, agent_b))
+
+    def live(self, agent_a: str, agent_b: str, now: Optional[float] = None) -> Optional[Session]:
+        """The pair's unexpired session, if any (an expired one is dropped)."""
+        now = time.time() if now is None else now
+        pair = pair_key(agent_a, agent_b)
+        session = self._sessions.get(pair)
+        if session is not None and session.expires <= now:
+            del self._sessions[pair]
+            self.stats["expired"] += 1
+            return None
+        return session
+
+    def revoke(self, agent_a: str, agent_b: Optional[str] = None) -> List[Session]:
+        """Drop the session of a pair, or every session involving `agent_a`; returns what was revoked."""
+        if agent_b is not None:
+            session = self._sessions.pop(pair_key(agent_a, agent_b), None)
+            revoked = [session] if session else []
+        else:
+            revoked = [s for pair, s in self._sessions.items() if agent_a in pair]
+            for session in revoked:
+                del self._sessions[session.pair]
+        self.stats["revoked"] += len(revoked)
+        return revoked
+
+    def __len__(self):
+        return len(self._sessions)
@@ -8,8 +8,26 @@ def interleave_3d(x, y, d):
         z |= (x & 1 << i) << 2*i | (y & 1 << i) << (2*i + 1) | (d & 1 << i) << (2*i + 2)
     return hex(z)
 
+def deinterleave_3d(z):
+    """
+    Inverse of interleave_3d: recovers (x, y, d) from a Morton code given
+    either as an int or as the hex string interleave_3d returns. Codes
+    outside the 96 bits interleave_3d can produce raise ValueError.
+    """
+    if isinstance(z, str):
+        z = int(z, 16)
+    if z < 0 or z >> 96:
+        raise ValueError(f"Morton code out of range: {z:#x}")
+    x = y = d = 0
+    for i in range(32):
+        x |= (z >> 3*i & 1) << i
+        y |= (z >> (3*i + 1) & 1) << i
+        d |= (z >> (3*i + 2) & 1) << i
+    return x, y, d
+
 if __name__ == "__main__":
     # Current Identity Mapping for Magnolia Lab
     # x: 476, y: 122, d: 0x923
     node_z = interleave_3d(476, 122, 2339) # 0x923 is 2339 in decimal
     print(f"Magnolia Lab Z-Index: {node_z}")
+    print(f"Decoded (x, y, d): {deinterleave_3d(node_z)}")
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Cube Versions: Delta-Encoded Updates for Published Topics
+Keeps every published version of a cube and serves updates as binary deltas
+(core/cube_delta.py) against the version a subscriber already holds.
+
+Versions of a slug are keyed by the SHA-256 of the cube payload (the JSON
+inside the .cube). Each version is stored either in full (gzip) or as a
+delta from the previous version; RebasePolicy starts a new full version
+once the delta chain grows too long or its deltas add up to a sizeable
+share of a full copy, which bounds reconstruction work. After every
+publish, deltas from the last `serve_window` versions straight to the
+latest are precomputed, so answering GET /cubes/latest?have=<hash> is a
+file read.
+
+Subscribers (CubeSubscriber) apply a delta only to the exact base it names,
+verify the rebuilt payload against the announced hash, and fall back to a
+full fetch on any mismatch.
+
+Layout:
+  cubes/<slug>.cube                          latest full cube (cube-1.0)
+  cubes/index.json                           version / content_hash per slug
+  cubes/versions/<slug>/manifest.json        version history
+  cubes/versions/<slug>/v<n>.full|.delta     stored versions
+  cubes/versions/<slug>/serve/<base>.delta   base -> latest, for subscribers
+
+Usage:
+  python cube_versions.py publish barcelona-frankfurt payload.json
+  python cube_versions.py latest barcelona-frankfurt --have 41fb4a40...
+  python cube_versions.py history barcelona-frankfurt
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from core.cube_chunks import GZIP_WBITS, cube_dimensions
+from core.cube_delta import DeltaError, diff, digest, patch
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SITE_URL = "https://philhills.ai"
+CUBES_DIR = Path("cubes")
+VERSIONS_DIR = CUBES_DIR / "versions"
+INDEX_PATH = CUBES_DIR / "index.json"
+AUTHOR = "Phil Hills"
+
+
+class RebasePolicy(NamedTuple):
+    max_chain: int = 16             # deltas allowed since the last full version
+    max_chain_ratio: float = 0.5    # chain delta bytes allowed, as a share of a full (gzip) copy
+    serve_window: int = 8           # versions subscribers can update from with one delta
+
+
+def _gzip(payload: bytes) -> bytes:
+    packer = zlib.compressobj(9, zlib.DEFLATED, GZIP_WBITS)
+    return packer.compress(payload) + packer.flush()
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _blob_name(entry: dict) -> str:
+    return f"v{entry['version']}.{entry['kind']}"
+
+
+def parse_have(value: str) -> Dict[str, str]:
+    """`have` query parameter ("slug:hash,slug:hash") -> {slug: hash}."""
+    pairs = (item.partition(":") for item in value.split(",") if item.strip())
+    return {slug.strip(): content_hash.strip().lower() for slug, _, content_hash in pairs if content_hash}
+
+
+def encode_cube(payload: bytes, descriptor: str) -> bytes:
+    """cube-1.0 document: base64 gzip padded with '=' to fill its dimensions."""
+    compressed = _gzip(payload)
+    data = base64.b64encode(compressed).decode()
+    dims = cube_dimensions(len(data))
+    doc = {
+        "protocol_version": "cube-1.0",
+        "descriptor": descriptor,
+        "cube": {"dimensions": dims, "encoding": "base64", "data": data.ljust(dims[0] * dims[1] * dims[2], "=")},
+        "hash": {"algorithm": "SHA256", "value": hashlib.sha256(compressed).hexdigest()},
+    }
+    return json.dumps(doc, indent=2).encode()
+
+
+# ============================================================================
+# PUBLISHER
+# ============================================================================
+
+class VersionStore:
+    """Version history, delta storage and /cubes/latest responses for every slug."""
+
+    def __init__(self, root: Path = Path("."), policy: RebasePolicy = RebasePolicy()):
+        self.root = Path(root)
+        self.policy = policy
+
+    def _dir(self, slug: str) -> Path:
+        if not slug or "/" in slug or slug.startswith("."):
+            raise ValueError(f"invalid slug {slug!r}")
+        return self.root / VERSIONS_DIR / slug
+
+    def history(self, slug: str) -> List[dict]:
+        try:
+            with open(self._dir(slug) / "manifest.json") as f:
+                return json.load(f)["versions"]
+        except FileNotFoundError:
+            return []
+
+    def _walk(self, slug: str, versions: List[dict], first: int, last: int) -> Iterator[Tuple[dict, bytes]]:
+        """(entry, payload) for versions[first..last], rebuilt from the full version at or before `first`."""
+        start = first
+        while versions[start]["kind"] != "full":
+            start -= 1
+        folder = self._dir(slug)
+        payload = b""
+        for i in range(start, last + 1):
+            entry = versions[i]
+            with open(folder / _blob_name(entry), "rb") as f:
+                blob = f.read()
+            payload = zlib.decompress(blob, GZIP_WBITS) if entry["kind"] == "full" else patch(payload, blob)
+            if digest(payload) != entry["hash"]:
+                raise DeltaError(f"{slug} v{entry['version']}: stored payload does not match its hash")
+            if i >= first:
+                yield entry, payload
+
+    def payload(self, slug: str, version: Optional[int] = None) -> bytes:
+        """Rebuilt and verified payload of `version` (default: latest)."""
+        versions = self.history(slug)
+        if not versions:
+            raise KeyError(slug)
+        i = len(versions) - 1 if version is None else next(
+            (n for n, v in enumerate(versions) if v["version"] == version), None)
+        if i is None:
+            raise KeyError(f"{slug} v{version}")
+        return next(self._walk(slug, versions, i, i))[1]
+
+    def publish(self, slug: str, payload: bytes, descriptor: Optional[str] = None,
+                topic: Optional[str] = None) -> dict:
+        """Record a new version (no-op if identical to the latest) and refresh the served deltas."""
+        folder = self._dir(slug)
+        versions = self.history(slug)
+        content_hash = digest(payload)
+        if versions and versions[-1]["hash"] == content_hash:
+            return versions[-1]
+
+        full = _gzip(payload)
+        delta = None
+        if versions:
+            delta = diff(self.payload(slug), payload)
+            chain = []
+            for entry in reversed(versions):
+                if entry["kind"] == "full":
+                    break
+                chain.append(entry)
+            policy = self.policy
+            if (len(chain) >= policy.max_chain
+                    or sum(e["stored"] for e in chain) + len(delta) > policy.max_chain_ratio * len(full)):
+                delta = None
+
+        kind = "full" if delta is None else "delta"
+        blob = full if delta is None else delta
+        entry = {
+            "version": versions[-1]["version"] + 1 if versions else 1,
+            "hash": content_hash,
+            "size": len(payload),
+            "stored": len(blob),
+            "kind": kind,
+            "created": datetime.now().isoformat(),
+        }
+        # Named by version, not content: a payload can recur (X -> A -> B -> A) with a different delta
+        _write_atomic(folder / _blob_name(entry), blob)
+        versions.append(entry)
+        _write_atomic(folder / "manifest.json", json.dumps({"slug": slug, "versions": versions}, indent=2).encode())
+        self._refresh_serve_deltas(slug, versions, payload, len(full))
+
+        topic = topic or self._index_entry(slug).get("topic") or slug
+        descriptor = descriptor or f"IDENTITY_CUBE|TREND[{topic}]|PUBLISHED"
+        _write_atomic(self.root / CUBES_DIR / f"{slug}.cube", encode_cube(payload, descriptor))
+        self._update_index(slug, topic, entry)
+        return entry
+
+    def _refresh_serve_deltas(self, slug: str, versions: List[dict], latest: bytes, full_size: int):
+        serve = self._dir(slug) / "serve"
+        serve.mkdir(parents=True, exist_ok=True)
+        bases = versions[-self.policy.serve_window - 1:-1]
+        keep = set()
+        if bases:
+            first = len(versions) - 1 - len(bases)
+            for entry, base in self._walk(slug, versions, first, len(versions) - 2):
+                delta = diff(base, latest)
+                if len(delta) < full_size:     # otherwise the full cube is the cheaper answer
+                    _write_atomic(serve / f"{entry['hash']}.delta", delta)
+                    keep.add(f"{entry['hash']}.delta")
+        for stale in serve.iterdir():
+            if stale.name not in keep:
+                stale.unlink()
+
+    def _index_entry(self, slug: str) -> dict:
+        try:
+            with open(self.root / INDEX_PATH) as f:
+                entries = json.load(f).get("cubes", [])
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return next((e for e in entries if e.get("slug") == slug), {})
+
+    def _update_index(self, slug: str, topic: str, entry: dict):
+        path = self.root / INDEX_PATH
+        try:
+            with open(path) as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {"cubes": []}
+        cubes = index.setdefault("cubes", [])
+        record = next((c for c in cubes if c.get("slug") == slug), None)
+        if record is None:
+            record = {
+                "slug": slug,
+                "topic": topic,
+                "cube_url": f"{SITE_URL}/{CUBES_DIR.as_posix()}/{slug}.cube",
+                "json_url": f"{SITE_URL}/{CUBES_DIR.as_posix()}/{slug}.json",
+                "created": entry["created"],
+                "author": AUTHOR,
+            }
+            cubes.append(record)
+        record["updated"] = entry["created"]
+        record["version"] = entry["version"]
+        record["content_hash"] = entry["hash"]
+        index["last_updated"] = datetime.now().isoformat()
+        _write_atomic(path, json.dumps(index, indent=2).encode())
+
+    # -- GET /cubes/latest --------------------------------------------------
+
+    def latest(self, slug: str, have: Optional[str] = None) -> dict:
+        """
+        Update for one slug. `have` is the content hash the subscriber holds:
+        "current" if it is the latest, a delta if one is served from it,
+        otherwise the full payload.
+        """
+        versions = self.history(slug)
+        if not versions:
+            raise KeyError(slug)
+        head = versions[-1]
+        update = {"slug": slug, "version": head["version"], "hash": head["hash"], "updated": head["created"]}
+        if have == head["hash"]:
+            return {**update, "kind": "current"}
+        if have and all(c in "0123456789abcdef" for c in have) and len(have) == 64:
+            try:
+                with open(self._dir(slug) / "serve" / f"{have}.delta", "rb") as f:
+                    return {**update, "kind": "delta", "base": have, "encoding": "base64",
+                            "data": base64.b64encode(f.read()).decode()}
+            except FileNotFoundError:
+                pass
+        return {**update, "kind": "full", "encoding": "base64", "compression": "gzip",
+                "data": base64.b64encode(_gzip(self.payload(slug))).decode()}
+
+    def latest_feed(self, have: Optional[Dict[str, str]] = None, limit: int = 1) -> dict:
+        """GET /cubes/latest body: the `limit` most recently updated cubes, as deltas where possible."""
+        try:
+            with open(self.root / INDEX_PATH) as f:
+                entries = json.load(f).get("cubes", [])
+        except (FileNotFoundError, json.JSONDecodeError):
+            entries = []
+        have = have or {}
+        recent = sorted((e for e in entries if e.get("version")), key=lambda e: e.get("updated", ""), reverse=True)
+        return {"cubes": [self.latest(e["slug"], have.get(e["slug"])) for e in recent[:limit]]}
+
+
+# ============================================================================
+# SUBSCRIBER
+# ============================================================================
+
+class CubeSubscriber:
+    """Consumer-side state: applies /cubes/latest updates and verifies every result."""
+
+    def __init__(self):
+        self.payloads: Dict[str, bytes] = {}
+        self.hashes: Dict[str, str] = {}
+
+    def have(self) -> Dict[str, str]:
+        return dict(self.hashes)
+
+    def apply(self, update: dict) -> bytes:
+        slug, kind = update["slug"], update["kind"]
+        if kind == "current":
+            if self.hashes.get(slug) != update["hash"]:
+                raise DeltaError(f"{slug}: server reports current but we hold {self.hashes.get(slug)}")
+            return self.payloads[slug]
+        data = base64.b64decode(update["data"])
+        if kind == "delta":
+            if self.hashes.get(slug) != update["base"]:
+                raise DeltaError(f"{slug}: delta is against {update['base'][:12]}, we hold {self.hashes.get(slug)}")
+            payload = patch(self.payloads[slug], data)
+        elif kind == "full":
+            try:
+                payload = zlib.decompress(data, GZIP_WBITS)
+            except zlib.error as e:
+                raise DeltaError(f"{slug}: corrupt full payload: {e}")
+        else:
+            raise DeltaError(f"{slug}: unknown update kind {kind!r}")
+        if digest(payload) != update["hash"]:
+            raise DeltaError(f"{slug}: payload does not match announced hash {update['hash'][:12]}")
+        self.payloads[slug] = payload
+        self.hashes[slug] = update["hash"]
+        return payload
+
+    def apply_feed(self, feed: dict) -> Tuple[List[str], List[str]]:
+        """(updated slugs, failed slugs). Failed slugs are forgotten so the next poll fetches them in full."""
+        updated, failed = [], []
+        for update in feed.get("cubes", []):
+            try:
+                before = self.hashes.get(update["slug"])
+                self.apply(update)
+                if self.hashes[update["slug"]] != before:
+                    updated.append(update["slug"])
+            except (DeltaError, KeyError, ValueError):
+                self.payloads.pop(update.get("slug"), None)
+                self.hashes.pop(update.get("slug"), None)
+                failed.append(update.get("slug"))
+        return updated, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Versioned, delta-encoded cube publishing")
+    parser.add_argument("--root", default=".", help="site root")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p_publish = commands.add_parser("publish", help="publish a new payload version for a slug")
+    p_publish.add_argument("slug")
+    p_publish.add_argument("payload", help="payload file (the JSON carried inside the cube)")
+    p_publish.add_argument("--topic")
+    p_latest = commands.add_parser("latest", help="show the /cubes/latest answer for a subscriber")
+    p_latest.add_argument("slug")
+    p_latest.add_argument("--have", help="content hash the subscriber holds")
+    p_history = commands.add_parser("history", help="list versions and verify each one rebuilds")
+    p_history.add_argument("slug")
+    args = parser.parse_args()
+
+    store = VersionStore(Path(args.root))
+    print("NODE: 0x923-SEA")
+    if args.command == "publish":
+        with open(args.payload, "rb") as f:
+            entry = store.publish(args.slug, f.read(), topic=args.topic)
+        print(f"VERSION: {entry['version']} ({entry['kind']}, {entry['stored']:,} of {entry['size']:,} bytes stored)")
+        print(f"HASH: {entry['hash']}")
+    elif args.command == "latest":
+        update = store.latest(args.slug, args.have)
+        print(f"KIND: {update['kind']} -> v{update['version']} {update['hash'][:12]}")
+        print(f"BYTES: {len(json.dumps(update)):,}")
+    else:
+        versions = store.history(args.slug)
+        for (entry, payload) in (store._walk(args.slug, versions, 0, len(versions) - 1) if versions else ()):
+            print(f"  v{entry['version']:<4} {entry['kind']:5} {entry['stored']:>8,} / {entry['size']:>8,} bytes  "
+                  f"{entry['hash'][:12]}  {entry['created']}")
+        print(f"VERIFIED: {len(versions)} versions")
@@ -4,20 +4,25 @@ Forces a crawl of the High-Density Identity Manifest within 1 hour.
 ENFORCES BLAKE3 INTEGRITY before transmission.
 
 Usage:
-  python force_index_identity.py
+  python force_index_identity.py [--all] [--concurrency 8] [--rate 50]
+
+Only URLs whose content changed since Google last acknowledged them are
+sent (see index_notifier.UrlHashStore); --all resends every URL.
 
 Requirements:
   1. Service Account JSON key (GO TO: GCP Console > IAM > Service Accounts)
   2. Indexing API enabled (GO TO: GCP Console > APIs > Enable "Indexing API")
 """
 
+import argparse
+import asyncio
 import os
-import json
-import requests
-from google.oauth2 import service_account
-from google.auth.transport.requests import Request
+from index_notifier import IndexNotifier, UrlHashStore, changed_urls, content_hash
 from verify_agent_voxel import verify_agent_voxel
 
+# Google auth is imported inside get_access_token: it dominates import time
+# and is not needed until a signal is sent.
+
 # CONFIGURATION
 SCOPES = ["https://www.googleapis.com/auth/indexing"]
 KEY_FILE = "service_account.json"
@@ -34,39 +39,20 @@ def get_access_token():
         print(f"❌ ERROR: Key file '{KEY_FILE}' not found.")
         return None
 
+    from google.oauth2 import service_account
+    from google.auth.transport.requests import Request
+
     creds = service_account.Credentials.from_service_account_file(KEY_FILE, scopes=SCOPES)
     creds.refresh(Request())
     return creds.token
 
-def notify_google(url, token, integrity_hash):
-    """Sends URL_UPDATED notification with Integrity Headers."""
-    endpoint = "https://indexing.googleapis.com/v3/urlNotifications:publish"
-    headers = {
-        "Authorization": f"Bearer {token}", 
-        "Content-Type": "application/json",
-        "X-Identity-Integrity": integrity_hash  # Custom header for logging context
-    }
-    payload = {
-        "url": url,
-        "type": "URL_UPDATED",
-        # Injecting metadata into the request body (Note: API may ignore non-standard fields, but they are transmitted)
-        "metadata": {
-            "attestation": "BLAKE3",
-            "hash": integrity_hash,
-            "node": "0x923-SEA"
-        }
-    }
-    
-    response = requests.post(endpoint, headers=headers, json=payload)
-    
-    if response.status_code == 200:
-        print(f"✅ SIGNAL SENT: {url}")
-        print(f"   [Integrity Signed]: {integrity_hash[:16]}...")
-    else:
-        print(f"❌ FAILED: {url}")
-        print(f"   Error: {response.text}")
-
 def main():
+    parser = argparse.ArgumentParser(description="Send Indexing API URL_UPDATED signals")
+    parser.add_argument("--all", action="store_true", help="notify every URL, changed or not")
+    parser.add_argument("--concurrency", type=int, default=8, help="in-flight HTTP requests")
+    parser.add_argument("--rate", type=float, default=50.0, help="notifications per second")
+    args = parser.parse_args()
+
     print("🚀 TARGETING: Google Indexing API (Priority Mode)")
     print("🔒 PROTOCOL: Strict Integrity Enforcement (BLAKE3)")
     print("-----------------------------------------------")
@@ -78,15 +64,33 @@ def main():
         exit(1)
         
     print(f"✅ ATTESTATION CONFIRMED: {cube_hash}")
+
+    # 2. SELECT CHANGED URLS
+    store = UrlHashStore()
+    if args.all:
+        pending = {url: content_hash(url) for url in URLS_TO_INDEX}
+    else:
+        pending = changed_urls(URLS_TO_INDEX, store)
+    if not pending:
+        print("✅ NO CHANGES: every URL is already indexed at its current content hash")
+        return
     
-    # 2. AUTHENTICATE
+    # 3. AUTHENTICATE
     token = get_access_token()
     if not token:
         return
 
-    # 3. TRANSMIT SIGNALS
-    for url in URLS_TO_INDEX:
-        notify_google(url, token, cube_hash)
+    # 4. TRANSMIT SIGNALS
+    notifier = IndexNotifier(token, cube_hash, concurrency=args.concurrency, rate=args.rate)
+    report = asyncio.run(notifier.notify(pending))
+    for url in report.sent:
+        store.mark(url, pending[url])
+        print(f"✅ SIGNAL SENT: {url}")
+    for url, error in report.failed.items():
+        print(f"❌ FAILED: {url}")
+        print(f"   Error: {error}")
+    store.save()
+    print(f"   [Integrity Signed]: {cube_hash[:16]}... ({len(report.sent)}/{len(pending)} in {report.duration_s:.2f}s)")
 
 if __name__ == "__main__":
     main()
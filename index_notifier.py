@@ -0,0 +1,331 @@
+"""
+Index Notifier: Change-Aware, Rate-Limited Indexing API Signals
+Sends URL_UPDATED notifications over a pooled async HTTP client.
+
+- Only URLs whose local content hash differs from the persisted URL -> hash
+  store are sent; hashes are recorded once Google acknowledges them.
+- Notifications are packed into Indexing API batch requests (up to 100
+  calls per HTTP request) and sent by a bounded number of workers sharing
+  one keep-alive connection pool.
+- A token bucket paces notifications; a 429 pauses every worker for the
+  Retry-After interval (or an exponential, jittered backoff) before the
+  throttled calls are retried.
+
+Usage:
+  from index_notifier import IndexNotifier, UrlHashStore, changed_urls
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from core.governance import TokenBucket
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PUBLISH_ENDPOINT = "https://indexing.googleapis.com/v3/urlNotifications:publish"
+BATCH_ENDPOINT = "https://indexing.googleapis.com/batch"
+PUBLISH_PATH = "/v3/urlNotifications:publish"
+STORE_PATH = Path("cache/indexed_urls.json")
+
+BATCH_LIMIT = 100             # Indexing API maximum calls per batch request
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+NODE_ID = "0x923-SEA"
+
+
+# ============================================================================
+# URL -> CONTENT HASH STORE
+# ============================================================================
+
+class UrlHashStore:
+    """Persisted map of URL -> sha256 of the content last acknowledged by Google."""
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        try:
+            with open(self.path, "r") as f:
+                self.hashes: Dict[str, str] = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.hashes = {}
+        self._dirty = False
+
+    def changed(self, url: str, digest: Optional[str]) -> bool:
+        # Content we cannot hash locally is always considered changed
+        return digest is None or self.hashes.get(url) != digest
+
+    def mark(self, url: str, digest: Optional[str]):
+        if digest is not None and self.hashes.get(url) != digest:
+            self.hashes[url] = digest
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.hashes, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def local_path_for(url: str, root: Path = Path(".")) -> Path:
+    """Map a published URL onto the file in this site tree that serves it."""
+    path = urlsplit(url).path.lstrip("/")
+    if not path or path.endswith("/"):
+        path += "index.html"
+    return root / path
+
+
+def content_hash(url: str, root: Path = Path(".")) -> Optional[str]:
+    try:
+        with open(local_path_for(url, root), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+def changed_urls(urls: Iterable[str], store: UrlHashStore, root: Path = Path(".")) -> Dict[str, Optional[str]]:
+    """URL -> current content hash for every URL whose content changed since it was last sent."""
+    pending = {}
+    for url in urls:
+        digest = content_hash(url, root)
+        if store.changed(url, digest):
+            pending[url] = digest
+    return pending
+
+
+# ============================================================================
+# BATCH ENCODING
+# ============================================================================
+
+def build_payload(url: str, integrity_hash: str) -> dict:
+    return {
+        "url": url,
+        "type": "URL_UPDATED",
+        "metadata": {"attestation": "BLAKE3", "hash": integrity_hash, "node": NODE_ID},
+    }
+
+
+def encode_batch(urls: List[str], integrity_hash: str, boundary: str) -> bytes:
+    """multipart/mixed body with one embedded publish call per URL."""
+    parts = []
+    for i, url in enumerate(urls):
+        body = json.dumps(build_payload(url, integrity_hash), separators=(",", ":"))
+        parts.append(
+            f"--{boundary}\r\n"
+            f"Content-Type: application/http\r\n"
+            f"Content-ID: <item{i}>\r\n\r\n"
+            f"POST {PUBLISH_PATH}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body.encode())}\r\n\r\n"
+            f"{body}\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n")
+    return "".join(parts).encode()
+
+
+def parse_batch(content_type: str, body: bytes) -> Dict[int, Tuple[int, str]]:
+    """Map item index -> (status, body) from a multipart/mixed batch response."""
+    boundary = None
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "boundary":
+            boundary = value.strip('"')
+    if boundary is None:
+        return {}
+
+    results = {}
+    for part in body.decode("utf-8", "replace").split(f"--{boundary}"):
+        part = part.strip()
+        if not part or part == "--":
+            continue
+        outer_headers, _, inner = part.replace("\r\n", "\n").partition("\n\n")
+        index = None
+        for line in outer_headers.split("\n"):
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-id":
+                digits = "".join(ch for ch in value if ch.isdigit())
+                index = int(digits) if digits else None
+        status_line, _, rest = inner.partition("\n")
+        _, _, payload = rest.partition("\n\n")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            continue
+        if index is not None:
+            results[index] = (status, payload.strip())
+    return results
+
+
+# ============================================================================
+# NOTIFIER
+# ============================================================================
+
+@dataclass
+class NotifyReport:
+    sent: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    duration_s: float = 0.0
+
+    def __str__(self):
+        rate = len(self.sent) / self.duration_s if self.duration_s else 0.0
+        return (f"Sent:       {len(self.sent)}\n"
+                f"Failed:     {len(self.failed)}\n"
+                f"Requests:   {self.requests} (retries {self.retries}, throttled {self.throttled})\n"
+                f"Duration:   {self.duration_s:.3f} s\n"
+                f"Throughput: {rate:,.0f} url/s")
+
+
+class IndexNotifier:
+    """
+    Async URL_UPDATED sender. `rate`/`burst` bound notifications per second
+    across all workers; `concurrency` bounds in-flight HTTP requests.
+    """
+
+    def __init__(self, token: str, integrity_hash: str, *, concurrency: int = 8,
+                 rate: float = 50.0, burst: Optional[float] = None, batch_size: int = BATCH_LIMIT,
+                 max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 60.0,
+                 timeout: float = 30.0, publish_endpoint: str = PUBLISH_ENDPOINT,
+                 batch_endpoint: str = BATCH_ENDPOINT):
+        self.token = token
+        self.integrity_hash = integrity_hash
+        self.concurrency = concurrency
+        self.batch_size = max(1, min(batch_size, BATCH_LIMIT))
+        self.bucket = TokenBucket(rate, burst if burst is not None else max(rate, self.batch_size))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.publish_endpoint = publish_endpoint
+        self.batch_endpoint = batch_endpoint
+        self._headers = {"Authorization": f"Bearer {token}", "X-Identity-Integrity": integrity_hash}
+        self._paused_until = 0.0
+
+    async def notify(self, urls: Iterable[str], client=None) -> NotifyReport:
+        """Send every URL; pass `client` to reuse an existing httpx.AsyncClient."""
+        import httpx
+
+        urls = list(urls)
+        report = NotifyReport()
+        start = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(0, len(urls), self.batch_size):
+            queue.put_nowait(urls[i:i + self.batch_size])
+
+        owns_client = client is None
+        if owns_client:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+                timeout=self.timeout,
+            )
+        try:
+            workers = [asyncio.create_task(self._worker(client, queue, report)) for _ in range(self.concurrency)]
+            await queue.join()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            if owns_client:
+                await client.aclose()
+
+        report.duration_s = time.perf_counter() - start
+        return report
+
+    async def _worker(self, client, queue: asyncio.Queue, report: NotifyReport):
+        while True:
+            batch = await queue.get()
+            try:
+                await self._send_with_retry(client, batch, report)
+            finally:
+                queue.task_done()
+
+    async def _gate(self, amount: int):
+        """Wait out a shared 429 pause, then take `amount` tokens from the bucket."""
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        delay = self.bucket.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _send_with_retry(self, client, batch: List[str], report: NotifyReport):
+        import httpx
+
+        pending = batch
+        for attempt in range(self.max_retries + 1):
+            await self._gate(len(pending))
+            report.requests += 1
+            try:
+                results, retry_after = await self._send(client, pending)
+            except httpx.TransportError as e:
+                results, retry_after = {i: (0, f"{type(e).__name__}: {e}") for i in range(len(pending))}, None
+
+            retry = []
+            throttled = False
+            for i, url in enumerate(pending):
+                status, text = results.get(i, (0, "missing from batch response"))
+                if status == 200:
+                    report.sent.append(url)
+                elif (status in RETRYABLE_STATUS or status == 0) and attempt < self.max_retries:
+                    retry.append(url)
+                    throttled |= status == 429
+                else:
+                    report.failed[url] = f"HTTP {status}: {text[:200]}" if status else text
+            if not retry:
+                return
+
+            delay = self._backoff(attempt, retry_after)
+            report.retries += len(retry)
+            if throttled:
+                # Quota is shared: hold every worker, not just this one
+                report.throttled += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            await asyncio.sleep(delay)
+            pending = retry
+
+    async def _send(self, client, urls: List[str]) -> Tuple[Dict[int, Tuple[int, str]], Optional[float]]:
+        if len(urls) == 1:
+            response = await client.post(self.publish_endpoint, headers=self._headers,
+                                         json=build_payload(urls[0], self.integrity_hash))
+            results = {0: (response.status_code, response.text)}
+        else:
+            boundary = f"batch_{uuid.uuid4().hex}"
+            response = await client.post(
+                self.batch_endpoint,
+                content=encode_batch(urls, self.integrity_hash, boundary),
+                headers={**self._headers, "Content-Type": f"multipart/mixed; boundary={boundary}"},
+            )
+            if response.status_code == 200:
+                results = parse_batch(response.headers.get("content-type", ""), response.content)
+            else:
+                results = {i: (response.status_code, response.text) for i in range(len(urls))}
+        return results, _retry_after(response.headers.get("retry-after"))
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        # HTTP-date form: fall back to exponential backoff
+        return None
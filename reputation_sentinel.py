@@ -11,6 +11,8 @@ import hashlib
 import time
 from datetime import datetime
 
+from core.handshake import HandshakeSessions
+
 # Configuration for Enterprise Audit Trail
 AUDIT_LOG_FILE = "audit_compliance.log"
 NODE_ID = "0x923-SEA"  # Seattle Research Hub
@@ -23,10 +25,17 @@ logging.basicConfig(
 )
 
 class ReputationSentinel:
-    def __init__(self, node_id):
+    def __init__(self, node_id, session_key=None, events=None):
         self.node_id = node_id
+        self.sessions = HandshakeSessions(session_key)
+        self.events = events  # agents.events.EventHub mirroring audit entries to live dashboards
         print(f"[SENTINEL] Initializing Audit Stream for Node: {self.node_id}...")
 
+    def _audit(self, level, message):
+        logging.log(level, message)
+        if self.events is not None:
+            self.events.publish("audit", {"node_id": self.node_id, "level": logging.getLevelName(level), "message": message})
+
     def verify_transaction(self, tx_id, protocol="Q-Protocol"):
         """
         Simulates BLAKE3 verification of a transaction hash.
@@ -34,23 +43,44 @@ class ReputationSentinel:
         # In production this would verify the actual BLAKE3 signature
         # meaningful_hash = blake3(tx_id).hexdigest()
         print(f"[PASS] Transaction {tx_id[:8]}... Verified ({protocol})")
-        logging.info(f"VERIFIED_TX | ID:{tx_id} | PROTOCOL:{protocol}")
+        self._audit(logging.INFO, f"VERIFIED_TX | ID:{tx_id} | PROTOCOL:{protocol}")
         return True
 
-    def audit_handshake(self, agent_a, agent_b):
+    def audit_handshake(self, agent_a, agent_b, token=None):
         """
         Audits A2AC handshake between agents for authorization.
+        A valid resumption token resumes the pair's session silently; any other
+        handshake is audited in full and keeps the pair's live session, if any.
+        Returns the token for the pair's next exchange (None if the pair's
+        live session was issued to an earlier caller).
         """
+        if token is not None and self.sessions.resume(agent_a, agent_b, token):
+            return token
+        issued = None
+        session = self.sessions.live(agent_a, agent_b)
+        if session is None:
+            issued = self.sessions.establish(agent_a, agent_b)
+            session = self.sessions.get(agent_a, agent_b)
         print(f"[PASS] A2AC Handshake: Sentinel <-> {agent_b}")
-        logging.info(f"HANDSHAKE | {agent_a} -> {agent_b} | STATUS:AUTHORIZED")
-        return True
+        self._audit(logging.INFO, f"HANDSHAKE | {agent_a} -> {agent_b} | STATUS:AUTHORIZED | SESSION:{session.session_id}")
+        return issued
+
+    def revoke_handshake(self, agent_a, agent_b=None, reason="REVOKED"):
+        """
+        Revokes the session of a pair (or all sessions of agent_a); the next handshake is audited in full.
+        """
+        revoked = self.sessions.revoke(agent_a, agent_b)
+        for session in revoked:
+            self._audit(logging.WARNING, f"HANDSHAKE_REVOKED | {session.pair[0]} <-> {session.pair[1]} | "
+                                         f"SESSION:{session.session_id} | REASON:{reason}")
+        return len(revoked)
 
     def block_action(self, action_name, reason):
         """
         Blocks and logs non-compliant actions.
         """
         print(f"[BLOCK] Non-Compliant Action Detected: \"{action_name}\"")
-        logging.warning(f"BLOCK_ACTION | ACTION:{action_name} | REASON:{reason} | REF:SEC-REG-404")
+        self._audit(logging.WARNING, f"BLOCK_ACTION | ACTION:{action_name} | REASON:{reason} | REF:SEC-REG-404")
         return False
 
     def report(self):
@@ -64,7 +94,9 @@ if __name__ == "__main__":
     tx_hash = hashlib.sha256(b"compliance_check").hexdigest()
     sentinel.verify_transaction(tx_hash)
     
-    sentinel.audit_handshake("Sentinel_Core", "Treasury_Agent")
+    token = sentinel.audit_handshake("Sentinel_Core", "Treasury_Agent")
+    for _ in range(100):
+        sentinel.audit_handshake("Sentinel_Core", "Treasury_Agent", token)
     
     # Simulate Violation
     sentinel.block_action("Unsigned_State_Mutation", "Missing BLAKE3 Signature")
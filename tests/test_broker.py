@@ -0,0 +1,147 @@
+"""
+Broker shutdown with a dead worker (agents/broker.py).
+
+Starts a real two-worker Broker over Unix sockets, kills one worker and
+checks that flush() gives up on it and stop() still returns.
+"""
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+
+import pytest
+
+broker_module = pytest.importorskip("agents.broker")
+
+
+@dataclass
+class _Card:
+    uuid: str
+    name: str
+
+
+class EchoAgent:
+    """Worker-side agent: sends every message back to the sender named in it."""
+
+    def __init__(self):
+        self.card = _Card(uuid=str(uuid.uuid4()), name="Echo Worker")
+        self.bus = None
+        self.inbox = asyncio.Queue()
+
+    def connect(self, bus):
+        self.bus = bus
+
+    async def receive(self, message):
+        await self.inbox.put(message)
+
+    async def start(self):
+        while True:
+            reply_to, payload = await self.inbox.get()
+            await self.bus.send(("echo", payload), reply_to)
+
+
+class Sink:
+    def __init__(self):
+        self.card = _Card(uuid=str(uuid.uuid4()), name="Test Sink")
+        self.received = []
+        self.event = asyncio.Event()
+
+    def connect(self, bus):
+        pass
+
+    async def receive(self, message):
+        self.received.append(message)
+        self.event.set()
+
+
+def _workers(broker):
+    return [aid for aid, agent in broker.bus._agents.items() if agent.card.name == "Echo Worker"]
+
+
+async def _kill_one_worker():
+    broker = broker_module.Broker(workers=2)
+    broker.add_agents(EchoAgent, count=2)
+    sink = Sink()
+    broker.bus.register(sink)
+    await broker.start()
+    try:
+        first, second = _workers(broker)
+        await broker.bus.send((sink.card.uuid, b"ping"), first)
+        await asyncio.wait_for(sink.event.wait(), 10)
+
+        # EchoAgents are assigned round-robin, so the first lives on worker 0
+        broker._processes[0].kill()
+        broker._processes[0].join(5)
+        for i in range(100):
+            await broker.bus.send((sink.card.uuid, i.to_bytes(4, "big")), first)
+
+        started = time.monotonic()
+        flushed = await asyncio.wait_for(broker.bus.flush(timeout=0.5), 10)
+        flush_s = time.monotonic() - started
+
+        sink.event.clear()
+        await broker.bus.send((sink.card.uuid, b"still alive"), second)
+        await asyncio.wait_for(sink.event.wait(), 10)
+    finally:
+        started = time.monotonic()
+        await asyncio.wait_for(broker.stop(timeout=2), 30)
+        stop_s = time.monotonic() - started
+    return flushed, flush_s, stop_s, sink.received
+
+
+def test_stop_and_flush_return_after_a_worker_dies():
+    flushed, flush_s, stop_s, received = asyncio.run(_kill_one_worker())
+    assert flushed is False
+    assert flush_s < 5
+    assert stop_s < 15
+    assert ("echo", b"ping") in received
+    assert ("echo", b"still alive") in received
+
+
+def test_pending_queue_is_bounded():
+    async def fill():
+        link = broker_module.PeerLink("/nonexistent/a2a-test.sock", b"k" * 32, max_pending=10)
+        accepted = [link.enqueue(None, i) for i in range(25)]
+        flushed = await link.flush(timeout=0.2)
+        await link.close(timeout=0)
+        return accepted, flushed, link
+
+    accepted, flushed, link = asyncio.run(fill())
+    assert accepted.count(True) == 10
+    assert flushed is False
+    assert link.dropped == 25
+    assert not link._pending
+
+
+@dataclass
+class Blob:
+    content: str
+
+
+def test_shm_ring_is_not_overwritten_before_release():
+    async def send_burst():
+        key = b"k" * 32
+        receiver = broker_module.BrokerBus("receiver", shm_threshold=1024, shm_capacity=256 * 1024, auth_key=key)
+        sink = Sink()
+        receiver.register(sink)
+        address = await receiver.serve(("127.0.0.1", 0))
+        sender = broker_module.BrokerBus("sender", shm_threshold=1024, shm_capacity=256 * 1024, auth_key=key)
+        sender.add_remote_agents([(sink.card.uuid, sink.card.name, address)])
+
+        # 40 x 32 KiB laps a 256 KiB ring five times before the receiver reads anything
+        payloads = [str(i) * (32 * 1024 // len(str(i))) for i in range(40)]
+        for payload in payloads:
+            await sender.send(Blob(payload), sink.card.uuid)
+        assert await sender.flush(timeout=5)
+        while len(sink.received) < len(payloads):
+            await asyncio.wait_for(sink.event.wait(), 5)
+            sink.event.clear()
+        stats = sender.shm_inline, receiver.stale_refs
+        await sender.close()
+        await receiver.close()
+        return payloads, [m.content for m in sink.received], stats
+
+    payloads, received, (inline, stale) = asyncio.run(send_burst())
+    assert received == payloads
+    assert inline > 0
+    assert stale == 0
@@ -0,0 +1,44 @@
+"""
+Link URLs in rendered cube pages (build_site.py).
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+pytest.importorskip("jinja2")
+
+import build_site  # noqa: E402
+
+
+def test_backlinks_only_render_http_and_relative_urls(tmp_path):
+    cube = {"identity": {"created": "2025-12-09T18:44:29"}, "content": {
+        "topic": "barcelona - frankfurt",
+        "summary": "Match report.",
+        "backlinks": [
+            {"url": "https://philhills.ai/cubes/a.html", "rel": "related", "title": "Absolute"},
+            {"url": "/cubes/b.html", "rel": "related", "title": "Relative"},
+            {"url": "javascript:alert(1)", "rel": "related", "title": "Script"},
+            {"url": " JaVaScRiPt:alert(2)", "rel": "related", "title": "Padded"},
+            {"url": "java\tscript:alert(3)", "rel": "related", "title": "Tabbed"},
+            {"url": "data:text/html,<script>alert(4)</script>", "rel": "related", "title": "Data"},
+            "not a link",
+        ],
+    }}
+    env = build_site.make_environment(str(ROOT_DIR / build_site.TEMPLATES_DIR), str(tmp_path))
+    html = env.get_template(build_site.DEFAULT_TEMPLATE).render(**build_site.page_context("b-f", cube))
+
+    assert 'href="https://philhills.ai/cubes/a.html"' in html
+    assert 'href="/cubes/b.html"' in html
+    for title in ("Script", "Padded", "Tabbed", "Data"):
+        assert f">{title}<" not in html
+    assert "alert(" not in html
+
+
+def test_code_repository_scheme_is_checked():
+    assert build_site.safe_url("https://github.com/philhills/a2a") == "https://github.com/philhills/a2a"
+    assert build_site.safe_url("javascript:alert(1)") is None
+    assert build_site.safe_url(["https://example.com"]) is None
@@ -0,0 +1,43 @@
+"""
+Version store round trips (cube_versions.py).
+"""
+import json
+import random
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from cube_versions import CubeSubscriber, VersionStore  # noqa: E402
+
+
+# Large, incompressible body with a small edit per version, so versions after the first are stored as deltas
+_RNG = random.Random(923)
+_BODY = "".join(_RNG.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(20000))
+
+
+def _payload(value: str) -> bytes:
+    return json.dumps({"topic": "barcelona frankfurt", "content": {"summary": value, "body": _BODY}}).encode()
+
+
+def test_republished_payload_keeps_every_version(tmp_path):
+    store = VersionStore(tmp_path)
+    x, a, b = _payload("x"), _payload("a"), _payload("b")
+    for payload in (x, a, b, a):
+        store.publish("barcelona-frankfurt", payload)
+
+    versions = store.history("barcelona-frankfurt")
+    assert [v["version"] for v in versions] == [1, 2, 3, 4]
+    assert [v["kind"] for v in versions] == ["full", "delta", "delta", "delta"]
+    for version, payload in zip((1, 2, 3, 4), (x, a, b, a)):
+        assert store.payload("barcelona-frankfurt", version) == payload
+
+
+def test_subscriber_follows_deltas(tmp_path):
+    store = VersionStore(tmp_path)
+    subscriber = CubeSubscriber()
+    for payload in (_payload("x"), _payload("a"), _payload("b"), _payload("a")):
+        store.publish("barcelona-frankfurt", payload)
+        update = store.latest("barcelona-frankfurt", subscriber.have().get("barcelona-frankfurt"))
+        assert subscriber.apply(update) == payload
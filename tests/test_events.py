@@ -0,0 +1,82 @@
+"""
+Event stream replay (agents/events.py).
+
+A thousand in-process subscribers read the hub's frames at different paces
+while agent state changes; slow ones are reset to a snapshot. Every client
+applies frames the way control.html does and must end with the hub's state.
+"""
+import asyncio
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.events import EventHub  # noqa: E402
+
+
+def _parse(frame: bytes):
+    fields = dict(line.split(": ", 1) for line in frame.decode().splitlines() if line)
+    return fields["event"], json.loads(fields["data"])
+
+
+class Client:
+    """control.html's snapshot/delta handling."""
+
+    def __init__(self):
+        self.seq = -1
+        self.agents = {}
+        self.snapshots = 0
+
+    def apply(self, frame: bytes):
+        kind, body = _parse(frame)
+        if kind == "snapshot":
+            self.agents = {key: dict(fields) for key, fields in body["agents"].items()}
+            self.seq = body["seq"]
+            self.snapshots += 1
+        elif body["seq"] > self.seq:
+            for key, fields in body["agents"].items():
+                self.agents.setdefault(key, {}).update(fields)
+            for key in body["removed"]:
+                self.agents.pop(key, None)
+            self.seq = body["seq"]
+
+
+async def _drain(subscriber, client, limit):
+    for _ in range(limit):
+        frame = await subscriber.get(timeout=0)
+        if frame is None:
+            return
+        client.apply(frame)
+
+
+def test_clients_converge_through_deltas_and_lag_resets():
+    async def replay():
+        rng = random.Random(923)
+        hub = EventHub(max_pending=4)
+        clients = [(hub.subscribe(), Client(), rng.choice((0, 1, 2, 8))) for _ in range(1000)]
+        for step in range(200):
+            for _ in range(rng.randint(1, 5)):
+                key = f"AGENT_{rng.randrange(20):02d}"
+                hub.update(key, inbox=rng.randrange(10), received=step)
+            if rng.random() < 0.1:
+                hub.remove(f"AGENT_{rng.randrange(20):02d}")
+            hub.flush()
+            for subscriber, client, pace in clients:
+                # pace 0 only reads at the end, so it is reset many times over
+                if pace and step % pace == 0:
+                    await _drain(subscriber, client, 2)
+        for subscriber, client, _ in clients:
+            await _drain(subscriber, client, 10_000)
+        expected = {agent.pop("id"): agent for agent in hub.agents()}
+        return hub, clients, expected
+
+    hub, clients, expected = asyncio.run(replay())
+    assert expected
+    for subscriber, client, _ in clients:
+        assert client.seq == hub.seq
+        assert client.agents == expected
+    assert any(subscriber.resets for subscriber, _, _ in clients)
+    assert any(client.snapshots > 1 for _, client, _ in clients)
+    assert all(client.snapshots == 1 for subscriber, client, _ in clients if not subscriber.resets)
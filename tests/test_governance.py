@@ -0,0 +1,59 @@
+"""
+Call-chain recursion limits (core/governance.py).
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.governance import CONTEXT_HEADER, HOP_HEADER, GovernanceService  # noqa: E402
+
+
+def _headers(context_id, hop):
+    return {CONTEXT_HEADER: context_id, HOP_HEADER: str(hop)}
+
+
+def test_concurrent_siblings_do_not_add_up():
+    service = GovernanceService(budget_limit=1000.0, max_recursion=5)
+
+    async def call(depth_seen):
+        with service.enter_chain("ctx") as depth:
+            await asyncio.sleep(0.01)  # keep every sibling inside its chain at once
+            depth_seen.append(depth)
+            return service.check_operation("AGENT_01", 0.1, _headers("ctx", 1))
+
+    async def fan_out():
+        depth_seen = []
+        with service.enter_chain("ctx"):
+            results = await asyncio.gather(*(call(depth_seen) for _ in range(12)))
+        return results, depth_seen
+
+    results, depth_seen = asyncio.run(fan_out())
+    assert all(results)
+    assert depth_seen == [2] * 12
+
+
+def test_nesting_beyond_the_limit_halts():
+    service = GovernanceService(budget_limit=1000.0, max_recursion=5)
+
+    def recurse(level):
+        with service.enter_chain("ctx") as depth:
+            assert depth == level
+            service.check_operation("AGENT_01", 0.1, _headers("ctx", 0))
+            recurse(level + 1)
+
+    with pytest.raises(RecursionError):
+        recurse(1)
+    # Every level was unwound, so the context starts from zero again
+    with service.enter_chain("ctx") as depth:
+        assert depth == 1
+
+
+def test_hop_count_beyond_the_limit_halts():
+    service = GovernanceService(budget_limit=1000.0, max_recursion=5)
+    assert service.check_operation("AGENT_01", 0.1, _headers("ctx", 5))
+    with pytest.raises(RecursionError):
+        service.check_operation("AGENT_01", 0.1, _headers("ctx", 6))
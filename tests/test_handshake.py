@@ -0,0 +1,25 @@
+"""
+Handshake resumption tokens (core/handshake.py, compliance_sentinel.py).
+"""
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import compliance_sentinel  # noqa: E402
+from core.handshake import HandshakeSessions  # noqa: E402
+
+
+def test_only_the_establishing_caller_gets_the_token(tmp_path, monkeypatch):
+    monkeypatch.setattr(compliance_sentinel, "AUDIT_LOG_PATH", tmp_path / "audit.jsonl")
+    with contextlib.redirect_stdout(io.StringIO()):
+        sentinel = compliance_sentinel.ComplianceSentinel()
+        token = sentinel.verify_handshake("Treasury_Agent", "Audit_Agent")
+        # A second caller without the token is audited but handed nothing
+        assert sentinel.verify_handshake("Audit_Agent", "Treasury_Agent") is None
+        assert sentinel.verify_handshake("Treasury_Agent", "Audit_Agent", "forged.1.x") is None
+        assert sentinel.verify_handshake("Treasury_Agent", "Audit_Agent", token) == token
+    assert sentinel.sessions.stats == {**sentinel.sessions.stats, "established": 1, "resumed": 1}
+    assert not hasattr(HandshakeSessions, "token")
@@ -0,0 +1,48 @@
+"""
+Identity context memoization under concurrent reloads (agents/identity_cache.py).
+"""
+import itertools
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.identity_cache import IdentityContextProvider  # noqa: E402
+
+
+class ReloadOnAcquire:
+    """Provider lock that lets another thread reload the identity just before it is next taken."""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.lock = threading.Lock()
+        self.armed = False
+
+    def reload(self):
+        self.provider.invalidate()
+        self.provider.get_context()
+
+    def __enter__(self):
+        if self.armed:
+            self.armed = False
+            thread = threading.Thread(target=self.reload)
+            thread.start()
+            thread.join(1)
+        self.lock.acquire()
+
+    def __exit__(self, *exc):
+        self.lock.release()
+
+
+def test_reload_during_fill_does_not_cache_the_old_identity(tmp_path):
+    versions = itertools.count()
+    provider = IdentityContextProvider(sources=[tmp_path / "identity.json"],
+                                       loader=lambda: f"identity-{next(versions)}", check_interval=60.0)
+    assert provider.get_context() == "identity-0"
+    lock = provider._lock = ReloadOnAcquire(provider)
+
+    lock.armed = True
+    provider.instruction_for("Scout")
+    assert provider.get_context() == "identity-1"
+    assert provider.instruction_for("Scout") == "identity-1\n\nSPECIFIC ROLE:\nScout"
@@ -0,0 +1,62 @@
+"""
+Cold-start budget for the agent platform (see benchmarks/bench_import_time.py).
+
+`import agents` resolves its exports lazily and must not pull in the platform
+stack. `import agents.platform` is what a cold agent process actually pays;
+it is held to a budget relative to `import asyncio` in the same interpreter,
+which it needs anyway, so the check tracks the platform's own cost rather
+than how fast the CI machine happens to be.
+"""
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+# agents.platform may cost at most this many times `import asyncio`
+RELATIVE_BUDGET = float(os.environ.get("AGENTS_PLATFORM_IMPORT_BUDGET", "4"))
+RUNS = 5
+
+
+def _importtime(statement: str) -> tuple:
+    """({module: cumulative import time in us}, process) for `statement` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        fields = line[len("import time:"):].split("|") if line.startswith("import time:") else ()
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        cumulative[fields[2].strip()] = int(fields[1])
+    return cumulative, proc
+
+
+def test_import_agents_is_lazy():
+    modules, proc = _importtime("import agents")
+    assert proc.returncode == 0, proc.stderr
+    assert "agents" in modules
+    assert "agents.platform" not in modules
+    assert "agents.identity_cache" not in modules
+
+
+def test_import_platform_within_budget():
+    # asyncio is imported first so its cost is measured on its own
+    statement = "import asyncio, agents.platform"
+    modules, proc = _importtime(statement)
+    if proc.returncode != 0:
+        pytest.skip(f"agents.platform unavailable: {proc.stderr.strip().splitlines()[-1]}")
+    assert "http.server" not in modules
+    assert "agents.identity_cache" not in modules
+
+    ratios = []
+    for _ in range(RUNS):
+        modules, _ = _importtime(statement)
+        ratios.append(modules["agents.platform"] / modules["asyncio"])
+    ratio = statistics.median(ratios)
+    assert ratio <= RELATIVE_BUDGET, (
+        f"import agents.platform took {ratio:.1f}x import asyncio (budget {RELATIVE_BUDGET:.1f}x)")
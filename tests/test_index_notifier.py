@@ -0,0 +1,173 @@
+"""
+Index notifier against a local stub of the Indexing API (index_notifier.py).
+
+Covers batching, change detection, token-bucket pacing and how throttled,
+failing and unreachable requests are retried or reported.
+"""
+import asyncio
+import re
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("httpx")
+
+from index_notifier import IndexNotifier, UrlHashStore, changed_urls  # noqa: E402
+
+URL_RE = re.compile(rb'"url":"([^"]+)"')
+REASONS = {200: "OK", 400: "Bad Request", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class StubIndexingServer:
+    """
+    Keep-alive HTTP/1.1 stub. `throttle` whole requests are answered with 429
+    first; after that each URL gets `item_status.get(url, 200)`.
+    """
+
+    def __init__(self, throttle: int = 0, item_status: dict = None):
+        self.throttle = throttle
+        self.item_status = item_status or {}
+        self.requests = []            # (path, [urls]) per HTTP request
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            while request_line := await reader.readline():
+                length = 0
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b""
+                writer.write(self._respond(request_line.split()[1].decode(), body))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, path: str, body: bytes) -> bytes:
+        urls = [u.decode() for u in URL_RE.findall(body)]
+        self.requests.append((path, urls))
+        if self.throttle:
+            self.throttle -= 1
+            return _http(429, b'{"error":"rate limited"}', "application/json", {"Retry-After": "0.05"})
+        if path != "/batch":
+            status = self.item_status.get(urls[0], 200)
+            return _http(status, b"{}", "application/json")
+        parts = [
+            f"--stub\r\nContent-Type: application/http\r\nContent-ID: <response-item{i}>\r\n\r\n"
+            f"HTTP/1.1 {self.item_status.get(url, 200)} X\r\nContent-Type: application/json\r\n\r\n{{}}\r\n"
+            for i, url in enumerate(urls)
+        ]
+        return _http(200, ("".join(parts) + "--stub--\r\n").encode(), "multipart/mixed; boundary=stub")
+
+
+def _http(status: int, body: bytes, content_type: str, extra: dict = None) -> bytes:
+    headers = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}"]
+    headers += [f"{k}: {v}" for k, v in (extra or {}).items()]
+    return ("\r\n".join(headers) + "\r\n\r\n").encode() + body
+
+
+def _urls(count: int):
+    return [f"https://philhills.ai/cubes/topic-{i:04d}.html" for i in range(count)]
+
+
+def _notify(server: StubIndexingServer, urls, base: str = None, **options):
+    async def run():
+        endpoint = base or await server.start()
+        notifier = IndexNotifier("stub-token", "0" * 64, backoff_base=0.01,
+                                 publish_endpoint=f"{endpoint}/v3/urlNotifications:publish",
+                                 batch_endpoint=f"{endpoint}/batch", **options)
+        try:
+            return await notifier.notify(urls)
+        finally:
+            if base is None:
+                await server.stop()
+    return asyncio.run(run())
+
+
+def test_urls_are_packed_into_batches():
+    server = StubIndexingServer()
+    urls = _urls(250)
+    report = _notify(server, urls, rate=10_000, concurrency=2)
+    assert sorted(report.sent) == urls
+    assert not report.failed
+    assert sorted(len(batch) for path, batch in server.requests) == [50, 100, 100]
+    assert {path for path, _ in server.requests} == {"/batch"}
+
+    server = StubIndexingServer()
+    report = _notify(server, urls[:1], rate=10_000)
+    assert report.sent == urls[:1]
+    assert server.requests == [("/v3/urlNotifications:publish", urls[:1])]
+
+
+def test_only_changed_content_is_pending(tmp_path):
+    site = tmp_path / "site"
+    (site / "cubes").mkdir(parents=True)
+    for name in ("a", "b"):
+        (site / "cubes" / f"{name}.html").write_text(f"<h1>{name}</h1>")
+    urls = [f"https://philhills.ai/cubes/{name}.html" for name in ("a", "b", "missing")]
+
+    store = UrlHashStore(tmp_path / "indexed.json")
+    pending = changed_urls(urls, store, site)
+    assert set(pending) == set(urls)
+    for url, digest in pending.items():
+        store.mark(url, digest)
+    store.save()
+
+    store = UrlHashStore(tmp_path / "indexed.json")
+    # Unhashable (missing) content is always resent
+    assert set(changed_urls(urls, store, site)) == {urls[2]}
+    (site / "cubes" / "b.html").write_text("<h1>b, updated</h1>")
+    assert set(changed_urls(urls, store, site)) == {urls[1], urls[2]}
+
+
+def test_token_bucket_paces_notifications():
+    server = StubIndexingServer()
+    started = time.monotonic()
+    report = _notify(server, _urls(600), rate=1000, burst=100, concurrency=4)
+    elapsed = time.monotonic() - started
+    assert len(report.sent) == 600
+    # 100 go out on the initial burst, the other 500 at 1000/s
+    assert elapsed >= 0.45
+
+
+def test_throttled_requests_are_retried():
+    server = StubIndexingServer(throttle=2)
+    report = _notify(server, _urls(150), rate=10_000, concurrency=1)
+    assert len(report.sent) == 150
+    assert report.throttled == 2
+    assert report.retries == 200
+    assert len(server.requests) == 4
+
+
+def test_error_responses_are_reported_per_url():
+    urls = _urls(10)
+    server = StubIndexingServer(item_status={urls[3]: 400, urls[7]: 500})
+    report = _notify(server, urls, rate=10_000, max_retries=2)
+    assert sorted(report.sent) == sorted(set(urls) - {urls[3], urls[7]})
+    assert report.failed[urls[3]].startswith("HTTP 400")
+    assert report.failed[urls[7]].startswith("HTTP 500")
+    # 400 is final; 500 is retried max_retries times on its own
+    assert [batch for _, batch in server.requests[1:]] == [[urls[7]], [urls[7]]]
+
+
+def test_unreachable_endpoint_fails_every_url():
+    urls = _urls(3)
+    report = _notify(None, urls, base="http://127.0.0.1:9", rate=10_000, max_retries=1)
+    assert not report.sent
+    assert set(report.failed) == set(urls)
+    assert all("Connect" in reason for reason in report.failed.values())
@@ -0,0 +1,49 @@
+"""
+Two-party negotiation on a shared market (agents/revenue_mesh.py).
+
+negotiate_task() must settle only its own bid and ask: unrelated orders on
+the same engine keep their fills for the next match() caller, and the
+peer's bid never trades against a third party's cheaper ask.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.market import Ledger, MarketEngine  # noqa: E402
+from agents.revenue_mesh import RevenueAgent  # noqa: E402
+
+
+def _market():
+    return MarketEngine(Ledger({"PEER": 10.0, "BUYER": 10.0}))
+
+
+def test_negotiation_leaves_other_books_to_match():
+    market = _market()
+    market.bid("BUYER", "fuzzing", 100, 0.001)
+    market.ask("SELLER", "fuzzing", 100, 0.0008)
+
+    agent = RevenueAgent("AGENT_01", market, unit_price=0.0008)
+    assert agent.negotiate_task("PEER", 500).startswith("OFFER_ACCEPTED")
+
+    fills = market.match()
+    assert [(f.buyer, f.seller, f.quantity) for f in fills] == [("BUYER", "SELLER", 100)]
+
+
+def test_peer_bid_fills_only_against_this_agent():
+    market = _market()
+    cheap = market.ask("THIRD_PARTY", "value_exchange", 500, 0.0001)
+
+    agent = RevenueAgent("AGENT_01", market, unit_price=0.0008)
+    assert agent.negotiate_task("PEER", 500) == "OFFER_ACCEPTED: PEER | COST: 0.4"
+    assert cheap.remaining == 500
+    assert agent.balance > 0
+    assert market.ledger.balance("THIRD_PARTY") == 0.0
+
+
+def test_declined_when_ask_above_bid():
+    market = _market()
+    agent = RevenueAgent("AGENT_01", market, unit_price=0.002)
+    assert agent.negotiate_task("PEER", 100).startswith("OFFER_DECLINED")
+    assert market.ledger.balance("PEER") == 10.0
+    assert not market.orders
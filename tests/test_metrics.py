@@ -0,0 +1,50 @@
+"""
+Prometheus exposition (agents/metrics.py).
+"""
+import sys
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.metrics import MetricsRegistry, start_metrics_server  # noqa: E402
+
+
+def _buckets(text: str, name: str):
+    rows = []
+    for line in text.splitlines():
+        if line.startswith(f"{name}_bucket"):
+            le = line.split('le="', 1)[1].split('"', 1)[0]
+            rows.append((float(le), int(line.rsplit(" ", 1)[1])))
+    return rows
+
+
+def test_histogram_exports_short_exact_bucket_list():
+    metrics = MetricsRegistry()
+    latency = metrics.histogram("handler_seconds", "test", ("agent",))
+    values = [0.00005, 0.0003, 0.0003, 0.002, 0.05, 0.7, 3.0, 90.0]
+    for value in values:
+        latency.labels("a").observe(value)
+
+    rows = _buckets(metrics.render_prometheus(), "handler_seconds")
+    assert len(rows) <= 25
+    assert rows[-1] == (float("inf"), len(values))
+    for le, count in rows[:-1]:
+        assert count == sum(1 for value in values if value < le)
+    # Layout does not depend on what was observed
+    other = metrics.histogram("other_seconds", "test")
+    other.observe(0.001)
+    assert [le for le, _ in _buckets(metrics.render_prometheus(), "other_seconds")] == [le for le, _ in rows]
+
+
+def test_loopback_server_allows_any_origin():
+    metrics = MetricsRegistry()
+    metrics.counter("pings_total", "test").inc()
+    server = start_metrics_server(port=0, metrics=metrics)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as response:
+            assert response.headers["Access-Control-Allow-Origin"] == "*"
+            assert b"pings_total 1.0" in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
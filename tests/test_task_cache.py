@@ -0,0 +1,55 @@
+"""
+Request coalescing in agents/task_cache.py.
+"""
+import asyncio
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.task_cache import TaskCoalescer  # noqa: E402
+
+CONTEXT = "x-a2a-context-id"
+
+
+@dataclass
+class Request:
+    content: str
+    task_id: str
+    headers: dict = field(default_factory=dict)
+
+
+@dataclass
+class Response:
+    task_id: str
+    output: str
+    status: str = "completed"
+    headers: dict = field(default_factory=dict)
+
+
+def test_coalesced_and_cached_callers_get_their_own_ids():
+    async def run():
+        coalescer = TaskCoalescer("test", key_fn=lambda name, request: request.content)
+        release = asyncio.Event()
+
+        def call(task_id):
+            request = Request("same work", task_id, {CONTEXT: f"ctx-{task_id}"})
+
+            async def handler():
+                await release.wait()
+                return Response(request.task_id, "done", headers={CONTEXT: request.headers[CONTEXT]})
+            return coalescer.run(request, handler)
+
+        calls = [asyncio.create_task(call(f"t{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(*calls)
+        responses.append(await call("t3"))    # served from the cache
+        return coalescer.stats, responses
+
+    stats, responses = asyncio.run(run())
+    assert stats == {"hits": 1, "misses": 1, "coalesced": 2}
+    for i, response in enumerate(responses):
+        assert response.task_id == f"t{i}"
+        assert response.headers[CONTEXT] == f"ctx-t{i}"
@@ -0,0 +1,37 @@
+"""
+Near-duplicate topic detection (agents/topic_index.py).
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.topic_index import TopicIndex  # noqa: E402
+
+
+def test_same_fixture_matches_in_any_form():
+    index = TopicIndex()
+    index.add("barcelona-frankfurt", "barcelona - frankfurt")
+    for topic in ("Barcelona vs Frankfurt", "Frankfurt Barcelona", "barcelona - frankfurt live"):
+        assert index.find_duplicate(topic).slug == "barcelona-frankfurt"
+
+
+def test_fixtures_differing_in_one_team_do_not_match():
+    index = TopicIndex()
+    index.add("manchester-city-arsenal", "Manchester City vs Arsenal")
+    assert index.find_duplicate("Manchester United vs Arsenal") is None
+    assert index.find_duplicate("Arsenal v Manchester City").slug == "manchester-city-arsenal"
+
+
+def test_from_cubes_skips_malformed_content(tmp_path):
+    (tmp_path / "index.json").write_text(json.dumps({"cubes": [
+        {"slug": "text-content", "topic": "Text Content"},
+        {"slug": "with-summary", "topic": "With Summary"},
+    ]}))
+    (tmp_path / "text-content.json").write_text(json.dumps({"content": "just a string"}))
+    (tmp_path / "with-summary.json").write_text(json.dumps({"content": {"summary": "Derby day at the stadium"}}))
+
+    index = TopicIndex.from_cubes(tmp_path)
+    assert len(index) == 2
+    assert index.find_duplicate("Unrelated", "Derby day at the stadium").slug == "with-summary"
@@ -0,0 +1,45 @@
+"""
+Traffic capture and replay on a live MessageBus (agents/traffic.py).
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+agent_platform = pytest.importorskip("agents.platform")
+
+from agents.scheduler import TaskScheduler  # noqa: E402
+from agents.traffic import StubAgent, TrafficRecorder, TrafficReplayer  # noqa: E402
+
+PACKET = {"headers": {"x-a2a-sender": "test"}, "body": {"intent": "TEST|PING", "payload": {}}}
+
+
+def test_replay_with_scheduler_attached(tmp_path):
+    trace = tmp_path / "trace.a2at"
+    recorder = TrafficRecorder(str(trace), agents=["agent-a", "agent-b"])
+    for i in range(20):
+        recorder.record(PACKET, "agent-a" if i % 2 else "agent-b")
+    recorder.close()
+
+    bus = agent_platform.MessageBus()
+    bus.attach_scheduler(TaskScheduler())
+    report = asyncio.run(TrafficReplayer(str(trace)).replay(speed=0, bus=bus))
+    assert report.messages == 20
+
+
+def test_failed_capture_is_dropped_without_breaking_routing(tmp_path):
+    async def send():
+        bus = agent_platform.MessageBus()
+        stub = StubAgent("agent-a")
+        bus.register(stub)
+        capture = bus.start_capture(str(tmp_path / "trace.a2at"))
+        capture._file.close()          # as if the disk went away mid-capture
+        await bus.send(PACKET, "agent-a")
+        return bus, stub
+
+    bus, stub = asyncio.run(send())
+    assert stub.inbox.qsize() == 1
+    assert bus._capture is None
@@ -180,6 +180,188 @@ class CubeObject {
     }
 }
 
+/**
+ * ChunkedCube - Random-access reader for chunked (cube-1.1) documents
+ *
+ * Fetches the header with one Range request, then only the byte range of
+ * the blocks that overlap a read. Each block is checked against its
+ * SHA-256 and gunzipped independently; blocks decode concurrently
+ * (DecompressionStream when available, pako otherwise).
+ */
+class ChunkedCube {
+    static MAX_BLOCK_SIZE = 64 << 20;
+    static MAX_HEADER_BYTES = 16 << 20;   // ~200k blocks; larger tables are rejected before fetching
+
+    constructor(url, header) {
+        this.url = url;
+        this.header = header;
+        const cube = header.cube || {};
+        this.dataOffset = header.data_offset;
+        this.blockSize = cube.block_size;
+        this.length = cube.length;
+        this.blocks = cube.blocks;
+        this.hash = header.hash && header.hash.value;
+        this._validate();
+    }
+
+    /**
+     * Largest base64 length a gzip member of `blockSize` input bytes can have
+     */
+    static _encodedBound(blockSize) {
+        const deflated = blockSize + 5 * (Math.floor(blockSize / 16383) + 1) + 18;
+        return 4 * Math.ceil(deflated / 3);
+    }
+
+    /**
+     * Same checks as core/cube_chunks.py: a header cannot make the reader
+     * fetch or allocate more than the payload warrants
+     */
+    _validate() {
+        const isInt = Number.isSafeInteger;
+        if (!isInt(this.blockSize) || this.blockSize <= 0 || this.blockSize > ChunkedCube.MAX_BLOCK_SIZE
+                || !isInt(this.length) || this.length < 0) {
+            throw new ValueError(`Bad block_size ${this.blockSize} or length ${this.length}`);
+        }
+        if (!Array.isArray(this.blocks) || typeof this.hash !== 'string') {
+            throw new ValueError('Malformed chunked cube header');
+        }
+        if (this.blocks.length !== Math.ceil(this.length / this.blockSize)) {
+            throw new ValueError(`${this.blocks.length} blocks cannot hold ${this.length} bytes of ${this.blockSize}`);
+        }
+        // Blocks must be contiguous and no larger than base64 gzip of block_size can be
+        const limit = ChunkedCube._encodedBound(this.blockSize);
+        let expectedOffset = 0;
+        for (const block of this.blocks) {
+            const [off, size, digest] = Array.isArray(block) ? block : [];
+            if (off !== expectedOffset || !isInt(size) || size <= 0 || size > limit) {
+                throw new ValueError(`Block at ${off} (+${size}) breaks the block table`);
+            }
+            if (typeof digest !== 'string' || !/^[0-9a-f]{64}$/.test(digest)) {
+                throw new ValueError('Block digest is not hex');
+            }
+            expectedOffset += size;
+        }
+    }
+
+    static async _range(url, start, length) {
+        const response = await fetch(url, { headers: { Range: `bytes=${start}-${start + length - 1}` } });
+        if (!response.ok) {
+            throw new Error(`Range request failed: ${response.status}`);
+        }
+        const bytes = new Uint8Array(await response.arrayBuffer());
+        // Servers without Range support answer 200 with the whole file
+        return response.status === 206 ? bytes : bytes.subarray(start, start + length);
+    }
+
+    static async _sha256(bytes) {
+        const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', bytes));
+        return Array.from(digest, b => b.toString(16).padStart(2, '0')).join('');
+    }
+
+    /**
+     * Open a chunked cube and verify its block table against the top-level hash
+     */
+    static async open(url) {
+        let prefix = await this._range(url, 0, 4096);
+        const match = /^\{"data_offset":(\d+),/.exec(new TextDecoder().decode(prefix.subarray(0, 64)));
+        if (!match) {
+            throw new ValueError('Not a chunked cube (missing leading data_offset)');
+        }
+        const dataOffset = parseInt(match[1], 10);
+        if (dataOffset > this.MAX_HEADER_BYTES) {
+            throw new ValueError(`Header of ${dataOffset} bytes exceeds ${this.MAX_HEADER_BYTES}`);
+        }
+        if (prefix.length < dataOffset) {
+            const rest = await this._range(url, prefix.length, dataOffset - prefix.length);
+            const joined = new Uint8Array(dataOffset);
+            joined.set(prefix);
+            joined.set(rest, prefix.length);
+            prefix = joined;
+        }
+        if (prefix.length < dataOffset) {
+            throw new ValueError('Truncated chunked cube header');
+        }
+        let header;
+        try {
+            header = JSON.parse(new TextDecoder().decode(prefix.subarray(0, dataOffset)) + '"}}');
+        } catch (e) {
+            throw new ValueError(`Unreadable header: ${e.message}`);
+        }
+        if (!header || header.protocol_version !== 'cube-1.1') {
+            throw new ValueError(`Unsupported protocol_version ${header.protocol_version}`);
+        }
+        const cube = new ChunkedCube(url, header);
+        const digests = new Uint8Array(cube.blocks.length * 32);
+        cube.blocks.forEach(([, , hex], i) => {
+            for (let j = 0; j < 32; j++) digests[i * 32 + j] = parseInt(hex.substr(j * 2, 2), 16);
+        });
+        if (await this._sha256(digests) !== cube.hash) {
+            throw new Error('Block table does not match the top-level hash');
+        }
+        return cube;
+    }
+
+    async _decodeBlock(index, chunk) {
+        const binaryString = atob(new TextDecoder().decode(chunk));
+        const compressed = new Uint8Array(binaryString.length);
+        for (let i = 0; i < binaryString.length; i++) {
+            compressed[i] = binaryString.charCodeAt(i);
+        }
+        if (await ChunkedCube._sha256(compressed) !== this.blocks[index][2]) {
+            throw new Error(`Block ${index}: digest mismatch`);
+        }
+        let block;
+        if (typeof DecompressionStream !== 'undefined') {
+            const stream = new Blob([compressed]).stream().pipeThrough(new DecompressionStream('gzip'));
+            block = new Uint8Array(await new Response(stream).arrayBuffer());
+        } else {
+            block = pako.ungzip(compressed);
+        }
+        const expected = Math.min(this.blockSize, this.length - index * this.blockSize);
+        if (block.length !== expected) {
+            throw new ValueError(`Block ${index}: ${block.length} bytes, expected ${expected}`);
+        }
+        return block;
+    }
+
+    /**
+     * Read payload bytes [offset, offset + length), decoding only the overlapping blocks
+     * @returns {Promise<Uint8Array>}
+     */
+    async read(offset = 0, length = this.length - offset) {
+        if (offset < 0 || length < 0) {
+            throw new RangeError('offset and length must be non-negative');
+        }
+        const end = Math.min(this.length, offset + length);
+        if (offset >= end) return new Uint8Array(0);
+        const first = Math.floor(offset / this.blockSize);
+        const last = Math.floor((end - 1) / this.blockSize);
+        const start = this.blocks[first][0];
+        const stop = this.blocks[last][0] + this.blocks[last][1];
+        const span = await ChunkedCube._range(this.url, this.dataOffset + start, stop - start);
+        if (span.length !== stop - start) {
+            throw new ValueError('Truncated cube data');
+        }
+
+        const decoded = await Promise.all(this.blocks.slice(first, last + 1).map(([off, size], i) =>
+            this._decodeBlock(first + i, span.subarray(off - start, off - start + size))));
+        const out = new Uint8Array(end - offset);
+        let written = 0;
+        let skip = offset - first * this.blockSize;
+        for (const block of decoded) {
+            const piece = block.subarray(skip, skip + out.length - written);
+            out.set(piece, written);
+            written += piece.length;
+            skip = 0;
+        }
+        return out;
+    }
+
+    async readText(offset, length) {
+        return new TextDecoder().decode(await this.read(offset, length));
+    }
+}
+
 /**
  * Custom error classes
  */